@@ -0,0 +1,39 @@
+import logging
+import sqlite3
+import threading
+
+from app.config import DATABASE_URL, WORKFLOW_CHECKPOINT_DB
+
+logger = logging.getLogger(__name__)
+
+_checkpointer = None
+_lock = threading.Lock()
+
+
+def get_checkpointer():
+    """Process-wide LangGraph checkpointer: Postgres when the app runs on Postgres, SQLite otherwise"""
+    global _checkpointer
+    with _lock:
+        if _checkpointer is None:
+            if DATABASE_URL.startswith("postgres"):
+                from psycopg_pool import ConnectionPool
+                from langgraph.checkpoint.postgres import PostgresSaver
+                # psycopg wants a plain libpq URL, without SQLAlchemy's driver suffix
+                conninfo = DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://", 1)
+                pool = ConnectionPool(conninfo, kwargs={"autocommit": True, "prepare_threshold": 0}, open=True)
+                _checkpointer = PostgresSaver(pool)
+                _checkpointer.setup()
+            else:
+                from langgraph.checkpoint.sqlite import SqliteSaver
+                conn = sqlite3.connect(WORKFLOW_CHECKPOINT_DB, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                _checkpointer = SqliteSaver(conn)
+            logger.info(f"Workflow checkpoints stored with {type(_checkpointer).__name__}")
+        return _checkpointer
+
+
+def delete_thread(thread_id: str):
+    """Drop the checkpoints of a finished run"""
+    checkpointer = get_checkpointer()
+    if hasattr(checkpointer, "delete_thread"):
+        checkpointer.delete_thread(thread_id)
@@ -1,7 +1,13 @@
 from langgraph.graph import StateGraph, END
-from typing import TypedDict, List, Dict, Any
+from langgraph.types import Send
+from typing import TypedDict, Annotated, List, Dict, Any
 from .supervisor_agent import SupervisorAgent
 from .syllabus_agent import SyllabusAgent
+from .flashcard_agent import FlashcardAgent
+from .checkpointing import get_checkpointer, delete_thread
+from app.config import MCQ_BATCH_SIZE, FLASHCARDS_PER_TOPIC, FLASHCARD_CONCURRENCY
+from app.utils.syllabus_store import SyllabusDocument, syllabus_store
+from concurrent.futures import ThreadPoolExecutor
 import os
 import random
 import logging
@@ -12,101 +18,207 @@ logger = logging.getLogger(__name__)
 os.environ.setdefault("LANGCHAIN_TRACING_V2", "true")
 os.environ.setdefault("LANGCHAIN_PROJECT", "exam-prep-agent")
 
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for keyed results written by parallel branches"""
+    return {**(left or {}), **(right or {})}
+
+def add_errors(left: List[str], right: List[str]) -> List[str]:
+    """Reducer for errors: nodes append theirs, and a run's input of None starts the list over.
+
+    Re-running a kept checkpoint thread would otherwise report every earlier run's errors too.
+    """
+    if right is None:
+        return []
+    return (left or []) + right
+
 class ExamWorkflowState(TypedDict):
-    syllabus_content: str
+    # The syllabus revision by reference; nodes load the text through syllabus_store,
+    # so neither the state nor its checkpoints carry it
     syllabus_id: int
+    content_hash: str
     topics: List[str]
+    # Topics whose existing MCQs are kept; no generation needed
+    covered_topics: List[str]
+    mcq_batches: List[Dict[str, Any]]
+    # Per-topic MCQ results; each parallel batch adds its own topics
+    mcq_results: Annotated[Dict[str, Dict[str, Any]], merge_dicts]
     mcqs: List[Dict[str, Any]]
+    # Topics to write flashcards for; defaults to all topics
+    flashcard_topics: List[str]
     flashcards: List[Dict[str, Any]]
     quiz_questions: List[Any]
     user_answers: Dict[str, str]
     exam_results: Dict[str, Any]
     current_step: str
     agent_health: Dict[str, Any]
-    errors: List[str]
+    errors: Annotated[List[str], add_errors]
 
 class ExamWorkflow:
-    def __init__(self):
+    def __init__(self, question_bank=None):
         self.supervisor = SupervisorAgent()
         self.syllabus_agent = SyllabusAgent()
+        self.flashcard_agent = FlashcardAgent()
+        # Optional QuestionBank; topics it covers are served without calling the LLM
+        self.question_bank = question_bank
+    
+    def document(self, ref: Dict[str, Any]) -> SyllabusDocument:
+        """Syllabus text for a state or Send payload, loaded on first use"""
+        return syllabus_store.get(ref["syllabus_id"], ref["content_hash"])
     
     def extract_topics_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
         """Extract topics from syllabus content"""
+        if state.get("topics"):
+            # Known from a previous run of this checkpoint thread
+            return {"current_step": "topics_extracted"}
         try:
             logger.info("Extracting topics from syllabus")
-            topics = self.syllabus_agent.extract_topics(state["syllabus_content"])
-            logger.info(f"Extracted {len(topics)} topics: {topics}")
+            document = self.document(state)
+            topics = self.syllabus_agent.extract_topics(document.content, chunks=document.chunks)
+            logger.info(f"Extracted {len(topics)} topics")
+            logger.debug(f"Topics: {topics}")
             
             return {
                 "topics": topics,
-                "current_step": "topics_extracted",
-                "errors": state.get("errors", [])
+                "current_step": "topics_extracted"
             }
         except Exception as e:
-            errors = state.get("errors", [])
-            errors.append(f"Topic extraction failed: {str(e)}")
             return {
                 "topics": ["General Topics"],
                 "current_step": "topics_extracted",
-                "errors": errors
+                "errors": [f"Topic extraction failed: {str(e)}"]
             }
     
     def check_agent_health_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
         """Check health of all agents before proceeding"""
         try:
             logger.info("Checking agent health")
-            health_status = self.supervisor.check_agents_health()
+            # Shared, rate-limited result; probing every run would cost two LLM calls each time
+            from app.monitoring.health import agent_health
+            health_status = agent_health.get()
             logger.info(f"Agent health check complete: {health_status['healthy_agents']}/{health_status['total_agents']} healthy")
             
             return {
                 "agent_health": health_status,
-                "current_step": "health_checked",
-                "errors": state.get("errors", [])
+                "current_step": "health_checked"
             }
         except Exception as e:
-            errors = state.get("errors", [])
-            errors.append(f"Health check failed: {str(e)}")
             return {
                 "agent_health": {"status": "unknown"},
-                "current_step": "health_checked", 
-                "errors": errors
+                "current_step": "health_checked",
+                "errors": [f"Health check failed: {str(e)}"]
             }
     
-    def generate_mcqs_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
-        """Generate MCQs using supervisor delegation"""
+    def plan_mcqs_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
+        """Split the topics still lacking MCQs into generation batches"""
+        done = {topic for topic, result in (state.get("mcq_results") or {}).items() if result["status"] == "success"}
+        done.update(state.get("covered_topics") or [])
+        pending_topics = [topic for topic in state["topics"] if topic not in done]
+        
+        banked = self.question_bank.lookup(pending_topics, count=3) if self.question_bank and pending_topics else {}
+        banked_results = {
+            topic: {"status": "success", "mcqs": mcqs, "agent_used": "question_bank"}
+            for topic, mcqs in banked.items()
+        }
+        pending_topics = [topic for topic in pending_topics if topic not in banked]
+        logger.info(
+            f"MCQ plan: {len(done)} topics already done, {len(banked)} from the question bank, "
+            f"{len(pending_topics)} to generate"
+        )
+        
         try:
-            logger.info("Generating MCQs with supervisor delegation")
-            all_mcqs = []
-            
-            for topic in state["topics"]:
-                result = self.supervisor.delegate_mcq_generation(
-                    topic, 
-                    state["syllabus_content"], 
-                    count=3
-                )
-                
-                if result["status"] == "success":
-                    # Add topic and agent info to each MCQ
-                    for mcq in result["mcqs"]:
-                        mcq["topic"] = topic
-                        mcq["generated_by"] = result["agent_used"]
-                    all_mcqs.extend(result["mcqs"])
-                else:
-                    logger.warning(f"Failed to generate MCQs for topic: {topic}")
-            
-            return {
-                "mcqs": all_mcqs,
-                "current_step": "mcqs_generated",
-                "errors": state.get("errors", [])
-            }
+            if MCQ_BATCH_SIZE > 1 and pending_topics:
+                batches = self.supervisor.plan_mcq_batches(pending_topics, self.document(state).content, MCQ_BATCH_SIZE)
+            else:
+                batches = [{"agent_type": None, "topics": [topic]} for topic in pending_topics]
         except Exception as e:
-            errors = state.get("errors", [])
-            errors.append(f"MCQ generation failed: {str(e)}")
             return {
-                "mcqs": [],
-                "current_step": "mcqs_generated",
-                "errors": errors
+                "mcq_batches": [],
+                "mcq_results": banked_results,
+                "current_step": "mcqs_planned",
+                "errors": [f"MCQ planning failed: {str(e)}"]
+            }
+        
+        return {
+            "mcq_batches": batches,
+            "mcq_results": banked_results,
+            "current_step": "mcqs_planned"
+        }
+    
+    def dispatch_mcq_batches(self, state: ExamWorkflowState):
+        """Fan out one generate_mcq_batch task per planned batch, plus the flashcard branch"""
+        ref = {"syllabus_id": state["syllabus_id"], "content_hash": state["content_hash"]}
+        sends = [Send("generate_mcq_batch", {**batch, **ref}) for batch in state.get("mcq_batches") or []]
+        flashcard_topics = state.get("flashcard_topics")
+        if flashcard_topics is None:
+            flashcard_topics = state["topics"]
+        if flashcard_topics:
+            sends.append(Send("generate_flashcards", {"topics": flashcard_topics, **ref}))
+        return sends or "collect_mcqs"
+    
+    def generate_mcq_batch_node(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate MCQs for one batch; its results are checkpointed as soon as it finishes"""
+        content = self.document(batch).content
+        if batch["agent_type"] is None:
+            results = {
+                topic: self.supervisor.delegate_mcq_generation(topic, content, count=3)
+                for topic in batch["topics"]
             }
+        else:
+            results = self.supervisor.generate_mcq_batch(batch["agent_type"], batch["topics"], content, count=3)
+        return {"mcq_results": results}
+    
+    def generate_flashcards_node(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate flashcards per topic, a few topics at a time.
+        
+        Runs in the same superstep as the MCQ batches, so it adds no time on top of them.
+        """
+        content = self.document(payload).content
+        
+        def generate(topic):
+            try:
+                return topic, self.flashcard_agent.generate_flashcards(topic, content, count=FLASHCARDS_PER_TOPIC), None
+            except Exception as e:
+                return topic, [], f"Flashcard generation failed for '{topic}': {str(e)}"
+        
+        flashcards, errors = [], []
+        with ThreadPoolExecutor(max_workers=max(1, FLASHCARD_CONCURRENCY)) as pool:
+            for topic, cards, error in pool.map(generate, payload["topics"]):
+                for card in cards:
+                    card["topic"] = topic
+                flashcards.extend(cards)
+                if error:
+                    logger.warning(error)
+                    errors.append(error)
+        logger.info(f"Generated {len(flashcards)} flashcards for {len(payload['topics'])} topics")
+        
+        update = {"flashcards": flashcards}
+        if errors:
+            update["errors"] = errors
+        return update
+    
+    def collect_mcqs_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
+        """Gather per-topic results into the MCQ list"""
+        all_mcqs = []
+        mcq_results = state.get("mcq_results") or {}
+        covered = set(state.get("covered_topics") or [])
+        for topic in state["topics"]:
+            if topic in covered:
+                continue
+            result = mcq_results.get(topic)
+            
+            if result and result["status"] == "success":
+                # Add topic and agent info to each MCQ
+                for mcq in result["mcqs"]:
+                    mcq["topic"] = topic
+                    mcq["generated_by"] = result["agent_used"]
+                all_mcqs.extend(result["mcqs"])
+            else:
+                logger.warning(f"Failed to generate MCQs for topic: {topic}")
+        
+        return {
+            "mcqs": all_mcqs,
+            "current_step": "mcqs_generated"
+        }
     
     def create_quiz_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
         """Create quiz from generated MCQs"""
@@ -121,16 +233,13 @@ class ExamWorkflow:
             
             return {
                 "quiz_questions": quiz_questions,
-                "current_step": "quiz_created",
-                "errors": state.get("errors", [])
+                "current_step": "quiz_created"
             }
         except Exception as e:
-            errors = state.get("errors", [])
-            errors.append(f"Quiz creation failed: {str(e)}")
             return {
                 "quiz_questions": [],
                 "current_step": "quiz_created",
-                "errors": errors
+                "errors": [f"Quiz creation failed: {str(e)}"]
             }
     
     def evaluate_exam_node(self, state: ExamWorkflowState) -> Dict[str, Any]:
@@ -152,35 +261,40 @@ class ExamWorkflow:
             
             return {
                 "exam_results": results,
-                "current_step": "exam_evaluated",
-                "errors": state.get("errors", [])
+                "current_step": "exam_evaluated"
             }
         except Exception as e:
-            errors = state.get("errors", [])
-            errors.append(f"Exam evaluation failed: {str(e)}")
             return {
                 "exam_results": {"error": str(e)},
                 "current_step": "exam_evaluated",
-                "errors": errors
+                "errors": [f"Exam evaluation failed: {str(e)}"]
             }
     
-    def build_workflow(self) -> StateGraph:
+    def build_workflow(self, checkpointer=None) -> StateGraph:
         """Build the complete exam preparation workflow"""
         workflow = StateGraph(ExamWorkflowState)
         
         # Add nodes
         workflow.add_node("extract_topics", self.extract_topics_node)
         workflow.add_node("check_health", self.check_agent_health_node)
-        workflow.add_node("generate_mcqs", self.generate_mcqs_node)
+        workflow.add_node("plan_mcqs", self.plan_mcqs_node)
+        workflow.add_node("generate_mcq_batch", self.generate_mcq_batch_node)
+        workflow.add_node("generate_flashcards", self.generate_flashcards_node)
+        workflow.add_node("collect_mcqs", self.collect_mcqs_node)
         workflow.add_node("create_quiz", self.create_quiz_node)
         workflow.add_node("evaluate_exam", self.evaluate_exam_node)
         
         # Define workflow edges
         workflow.set_entry_point("extract_topics")
         workflow.add_edge("extract_topics", "check_health")
-        workflow.add_edge("check_health", "generate_mcqs")
-        workflow.add_edge("generate_mcqs", "create_quiz")
-        workflow.add_edge("create_quiz", END)
+        workflow.add_edge("check_health", "plan_mcqs")
+        # Batches and flashcards run in parallel, each one a separately checkpointed task
+        workflow.add_conditional_edges(
+            "plan_mcqs", self.dispatch_mcq_batches, ["generate_mcq_batch", "generate_flashcards", "collect_mcqs"]
+        )
+        workflow.add_edge("generate_mcq_batch", "collect_mcqs")
+        workflow.add_edge("generate_flashcards", "collect_mcqs")
+        workflow.add_edge("collect_mcqs", "create_quiz")
         
         # Conditional edge for evaluation (only when user answers are provided)
         def should_evaluate(state: ExamWorkflowState) -> str:
@@ -198,28 +312,70 @@ class ExamWorkflow:
         )
         workflow.add_edge("evaluate_exam", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
-    def run_exam_preparation(self, syllabus_content: str, syllabus_id: int) -> Dict[str, Any]:
-        """Run the complete exam preparation workflow"""
-        workflow = self.build_workflow()
+    def run_exam_preparation(self, syllabus_id: int, content_hash: str,
+                             topics: List[str] = None, covered_topics: List[str] = None,
+                             flashcard_topics: List[str] = None) -> Dict[str, Any]:
+        """Run the complete exam preparation workflow.
+        
+        The syllabus is identified by id and content hash; its text is only loaded by
+        the nodes that use it.
+        
+        `topics` skips extraction when the syllabus's topics are already known,
+        `covered_topics` lists topics that keep their existing MCQs, and
+        `flashcard_topics` limits flashcard generation (all topics when None).
+        
+        Runs are checkpointed per syllabus and content version. A run that crashed resumes
+        from its last checkpoint, and a run that finished with failed topics is picked up
+        again with only those topics pending; the checkpoints are dropped once every
+        topic has MCQs.
+        """
+        checkpointer = get_checkpointer()
+        workflow = self.build_workflow(checkpointer=checkpointer)
+        thread_id = f"syllabus-{syllabus_id}-{content_hash[:16]}"
+        config = {"configurable": {"thread_id": thread_id}}
         
         initial_state = {
-            "syllabus_content": syllabus_content,
             "syllabus_id": syllabus_id,
+            "content_hash": content_hash,
+            "covered_topics": covered_topics or [],
             "current_step": "start",
-            "errors": []
+            # A kept thread still holds the previous run's flashcards, which were saved already
+            "flashcards": [],
+            # Clears errors left on the thread by an earlier run
+            "errors": None
         }
+        if topics:
+            initial_state["topics"] = topics
+        if flashcard_topics is not None:
+            initial_state["flashcard_topics"] = flashcard_topics
         
         try:
-            result = workflow.invoke(initial_state)
-            return result
+            snapshot = workflow.get_state(config)
+            if snapshot.next and "content_hash" not in snapshot.values:
+                # Checkpointed before the state referenced the syllabus instead of holding its text
+                logger.info(f"Restarting exam preparation {thread_id} from an outdated checkpoint")
+                delete_thread(thread_id)
+                result = workflow.invoke(initial_state, config)
+            elif snapshot.next:
+                logger.info(f"Resuming interrupted exam preparation {thread_id}")
+                result = workflow.invoke(None, config)
+            else:
+                result = workflow.invoke(initial_state, config)
         except Exception as e:
             return {
                 "error": str(e),
                 "current_step": "failed",
                 "errors": [str(e)]
             }
+        
+        mcq_results = result.get("mcq_results") or {}
+        covered = set(result.get("covered_topics") or [])
+        if all(topic in covered or mcq_results.get(topic, {}).get("status") == "success"
+               for topic in result.get("topics", [])):
+            delete_thread(thread_id)
+        return result
     
     def run_exam_evaluation(self, quiz_questions: List[Dict], user_answers: Dict[str, str]) -> Dict[str, Any]:
         """Run exam evaluation directly using supervisor"""
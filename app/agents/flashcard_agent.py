@@ -1,19 +1,17 @@
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage
-from app.config import GROQ_API_KEY
-import json
+from .model_router import RoutedChatModel
+from .llm_scheduler import ScheduledLLM
+from app.utils.prompt_builder import build_topic_context
+from app.utils.mcq_parser import IncrementalMCQParser
 
 class FlashcardAgent:
     def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name="gemma2-9b-it"
-        )
+        self.llm = ScheduledLLM(RoutedChatModel("flashcards"))
     
     def generate_flashcards(self, topic: str, syllabus_content: str, count: int = 10) -> list:
         prompt = f"""
         Generate {count} flashcards for the topic: {topic}
-        Based on this syllabus content: {syllabus_content}
+        Based on this syllabus content: {build_topic_context(syllabus_content, topic, "flashcard")}
         
         Return JSON format:
         [{{
@@ -23,8 +21,11 @@ class FlashcardAgent:
         """
         
         response = self.llm.invoke([HumanMessage(content=prompt)])
-        try:
-            flashcards = json.loads(response.content.strip())
-            return flashcards if isinstance(flashcards, list) else []
-        except:
-            return []
\ No newline at end of file
+        # The parser skips any prose around the JSON array and bad items inside it
+        items = IncrementalMCQParser().feed(response.content)
+        flashcards = []
+        for _, item in items:
+            if isinstance(item, dict) and isinstance(item.get("front"), str) and isinstance(item.get("back"), str):
+                if item["front"].strip() and item["back"].strip():
+                    flashcards.append({"front": item["front"].strip(), "back": item["back"].strip()})
+        return flashcards[:count]
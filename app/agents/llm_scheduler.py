@@ -0,0 +1,221 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Optional
+
+from app.config import (
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_TARGET_LATENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)
+    return status
+
+
+def is_retryable(error: Exception) -> bool:
+    """429s, 5xx responses, timeouts and connection drops are worth retrying"""
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError")
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read Retry-After (seconds or HTTP date) from the provider's error response"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Process-wide gate for LLM calls.
+
+    Concurrency follows AIMD: every call that finishes under the latency target adds
+    1/limit to the limit, a 429 halves it (at most once per cooldown) and a slow call
+    trims it by 10%, so throughput settles at what the provider actually sustains.
+    Waiting calls are served by priority, then FIFO. Retryable failures back off
+    exponentially with full jitter, honouring Retry-After, and give up their slot
+    while they wait.
+    """
+
+    def __init__(self, initial_limit: int = 4, max_limit: int = 16, min_limit: int = 1,
+                 target_latency: float = 15.0, max_retries: int = 4,
+                 base_delay: float = 0.5, max_delay: float = 30.0, decrease_cooldown: float = 1.0):
+        self.limit = float(initial_limit)
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+
+    def _acquire(self, priority: Priority):
+        with self._cond:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            while self._waiting[0] != ticket or self.in_flight >= int(self.limit):
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            # The next waiter may also fit under the limit
+            self._cond.notify_all()
+
+    def _release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _record_success(self, latency: float):
+        with self._cond:
+            self.stats["calls"] += 1
+            if latency > self.target_latency:
+                self._decrease(0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _record_failure(self, error: Exception):
+        with self._cond:
+            if _status_code(error) == 429:
+                self.stats["rate_limited"] += 1
+                self._decrease(0.5)
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        if now - self._last_decrease >= self.decrease_cooldown:
+            self.limit = max(self.min_limit, self.limit * factor)
+            self._last_decrease = now
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        self._record_failure(error)
+        if attempt >= self.max_retries or not is_retryable(error):
+            with self._cond:
+                self.stats["failures"] += 1
+            return False
+        delay = self._backoff(attempt, error)
+        logger.warning(f"LLM call failed ({type(error).__name__}: {error}); retry {attempt + 1} in {delay:.2f}s")
+        with self._cond:
+            self.stats["retries"] += 1
+        time.sleep(delay)
+        return True
+
+    def run(self, fn, *args, priority: Priority = Priority.BACKGROUND, **kwargs):
+        """Call fn(*args, **kwargs) under the concurrency limit, retrying transient errors"""
+        for attempt in itertools.count():
+            self._acquire(priority)
+            start = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._release()
+                if not self._should_retry(attempt, e):
+                    raise
+                continue
+            self._release()
+            self._record_success(time.monotonic() - start)
+            return result
+
+    def stream(self, fn, *args, priority: Priority = Priority.BACKGROUND, **kwargs):
+        """Iterate fn(*args, **kwargs) holding one slot for the whole stream.
+
+        Errors before the first chunk are retried like `run`; once output has been
+        yielded, errors propagate to the caller.
+        """
+        for attempt in itertools.count():
+            self._acquire(priority)
+            start = time.monotonic()
+            started = False
+            try:
+                for chunk in fn(*args, **kwargs):
+                    if not started:
+                        # Time to first token is what the provider's load shows up in
+                        started = True
+                        self._record_success(time.monotonic() - start)
+                    yield chunk
+            except GeneratorExit:
+                self._release()
+                raise
+            except Exception as e:
+                self._release()
+                if started or not self._should_retry(attempt, e):
+                    raise
+                continue
+            self._release()
+            return
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiting),
+                **self.stats,
+            }
+
+
+class ScheduledLLM:
+    """Chat model wrapper that routes invoke/stream through the shared scheduler"""
+
+    def __init__(self, llm, priority: Priority = Priority.BACKGROUND, scheduler: LLMScheduler = None):
+        self.llm = llm
+        self.priority = priority
+        self.scheduler = scheduler or llm_scheduler
+
+    def invoke(self, messages, priority: Priority = None, **kwargs):
+        return self.scheduler.run(self.llm.invoke, messages, priority=self.priority if priority is None else priority, **kwargs)
+
+    def stream(self, messages, priority: Priority = None, **kwargs):
+        return self.scheduler.stream(self.llm.stream, messages, priority=self.priority if priority is None else priority, **kwargs)
+
+
+llm_scheduler = LLMScheduler(
+    initial_limit=LLM_INITIAL_CONCURRENCY,
+    max_limit=LLM_MAX_CONCURRENCY,
+    target_latency=LLM_TARGET_LATENCY,
+    max_retries=LLM_MAX_RETRIES,
+)
@@ -1,86 +1,39 @@
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage
-from app.config import GROQ_API_KEY
-import json
-import re
+from .subject_agent import SubjectAgent
 
-class MathAgent:
-    def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name="gemma2-9b-it",
-            temperature=0.3
-        )
-        self.agent_type = "math"
-    
-    def health_check(self) -> dict:
-        """Check agent health and capabilities"""
-        try:
-            response = self.llm.invoke([HumanMessage(content="What is 2+2?")])
-            return {
-                "status": "healthy",
-                "agent_type": self.agent_type,
-                "capabilities": ["math_mcqs", "math_problems", "calculations"]
-            }
-        except Exception as e:
-            return {
-                "status": "unhealthy",
-                "agent_type": self.agent_type,
-                "error": str(e)
-            }
-    
-    def generate_math_mcqs(self, topic: str, content: str, count: int = 3) -> list:
-        """Generate math-specific MCQs with calculations and formulas"""
-        prompt = f"""
-        Create {count} mathematical multiple choice questions for: {topic}
-        
-        Content: {content[:1000]}
-        
-        Focus on:
-        - Calculations and formulas
-        - Problem-solving steps
-        - Mathematical concepts
-        - Numerical answers
-        
-        Return ONLY valid JSON:
-        [{{
-            "question": "Calculate the value of...",
-            "option_a": "Numerical answer 1",
-            "option_b": "Numerical answer 2",
-            "option_c": "Numerical answer 3",
-            "option_d": "Numerical answer 4",
+class MathAgent(SubjectAgent):
+    agent_type = "math"
+    temperature = 0.3
+    health_prompt = "What is 2+2?"
+    capabilities = ["math_mcqs", "math_problems", "calculations"]
+    question_kind = "mathematical"
+    focus = [
+        "Calculations and formulas",
+        "Problem-solving steps",
+        "Mathematical concepts",
+        "Numerical answers",
+    ]
+    example = {
+        "question": "Calculate the value of...",
+        "option_a": "Numerical answer 1",
+        "option_b": "Numerical answer 2",
+        "option_c": "Numerical answer 3",
+        "option_d": "Numerical answer 4",
+        "explanation": "Step-by-step solution",
+    }
+
+    def fallback_mcq(self, topic: str) -> dict:
+        return {
+            "question": f"What is the fundamental concept in {topic}?",
+            "option_a": "Formula A",
+            "option_b": "Formula B",
+            "option_c": "Formula C",
+            "option_d": "Formula D",
             "correct_answer": "A",
-            "explanation": "Step-by-step solution",
-            "difficulty": "medium"
-        }}]
-        """
-        
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            content = response.content.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                mcqs = json.loads(json_match.group())
-                return mcqs if isinstance(mcqs, list) else []
-            
-            # Fallback math MCQ
-            return [{
-                "question": f"What is the fundamental concept in {topic}?",
-                "option_a": "Formula A",
-                "option_b": "Formula B", 
-                "option_c": "Formula C",
-                "option_d": "Formula D",
-                "correct_answer": "A",
-                "explanation": f"This is the basic principle of {topic}",
-                "difficulty": "easy"
-            }]
-            
-        except Exception as e:
-            print(f"Math agent error: {e}")
-            return []
-    
+            "explanation": f"This is the basic principle of {topic}",
+            "difficulty": "easy"
+        }
+
     def solve_problem(self, problem: str) -> dict:
         """Solve mathematical problems step by step"""
         prompt = f"""
@@ -100,4 +53,4 @@ class MathAgent:
                 "agent": self.agent_type
             }
         except Exception as e:
-            return {"error": str(e), "agent": self.agent_type}
\ No newline at end of file
+            return {"error": str(e), "agent": self.agent_type}
@@ -1,26 +1,24 @@
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
-from app.config import GROQ_API_KEY
-import json
+from .model_router import RoutedChatModel
+from .llm_scheduler import ScheduledLLM
+from app.utils.prompt_builder import build_context
 import logging
+from itertools import islice
+from .structured_mcq import iter_structured_mcqs, repair_mcqs
 
 logger = logging.getLogger(__name__)
 
 class MCQAgent:
     def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name="gemma2-9b-it"
-        )
+        self.llm = ScheduledLLM(RoutedChatModel("mcq_generation"))
     
     def generate_mcqs(self, topic: str, syllabus_content: str, count: int = 3) -> list:
         prompt = f"""
         Create {count} multiple choice questions about: {topic}
         
-        Content: {syllabus_content[:1000]}...
+        Content: {build_context(syllabus_content, "mcq")}
         
-        Return ONLY valid JSON array:
-        [{{
+        Return ONLY a JSON object with the questions under "mcqs":
+        {{"mcqs": [{{
             "question": "What is..?",
             "option_a": "First option",
             "option_b": "Second option", 
@@ -28,20 +26,17 @@ class MCQAgent:
             "option_d": "Fourth option",
             "correct_answer": "A",
             "explanation": "Brief explanation"
-        }}]
+        }}]}}
         """
         
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        content = response.content.strip()
-        logger.info(f"MCQ Response for {topic}: {content[:200]}...")
-        
+        invalid = []
         try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                mcqs = json.loads(json_match.group())
-                return mcqs if isinstance(mcqs, list) else []
+            mcqs = [mcq for _, mcq in islice(iter_structured_mcqs(self.llm, "mcq", prompt, invalid), count)]
+            if invalid and len(mcqs) < count:
+                logger.warning(f"Repairing {len(invalid)} invalid MCQs for {topic}")
+                mcqs.extend(mcq for _, mcq in repair_mcqs(self.llm, "mcq", invalid)[:count - len(mcqs)])
+            if mcqs:
+                return mcqs
             else:
                 # Fallback: create simple MCQ
                 return [{
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+from app.config import (
+    GROQ_API_KEY,
+    GROQ_API_BASE,
+    LLM_MODEL_TIERS,
+    LLM_TIER_FALLBACK,
+    LLM_TASK_TIERS,
+    LLM_FAILOVER_P95,
+    LLM_FAILOVER_ERROR_RATE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ModelStats:
+    """Sliding window of recent call outcomes for one model"""
+
+    def __init__(self, window_seconds: float = 120.0, max_samples: int = 200):
+        self.window_seconds = window_seconds
+        self.samples = deque(maxlen=max_samples)  # (timestamp, latency, ok)
+
+    def record(self, latency: float, ok: bool):
+        self.samples.append((time.monotonic(), latency, ok))
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+
+    def summary(self) -> dict:
+        self._prune()
+        latencies = sorted(latency for _, latency, ok in self.samples if ok)
+        errors = sum(1 for _, _, ok in self.samples if not ok)
+        total = len(self.samples)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return {
+            "samples": total,
+            "p95_latency": round(p95, 3),
+            "error_rate": round(errors / total, 3) if total else 0.0,
+        }
+
+
+class ModelRouter:
+    """Maps agent tasks to model tiers and fails over when a model degrades.
+
+    Each task resolves to an ordered candidate list: its tier's models, then the
+    models of the tier's fallback tier. A model is skipped while its recent p95
+    latency or error rate is over the threshold; samples age out of the window, so a
+    skipped model is tried again once its bad period has passed.
+    """
+
+    def __init__(self, tiers: Dict[str, List[str]], task_tiers: Dict[str, str], tier_fallback: Dict[str, str],
+                 p95_threshold: float = 20.0, error_rate_threshold: float = 0.25, min_samples: int = 5):
+        self.tiers = tiers
+        self.task_tiers = task_tiers
+        self.tier_fallback = tier_fallback
+        self.p95_threshold = p95_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, task: str) -> List[str]:
+        tier = self.task_tiers.get(task, "quality")
+        models, seen = [], set()
+        while tier and tier not in seen:
+            seen.add(tier)
+            models += [m for m in self.tiers.get(tier, []) if m not in models]
+            tier = self.tier_fallback.get(tier)
+        return models
+
+    def _healthy(self, model: str) -> bool:
+        stats = self._stats.get(model)
+        if stats is None:
+            return True
+        summary = stats.summary()
+        if summary["samples"] < self.min_samples:
+            return True
+        return summary["p95_latency"] <= self.p95_threshold and summary["error_rate"] <= self.error_rate_threshold
+
+    def choose(self, task: str) -> str:
+        with self._lock:
+            models = self.candidates(task)
+            for model in models:
+                if self._healthy(model):
+                    if model != models[0]:
+                        logger.warning(f"Routing '{task}' to {model}; preferred model {models[0]} is degraded")
+                    return model
+            return models[0]
+
+    def record(self, model: str, latency: float, ok: bool):
+        with self._lock:
+            self._stats.setdefault(model, ModelStats()).record(latency, ok)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "task_tiers": dict(self.task_tiers),
+                "models": {model: stats.summary() for model, stats in self._stats.items()},
+            }
+
+
+model_router = ModelRouter(
+    tiers=LLM_MODEL_TIERS,
+    task_tiers=LLM_TASK_TIERS,
+    tier_fallback=LLM_TIER_FALLBACK,
+    p95_threshold=LLM_FAILOVER_P95,
+    error_rate_threshold=LLM_FAILOVER_ERROR_RATE,
+)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_chat_model(model: str, temperature: float = None):
+    """Shared ChatGroq client per (model, temperature)"""
+    key = (model, temperature)
+    with _clients_lock:
+        if key not in _clients:
+            from langchain_groq import ChatGroq
+            params = {"groq_api_key": GROQ_API_KEY, "groq_api_base": GROQ_API_BASE, "model_name": model,
+                      # Retries are handled by the shared scheduler
+                      "max_retries": 0}
+            if temperature is not None:
+                params["temperature"] = temperature
+            _clients[key] = ChatGroq(**params)
+        return _clients[key]
+
+
+class RoutedChatModel:
+    """Chat model facade that picks the model for `task` on every call.
+
+    Latency is recorded per model: full completion time for invoke, time to first
+    chunk for stream.
+    """
+
+    def __init__(self, task: str, temperature: float = None, router: ModelRouter = None):
+        self.task = task
+        self.temperature = temperature
+        self.router = router or model_router
+
+    def invoke(self, messages, **kwargs):
+        model = self.router.choose(self.task)
+        start = time.monotonic()
+        try:
+            response = get_chat_model(model, self.temperature).invoke(messages, **kwargs)
+        except Exception:
+            self.router.record(model, time.monotonic() - start, ok=False)
+            raise
+        self.router.record(model, time.monotonic() - start, ok=True)
+        return response
+
+    def stream(self, messages, **kwargs):
+        model = self.router.choose(self.task)
+        start = time.monotonic()
+        started = False
+        try:
+            for chunk in get_chat_model(model, self.temperature).stream(messages, **kwargs):
+                if not started:
+                    started = True
+                    self.router.record(model, time.monotonic() - start, ok=True)
+                yield chunk
+        except Exception:
+            if not started:
+                self.router.record(model, time.monotonic() - start, ok=False)
+            raise
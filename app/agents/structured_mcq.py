@@ -0,0 +1,119 @@
+"""JSON-mode MCQ completions with per-item validation, repair and token accounting.
+
+Generation asks for a JSON object (through the API's JSON mode when MCQ_JSON_MODE is
+on) and checks every question against MCQSchema. Only the questions that fail go back
+to the model, together in one repair call listing their validation errors. Tokens
+spent on questions that fail are counted per agent in mcq_wasted_tokens_total.
+"""
+import json
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+from langchain.schema import HumanMessage
+
+from app.config import MCQ_JSON_MODE, MCQ_REPAIR_LIMIT
+from app.monitoring.metrics import MCQ_COMPLETION_TOKENS, MCQ_ITEMS, MCQ_WASTED_TOKENS
+from app.utils.mcq_parser import iter_mcqs, mcq_errors
+from app.utils.prompt_builder import count_tokens
+
+logger = logging.getLogger(__name__)
+
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+
+def completion_chunks(llm, prompt: str) -> Iterator[str]:
+    """Text of one completion; JSON mode returns it in one piece, otherwise it is streamed"""
+    messages = [HumanMessage(content=prompt)]
+    if MCQ_JSON_MODE:
+        yield llm.invoke(messages, response_format=JSON_OBJECT_FORMAT).content
+    else:
+        for chunk in llm.stream(messages):
+            yield chunk.content
+
+
+def _item_text(item) -> str:
+    return item if isinstance(item, str) else json.dumps(item)
+
+
+def record_usage(agent_type: str, text: str, valid: int, invalid_items: list, valid_status: str = "valid"):
+    if text:
+        MCQ_COMPLETION_TOKENS.labels(agent=agent_type).inc(count_tokens(text))
+    if valid:
+        MCQ_ITEMS.labels(agent=agent_type, status=valid_status).inc(valid)
+    if invalid_items:
+        MCQ_ITEMS.labels(agent=agent_type, status="invalid").inc(len(invalid_items))
+        MCQ_WASTED_TOKENS.labels(agent=agent_type).inc(sum(count_tokens(_item_text(item)) for item in invalid_items))
+
+
+def iter_structured_mcqs(llm, agent_type: str, prompt: str, invalid: Optional[list] = None,
+                         valid_status: str = "valid") -> Iterator[Tuple[Optional[str], dict]]:
+    """Yield (key, mcq) for each valid MCQ of one completion, like `iter_mcqs`.
+
+    Token usage is recorded when the generator finishes or is closed, so a caller
+    that stops early is charged for what was read.
+    """
+    invalid = [] if invalid is None else invalid
+    parts = []
+    valid = 0
+
+    def tee(chunks):
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+
+    try:
+        for key, mcq in iter_mcqs(tee(completion_chunks(llm, prompt)), invalid):
+            valid += 1
+            yield key, mcq
+    finally:
+        record_usage(agent_type, "".join(parts), valid, [item for _, item in invalid], valid_status)
+
+
+def repair_mcqs(llm, agent_type: str, invalid: list) -> List[Tuple[Optional[str], dict]]:
+    """Ask once for corrected versions of invalid (key, item) pairs.
+
+    Returns the (key, mcq) pairs that validate after the repair; the rest are left to
+    the caller to regenerate.
+    """
+    items = invalid[:MCQ_REPAIR_LIMIT]
+    if not items:
+        return []
+    listing = "\n".join(
+        f"        {index}. {_item_text(item)}\n           Problems: {'; '.join(mcq_errors(item))}"
+        for index, (_, item) in enumerate(items)
+    )
+    prompt = f"""
+        These multiple choice questions failed validation. Fix each one, keeping its content.
+        Every question needs non-empty "question", "option_a", "option_b", "option_c" and
+        "option_d", a "correct_answer" that is exactly one of "A", "B", "C" or "D", and an
+        "explanation".
+
+{listing}
+
+        Return ONLY a JSON object with the corrected questions under "mcqs", each with the
+        index it has above:
+        {{"mcqs": [{{
+            "index": 0,
+            "question": "...",
+            "option_a": "...",
+            "option_b": "...",
+            "option_c": "...",
+            "option_d": "...",
+            "correct_answer": "A",
+            "explanation": "..."
+        }}]}}
+        """
+
+    repaired, used = [], set()
+    try:
+        for _, mcq in iter_structured_mcqs(llm, agent_type, prompt, valid_status="repaired"):
+            index = mcq.pop("index", None)
+            if len(items) == 1:
+                index = 0
+            if isinstance(index, int) and 0 <= index < len(items) and index not in used:
+                used.add(index)
+                repaired.append((items[index][0], mcq))
+    except Exception as e:
+        logger.warning(f"MCQ repair failed for {agent_type} agent: {e}")
+    logger.info(f"{agent_type} agent: repaired {len(repaired)} of {len(items)} invalid MCQs")
+    return repaired
@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from langchain.schema import HumanMessage
+from .model_router import RoutedChatModel
+from .llm_scheduler import ScheduledLLM, Priority
+from itertools import islice
+from app.utils.mcq_parser import group_mcqs_by_topic
+from .structured_mcq import iter_structured_mcqs, repair_mcqs
+from app.utils.prompt_builder import build_context
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SubjectAgent(ABC):
+    """MCQ generation shared by the subject agents; subclasses supply the prompt wording"""
+
+    agent_type = ""
+    temperature = 0.5
+    health_prompt = ""
+    capabilities: list = []
+    # Fills "Create N <question_kind> multiple choice questions"
+    question_kind = ""
+    focus: list = []
+    # Field values of the example question shown in the prompt
+    example: dict = {}
+
+    def __init__(self):
+        self.llm = ScheduledLLM(RoutedChatModel("mcq_generation", temperature=self.temperature))
+        # Health pings only prove the agent can reach a model, so they use the cheap tier
+        self.health_llm = ScheduledLLM(RoutedChatModel("health"), priority=Priority.INTERACTIVE)
+
+    def health_check(self) -> dict:
+        """Check agent health and capabilities"""
+        try:
+            self.health_llm.invoke([HumanMessage(content=self.health_prompt)])
+            return {
+                "status": "healthy",
+                "agent_type": self.agent_type,
+                "capabilities": self.capabilities
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "agent_type": self.agent_type,
+                "error": str(e)
+            }
+
+    @abstractmethod
+    def fallback_mcq(self, topic: str) -> dict:
+        """Placeholder question used when generation produced nothing"""
+
+    def _example_json(self, indent: str) -> str:
+        fields = {**self.example, "correct_answer": "A", "difficulty": "medium"}
+        order = ["question", "option_a", "option_b", "option_c", "option_d", "correct_answer", "explanation", "difficulty"]
+        return ",\n".join(f'{indent}"{name}": "{fields[name]}"' for name in order)
+
+    def _focus_lines(self) -> str:
+        return "\n".join(f"        - {item}" for item in self.focus)
+
+    def stream_mcqs(self, topic: str, content: str, count: int = 3, exclude: list = None, invalid: list = None):
+        """Yield validated MCQs as each one completes in the model's response"""
+        exclude_note = ""
+        if exclude:
+            exclude_note = "Do not repeat these questions:\n" + "\n".join(f"        - {q}" for q in exclude)
+        prompt = f"""
+        Create {count} {self.question_kind} multiple choice questions for: {topic}
+        {exclude_note}
+
+        Content: {build_context(content, "mcq")}
+
+        Focus on:
+{self._focus_lines()}
+
+        Return ONLY a JSON object with the questions under "mcqs":
+        {{"mcqs": [{{
+{self._example_json("            ")}
+        }}]}}
+        """
+
+        for _, mcq in iter_structured_mcqs(self.llm, self.agent_type, prompt, invalid):
+            yield mcq
+
+    def generate_mcqs(self, topic: str, content: str, count: int = 3) -> list:
+        """Generate `count` MCQs for one topic"""
+        label = self.agent_type.capitalize()
+        mcqs = []
+        try:
+            # Stop reading as soon as enough valid questions arrived; repair or regenerate only what was broken
+            for attempt in range(2):
+                needed = count - len(mcqs)
+                if needed <= 0:
+                    break
+                invalid = []
+                stream = self.stream_mcqs(topic, content, needed, exclude=[m["question"] for m in mcqs], invalid=invalid)
+                mcqs.extend(islice(stream, needed))
+                if invalid:
+                    logger.warning(f"{label} agent: {len(invalid)} invalid MCQs for '{topic}' (attempt {attempt + 1})")
+                if invalid and len(mcqs) < count:
+                    # Fix the broken ones first; the next attempt regenerates whatever is still missing
+                    repaired = repair_mcqs(self.llm, self.agent_type, invalid)
+                    mcqs.extend(mcq for _, mcq in repaired[:count - len(mcqs)])
+
+            if mcqs:
+                return mcqs
+            return [self.fallback_mcq(topic)]
+
+        except Exception as e:
+            logger.error(f"{label} agent error: {e}")
+            return mcqs
+
+    def generate_mcqs_batch(self, topics: list, content: str, count: int = 3) -> dict:
+        """Generate MCQs for several topics in one call, keyed by topic"""
+        topic_lines = "\n".join(f"- {topic}" for topic in topics)
+        prompt = f"""
+        Create {count} {self.question_kind} multiple choice questions for EACH of these topics:
+        {topic_lines}
+
+        Content: {build_context(content, "mcq_batch")}
+
+        Focus on:
+{self._focus_lines()}
+
+        Return ONLY valid JSON: an object whose keys are the exact topic names above,
+        each mapping to a list of {count} questions:
+        {{
+            "<topic name>": [{{
+{self._example_json("                ")}
+            }}]
+        }}
+        """
+
+        try:
+            invalid = []
+            pairs = list(iter_structured_mcqs(self.llm, self.agent_type, prompt, invalid))
+            if invalid:
+                logger.warning(f"{self.agent_type.capitalize()} agent: {len(invalid)} invalid MCQs in batch of {len(topics)} topics")
+                pairs.extend(repair_mcqs(self.llm, self.agent_type, invalid))
+            grouped = group_mcqs_by_topic(pairs, topics)
+            return {topic: mcqs[:count] for topic, mcqs in grouped.items()}
+        except Exception as e:
+            logger.error(f"{self.agent_type.capitalize()} agent batch error: {e}")
+            return {}
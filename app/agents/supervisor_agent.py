@@ -1,20 +1,22 @@
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage
-from app.config import GROQ_API_KEY
+from .model_router import RoutedChatModel
+from .llm_scheduler import ScheduledLLM
 from .math_agent import MathAgent
 from .general_agent import GeneralAgent
-import re
+from app.utils.prompt_builder import build_context
+import json
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Topic names that are math whatever the model says, and the guess when it cannot be asked
+MATH_KEYWORDS = ['math', 'algebra', 'geometry', 'calculus', 'trigonometry', 'equation', 'formula', 'number']
+FALLBACK_MATH_KEYWORDS = ['math', 'algebra', 'geometry', 'calculus', 'trigonometry', 'statistics']
+
 class SupervisorAgent:
     def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name="gemma2-9b-it",
-            temperature=0.1
-        )
+        self.llm = ScheduledLLM(RoutedChatModel("classify", temperature=0.1))
         self.math_agent = MathAgent()
         self.general_agent = GeneralAgent()
         self.agents = {
@@ -28,7 +30,7 @@ class SupervisorAgent:
         Classify this topic as either "math" or "general":
         
         Topic: {topic}
-        Content: {content[:500]}
+        Content: {build_context(content, "classify")}
         
         Math topics include: algebra, geometry, calculus, statistics, trigonometry, arithmetic, equations, formulas, numbers
         General topics include: science, history, literature, biology, chemistry, physics concepts, social studies
@@ -41,17 +43,57 @@ class SupervisorAgent:
             classification = response.content.strip().lower()
             
             # Check for math keywords
-            math_keywords = ['math', 'algebra', 'geometry', 'calculus', 'trigonometry', 'equation', 'formula', 'number']
-            if any(keyword in topic.lower() or keyword in classification for keyword in math_keywords):
+            if any(keyword in topic.lower() or keyword in classification for keyword in MATH_KEYWORDS):
                 return "math"
             else:
                 return "general"
                 
         except Exception as e:
-            pass
-            # Default classification based on topic keywords
-            math_keywords = ['math', 'algebra', 'geometry', 'calculus', 'trigonometry', 'statistics']
-            return "math" if any(keyword in topic.lower() for keyword in math_keywords) else "general"
+            logger.warning(f"Topic classification failed for '{topic}', using keywords: {e}")
+            return self._keyword_classification(topic)
+
+    @staticmethod
+    def _keyword_classification(topic: str) -> str:
+        """Default classification based on topic keywords"""
+        return "math" if any(keyword in topic.lower() for keyword in FALLBACK_MATH_KEYWORDS) else "general"
+
+    def classify_topics(self, topics: list, content: str) -> dict:
+        """Classify several topics as "math" or "general" in one call, keyed by topic"""
+        # Topics named like math need no model call; the rest share a single one
+        classified = {topic: "math" for topic in topics if any(keyword in topic.lower() for keyword in MATH_KEYWORDS)}
+        pending = [topic for topic in dict.fromkeys(topics) if topic not in classified]
+        if not pending:
+            return classified
+
+        topic_lines = "\n".join(f"        - {topic}" for topic in pending)
+        prompt = f"""
+        Classify each of these topics as either "math" or "general":
+{topic_lines}
+        
+        Content: {build_context(content, "classify")}
+        
+        Math topics include: algebra, geometry, calculus, statistics, trigonometry, arithmetic, equations, formulas, numbers
+        General topics include: science, history, literature, biology, chemistry, physics concepts, social studies
+        
+        Return ONLY a JSON object mapping each exact topic name to "math" or "general".
+        """
+        answers = {}
+        try:
+            response = self.llm.invoke([HumanMessage(content=prompt)])
+            match = re.search(r"\{.*\}", response.content, re.DOTALL)
+            parsed = json.loads(match.group()) if match else {}
+            if isinstance(parsed, dict):
+                answers = {str(key).strip().lower(): str(value).lower() for key, value in parsed.items()}
+        except Exception as e:
+            logger.warning(f"Batch topic classification failed for {len(pending)} topics, using keywords: {e}")
+
+        for topic in pending:
+            answer = answers.get(topic.strip().lower())
+            if answer is None:
+                classified[topic] = self._keyword_classification(topic)
+            else:
+                classified[topic] = "math" if "math" in answer else "general"
+        return classified
     
     def check_agents_health(self) -> dict:
         """Check health of all agents"""
@@ -66,6 +108,22 @@ class SupervisorAgent:
             "healthy_agents": sum(1 for status in health_status.values() if status["status"] == "healthy")
         }
     
+    def select_agent(self, agent_type: str):
+        """(agent_type, agent) to use, falling back to the general agent when the
+        shared, periodically refreshed health check marks the requested one unhealthy"""
+        from app.monitoring.health import agent_health
+
+        agent = self.agents.get(agent_type, self.general_agent)
+        try:
+            status = agent_health.get().get("agents_health", {}).get(agent_type, {}).get("status", "healthy")
+        except Exception as e:
+            logger.warning(f"Agent health unavailable, using {agent_type} agent: {e}")
+            return agent_type, agent
+        if status != "healthy":
+            logger.warning(f"Agent {agent_type} is unhealthy, falling back to general agent")
+            return "general", self.general_agent
+        return agent_type, agent
+
     def delegate_mcq_generation(self, topic: str, content: str, count: int = 3) -> dict:
         """Delegate MCQ generation to appropriate agent"""
         try:
@@ -74,19 +132,10 @@ class SupervisorAgent:
             logger.info(f"Delegating '{topic}' to {agent_type} agent")
             
             # Check agent health before delegation
-            agent = self.agents.get(agent_type, self.general_agent)
-            health = agent.health_check()
-            
-            if health["status"] != "healthy":
-                logger.warning(f"Agent {agent_type} is unhealthy, falling back to general agent")
-                agent = self.general_agent
-                agent_type = "general"
+            agent_type, agent = self.select_agent(agent_type)
             
             # Generate MCQs using appropriate agent
-            if agent_type == "math":
-                mcqs = agent.generate_math_mcqs(topic, content, count)
-            else:
-                mcqs = agent.generate_general_mcqs(topic, content, count)
+            mcqs = agent.generate_mcqs(topic, content, count)
             
             logger.info(f"Generated {len(mcqs)} MCQs for topic '{topic}' using {agent_type} agent")
             
@@ -106,7 +155,73 @@ class SupervisorAgent:
                 "error": str(e),
                 "status": "failed"
             }
-    
+
+    def plan_mcq_batches(self, topics: list, content: str, batch_size: int = 5) -> list:
+        """Classify topics and group them into per-agent batches of at most `batch_size`"""
+        # One classification call for every topic, not one round trip each
+        agent_types = self.classify_topics(topics, content)
+        groups = {}
+        for topic in topics:
+            groups.setdefault(agent_types[topic], []).append(topic)
+        return [
+            {"agent_type": agent_type, "topics": group_topics[start:start + batch_size]}
+            for agent_type, group_topics in groups.items()
+            for start in range(0, len(group_topics), batch_size)
+        ]
+
+    def generate_mcq_batch(self, agent_type: str, topics: list, content: str, count: int = 3) -> dict:
+        """Generate MCQs for one batch of topics with a single agent call.
+
+        Topics missing from the response are retried once, batched together. Returns a
+        dict of topic -> result shaped like `delegate_mcq_generation`.
+        """
+        agent_type, agent = self.select_agent(agent_type)
+        generate_batch = agent.generate_mcqs_batch
+
+        results = {}
+        pending = list(topics)
+        for attempt in range(2):
+            logger.info(f"Delegating batch of {len(pending)} topics to {agent_type} agent")
+            logger.debug(f"Batch topics: {pending}")
+            batch_mcqs = generate_batch(pending, content, count)
+            missing = []
+            for topic in pending:
+                if batch_mcqs.get(topic):
+                    results[topic] = {
+                        "mcqs": batch_mcqs[topic],
+                        "agent_used": agent_type,
+                        "topic": topic,
+                        "count": len(batch_mcqs[topic]),
+                        "status": "success"
+                    }
+                else:
+                    missing.append(topic)
+            if not missing:
+                break
+            logger.warning(f"{len(missing)} topics missing from {agent_type} batch response (attempt {attempt + 1}): {missing}")
+            pending = missing
+
+        for topic in topics:
+            if topic not in results:
+                results[topic] = {
+                    "mcqs": [],
+                    "agent_used": agent_type,
+                    "topic": topic,
+                    "error": "Topic missing from batch response",
+                    "status": "failed"
+                }
+        return results
+
+    def delegate_batch_mcq_generation(self, topics: list, content: str, count: int = 3, batch_size: int = 5) -> dict:
+        """Delegate MCQ generation for many topics, packing several topics into each agent call.
+
+        Returns a dict of topic -> result shaped like `delegate_mcq_generation`.
+        """
+        results = {}
+        for batch in self.plan_mcq_batches(topics, content, batch_size):
+            results.update(self.generate_mcq_batch(batch["agent_type"], batch["topics"], content, count))
+        return results
+
     def evaluate_exam_answers(self, questions: list, answers: dict) -> dict:
         """Evaluate exam answers and calculate detailed scores"""
         try:
@@ -1,38 +1,161 @@
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage
-from app.config import GROQ_API_KEY
+from .model_router import RoutedChatModel
+from .llm_scheduler import ScheduledLLM, Priority
+from app.utils.prompt_builder import build_context, count_tokens, prepare_context
+from app.utils.syllabus_diff import split_chunks
+from app.utils.topic_merge import cluster_candidates, group_windows
+from app.utils.topic_index import normalize_topic
+from app.config import (
+    PROMPT_TOKEN_BUDGETS,
+    TOPIC_MAP_CONCURRENCY,
+    TOPIC_MAP_WINDOW_TOKENS,
+    TOPIC_MAP_MAX_WINDOW_TOKENS,
+    TOPIC_MAP_MAX_CALLS,
+    TOPIC_RANK_CANDIDATES,
+    REVISION_NEW_TOPICS,
+)
+from concurrent.futures import ThreadPoolExecutor
+import ast
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+MIN_TOPICS = 5
+MAX_TOPICS = 10
 
 class SyllabusAgent:
-    def __init__(self):
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name="gemma2-9b-it"
+    def __init__(self, priority: Priority = Priority.BACKGROUND):
+        self.llm = ScheduledLLM(RoutedChatModel("topic_extraction"), priority=priority)
+
+    def extract_topics(self, syllabus_content: str, chunks: list = None) -> list:
+        """Key topics of a syllabus; text over the prompt budget goes through map-reduce.
+
+        `chunks` passes the text's `split_chunks` when the caller already has them.
+        """
+        if count_tokens(prepare_context(syllabus_content)) <= PROMPT_TOKEN_BUDGETS["syllabus"]:
+            prompt = f"""
+        Extract 5-10 key topics from this syllabus content. Return ONLY a Python list format.
+
+        Syllabus: {build_context(syllabus_content, "syllabus")}
+
+        Return format: ["Topic 1", "Topic 2", "Topic 3"]
+        """
+            return self._ask_for_topics(prompt) or ["General Topics", "Key Concepts", "Important Points"]
+        return self.extract_topics_map_reduce(syllabus_content, chunks)
+
+    def extract_revision_topics(self, section: str, existing: list) -> list:
+        """Topics of an edited section, reusing the names of topics the syllabus already has.
+
+        Long sections go through the normal extraction; the caller matches the result
+        against `existing` and limits how many new topics it takes.
+        """
+        if count_tokens(prepare_context(section)) > PROMPT_TOKEN_BUDGETS["syllabus"]:
+            return self.extract_topics(section)
+        existing_lines = "\n".join(f"        - {topic}" for topic in existing)
+        prompt = f"""
+        This section of a syllabus was added or edited. The syllabus already covers these topics:
+{existing_lines}
+
+        List the topics this section covers. Use the exact name above for a topic that is
+        already covered, and add at most {REVISION_NEW_TOPICS} new topics, only for material
+        none of them covers. Return ONLY a Python list format.
+
+        Section: {build_context(section, "syllabus")}
+
+        Return format: ["Topic 1", "Topic 2", "Topic 3"]
+        """
+        return self._ask_for_topics(prompt)
+
+    def extract_topics_map_reduce(self, syllabus_content: str, chunks: list = None) -> list:
+        """Extract candidates from every window of the text in parallel, then merge and rank them.
+
+        Windows widen with the document so the number of calls stays under
+        TOPIC_MAP_MAX_CALLS; with TOPIC_MAP_CONCURRENCY of them in flight, wall time
+        grows far slower than the text does.
+        """
+        chunks = chunks if chunks is not None else split_chunks(syllabus_content)
+        total_tokens = sum(count_tokens(chunk) for chunk in chunks)
+        window_tokens = min(TOPIC_MAP_MAX_WINDOW_TOKENS,
+                            max(TOPIC_MAP_WINDOW_TOKENS, math.ceil(total_tokens / TOPIC_MAP_MAX_CALLS)))
+        windows = group_windows(chunks, window_tokens)
+
+        with ThreadPoolExecutor(max_workers=max(1, TOPIC_MAP_CONCURRENCY)) as pool:
+            per_window = list(pool.map(self._extract_window_topics, windows))
+        if not any(per_window):
+            raise RuntimeError(f"Topic extraction returned nothing for all {len(windows)} windows")
+
+        clusters = cluster_candidates(per_window)
+        logger.info(
+            f"Map-reduce topic extraction: {total_tokens} tokens in {len(windows)} windows, "
+            f"{sum(len(topics) for topics in per_window)} candidates merged into {len(clusters)}"
         )
-    
-    def extract_topics(self, syllabus_content: str) -> list:
+        if len(clusters) <= MAX_TOPICS:
+            return [cluster["name"] for cluster in clusters]
+        return self._rank_topics(clusters[:TOPIC_RANK_CANDIDATES])
+
+    def _extract_window_topics(self, window: str) -> list:
         prompt = f"""
-        Extract 5-10 key topics from this syllabus content. Return ONLY a Python list format.
-        
-        Syllabus: {syllabus_content[:2000]}...
-        
+        Extract up to 8 key topics covered in this section of a syllabus. Return ONLY a Python list format.
+
+        Section: {window}
+
         Return format: ["Topic 1", "Topic 2", "Topic 3"]
         """
-        
+        try:
+            return self._ask_for_topics(prompt)
+        except Exception as e:
+            logger.warning(f"Topic extraction failed for one syllabus window: {str(e)}")
+            return []
+
+    def _rank_topics(self, clusters: list) -> list:
+        """Pick the most important of the merged candidates in one short call"""
+        fallback = [cluster["name"] for cluster in clusters[:MAX_TOPICS]]
+        candidates = "\n".join(f"- {c['name']} (found in {c['count']} sections)" for c in clusters)
+        prompt = f"""
+        These candidate topics were found across a syllabus. Choose the 5-10 most important
+        topics for exam preparation, using the exact names below. Return ONLY a Python list format.
+
+        Candidates:
+        {candidates}
+
+        Return format: ["Topic 1", "Topic 2", "Topic 3"]
+        """
+        try:
+            chosen = self._ask_for_topics(prompt)
+        except Exception as e:
+            logger.warning(f"Topic ranking failed, using frequency order: {str(e)}")
+            return fallback
+
+        by_key = {normalize_topic(c["name"]): c["name"] for c in clusters}
+        ranked = []
+        for name in chosen:
+            match = by_key.get(normalize_topic(name))
+            if match and match not in ranked:
+                ranked.append(match)
+        # Top up from frequency order when the model strayed from the candidate names
+        for name in fallback:
+            if len(ranked) >= MIN_TOPICS:
+                break
+            if name not in ranked:
+                ranked.append(name)
+        return ranked[:MAX_TOPICS]
+
+    def _ask_for_topics(self, prompt: str) -> list:
         response = self.llm.invoke([HumanMessage(content=prompt)])
         topics_str = response.content.strip()
-        
+
         # Try to extract list from response
         try:
             # Look for list pattern in response
-            import re
-            import ast
             list_match = re.search(r'\[.*?\]', topics_str, re.DOTALL)
             if list_match:
                 topics = ast.literal_eval(list_match.group())
-                return topics if isinstance(topics, list) else ["General Topics"]
+                return [t for t in topics if isinstance(t, str) and t.strip()] if isinstance(topics, list) else []
             else:
                 # Fallback: split by lines and clean
                 lines = [line.strip().strip('"').strip("'") for line in topics_str.split('\n') if line.strip()]
-                return lines[:10] if lines else ["General Topics"]
-        except (ValueError, SyntaxError) as e:
-            return ["General Topics", "Key Concepts", "Important Points"]
\ No newline at end of file
+                return lines[:10]
+        except (ValueError, SyntaxError):
+            return []
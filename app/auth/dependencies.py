@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import HTTPException, Request
+from app.auth.jwt_handler import verify_token
+
+def _bearer_token(request: Request) -> Optional[str]:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    return auth_header.split(" ")[1]
+
+def get_current_user_data(request: Request) -> dict:
+    """JWT payload of the authenticated user; 401 without a valid token"""
+    token = _bearer_token(request)
+    if not token:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    user_data = verify_token(token)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user_data
+
+def get_optional_user_data(request: Request) -> Optional[dict]:
+    """JWT payload when a valid token was sent, otherwise None"""
+    token = _bearer_token(request)
+    return verify_token(token) if token else None
@@ -1,9 +1,10 @@
-from google.auth.transport import requests
-from google.oauth2 import id_token
 from datetime import datetime, timedelta
 from jose import jwt
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -11,6 +12,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
 def verify_google_token(token: str):
     """Verify Google OAuth token and return user info"""
+    # google-auth is only needed at login, so it is not loaded at startup
+    from google.auth.transport import requests
+    from google.oauth2 import id_token
     try:
         idinfo = id_token.verify_oauth2_token(
             token, requests.Request(), GOOGLE_CLIENT_ID
@@ -41,5 +45,5 @@ def verify_token(token: str):
             return None
         return payload
     except Exception as e:
-        print(f"Token verification error: {e}")
+        logger.warning(f"Token verification failed: {type(e).__name__}")
         return None
\ No newline at end of file
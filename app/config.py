@@ -1,11 +1,132 @@
+import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Override to point the agents at a Groq-compatible endpoint (e.g. benchmarks/groq_stub.py)
+GROQ_API_BASE = os.getenv("GROQ_API_BASE")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./exam_prep.db")
+# Optional read replica (Postgres) for read-only routes
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Create missing tables on startup; disable in production and run `python -m app.models.init_db` on deploy
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "true").lower() == "true"
+# zlib level for stored syllabus text (1 = fastest, 9 = smallest)
+SYLLABUS_COMPRESSION_LEVEL = int(os.getenv("SYLLABUS_COMPRESSION_LEVEL", "6"))
+# Syllabus documents kept decompressed in memory for running workflows
+SYLLABUS_CACHE_SIZE = int(os.getenv("SYLLABUS_CACHE_SIZE", "8"))
 CHROMA_PERSIST_DIRECTORY = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
+# Semantic search over syllabus chunks. M and construction_ef only apply when the collection
+# is created; search_ef trades recall for latency on every query.
+SEARCH_COLLECTION = os.getenv("SEARCH_COLLECTION", "syllabus_content")
+CHROMA_HNSW_M = int(os.getenv("CHROMA_HNSW_M", "16"))
+CHROMA_HNSW_CONSTRUCTION_EF = int(os.getenv("CHROMA_HNSW_CONSTRUCTION_EF", "100"))
+CHROMA_HNSW_SEARCH_EF = int(os.getenv("CHROMA_HNSW_SEARCH_EF", "64"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+# Shared Redis for cross-worker coordination; without it, coalescing and idempotency are per process
+REDIS_URL = os.getenv("REDIS_URL")
+# Concurrent prepare-exam calls for the same syllabus wait for one run instead of starting their own.
+# The run's lock is renewed while it is alive, so this only bounds how long a crashed run blocks others
+PREPARE_LOCK_TTL_SECONDS = int(os.getenv("PREPARE_LOCK_TTL_SECONDS", "30"))
+PREPARE_WAIT_TIMEOUT_SECONDS = int(os.getenv("PREPARE_WAIT_TIMEOUT_SECONDS", "900"))
+# Served quizzes keep their answer key here until submitted
+QUIZ_SESSION_TTL_SECONDS = int(os.getenv("QUIZ_SESSION_TTL_SECONDS", "7200"))
+# How long a response is replayed for a repeated Idempotency-Key
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# /ready serves dependency probe results refreshed in the background at this interval;
+# the deep agent check (real LLM calls) runs at most once per AGENT_HEALTH_INTERVAL_SECONDS
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "10"))
+HEALTH_PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2"))
+AGENT_HEALTH_INTERVAL_SECONDS = float(os.getenv("AGENT_HEALTH_INTERVAL_SECONDS", "300"))
+
+# SQLite file for LangGraph workflow checkpoints (Postgres deployments use DATABASE_URL)
+WORKFLOW_CHECKPOINT_DB = os.getenv("WORKFLOW_CHECKPOINT_DB", "./workflow_checkpoints.db")
+
+# Topics packed into one MCQ generation prompt (1 = one call per topic)
+MCQ_BATCH_SIZE = int(os.getenv("MCQ_BATCH_SIZE", "5"))
+
+# Estimated Jaccard similarity (question + correct option) at which two MCQs count as duplicates
+MCQ_DEDUP_THRESHOLD = float(os.getenv("MCQ_DEDUP_THRESHOLD", "0.6"))
+
+# Ask for MCQs in the API's JSON mode (whole response at once) instead of streaming free text
+MCQ_JSON_MODE = os.getenv("MCQ_JSON_MODE", "true").lower() == "true"
+# Invalid MCQs sent back for one repair call per response (0 = regenerate instead)
+MCQ_REPAIR_LIMIT = int(os.getenv("MCQ_REPAIR_LIMIT", "10"))
+
+# Canonical topic index: topics are merged when their names normalize to the same key
+# or their embeddings are at least this similar (cosine)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+TOPIC_EMBEDDINGS_ENABLED = os.getenv("TOPIC_EMBEDDINGS_ENABLED", "true").lower() == "true"
+TOPIC_MATCH_THRESHOLD = float(os.getenv("TOPIC_MATCH_THRESHOLD", "0.88"))
+# Path prefix of the memory-mapped topic embedding snapshot (<prefix>.ids.npy / .vectors.npy, and
+# .meta.json recording the database it was taken from; a snapshot that does not match is rebuilt)
+TOPIC_INDEX_SNAPSHOT = os.getenv("TOPIC_INDEX_SNAPSHOT", "data/topic_index")
+# Serve covered topics from every user's questions; false limits reuse to the syllabus owner's own
+QUESTION_BANK_SHARED = os.getenv("QUESTION_BANK_SHARED", "true").lower() == "true"
+
+# Map-reduce topic extraction for syllabi longer than the syllabus prompt budget: topics are
+# extracted from windows of the text in parallel, merged locally, and ranked in one final call.
+# Windows grow past TOPIC_MAP_WINDOW_TOKENS (up to the max) to keep calls under TOPIC_MAP_MAX_CALLS.
+TOPIC_MAP_CONCURRENCY = int(os.getenv("TOPIC_MAP_CONCURRENCY", "4"))
+TOPIC_MAP_WINDOW_TOKENS = int(os.getenv("TOPIC_MAP_WINDOW_TOKENS", "2000"))
+TOPIC_MAP_MAX_WINDOW_TOKENS = int(os.getenv("TOPIC_MAP_MAX_WINDOW_TOKENS", "6000"))
+TOPIC_MAP_MAX_CALLS = int(os.getenv("TOPIC_MAP_MAX_CALLS", "16"))
+# Candidates shown to the ranking call (it is skipped when there are at most 10)
+TOPIC_RANK_CANDIDATES = int(os.getenv("TOPIC_RANK_CANDIDATES", "30"))
+# Re-uploads: new topics taken from the edited chunks, and the most topics a syllabus keeps
+REVISION_NEW_TOPICS = int(os.getenv("REVISION_NEW_TOPICS", "3"))
+SYLLABUS_MAX_TOPICS = int(os.getenv("SYLLABUS_MAX_TOPICS", "15"))
+
+# Flashcards generated per topic alongside the MCQs, and topics worked on at once
+FLASHCARDS_PER_TOPIC = int(os.getenv("FLASHCARDS_PER_TOPIC", "5"))
+FLASHCARD_CONCURRENCY = int(os.getenv("FLASHCARD_CONCURRENCY", "4"))
+
+# Shared LLM call scheduler (AIMD concurrency, retries with backoff)
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TARGET_LATENCY = float(os.getenv("LLM_TARGET_LATENCY", "15"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+
+# Model tiers: each agent task maps to a tier, each tier lists models in preference order
+# and may fall back to another tier when all of its models are degraded
+LLM_MODEL_TIERS = json.loads(os.getenv(
+    "LLM_MODEL_TIERS",
+    '{"fast": ["llama-3.1-8b-instant"], "quality": ["gemma2-9b-it", "llama-3.3-70b-versatile"]}'
+))
+LLM_TIER_FALLBACK = json.loads(os.getenv("LLM_TIER_FALLBACK", '{"quality": "fast"}'))
+LLM_TASK_TIERS = json.loads(os.getenv(
+    "LLM_TASK_TIERS",
+    '{"classify": "fast", "health": "fast", "topic_extraction": "quality", '
+    '"mcq_generation": "quality", "flashcards": "quality"}'
+))
+# A model is skipped while its recent p95 latency (s) or error rate exceeds these
+LLM_FAILOVER_P95 = float(os.getenv("LLM_FAILOVER_P95", "20"))
+LLM_FAILOVER_ERROR_RATE = float(os.getenv("LLM_FAILOVER_ERROR_RATE", "0.25"))
+
+# Token budget for the syllabus context each agent puts into its prompt
+PROMPT_TOKEN_BUDGETS = {
+    "syllabus": int(os.getenv("PROMPT_BUDGET_SYLLABUS", "600")),
+    "classify": int(os.getenv("PROMPT_BUDGET_CLASSIFY", "120")),
+    "mcq": int(os.getenv("PROMPT_BUDGET_MCQ", "300")),
+    "mcq_batch": int(os.getenv("PROMPT_BUDGET_MCQ_BATCH", "600")),
+    "flashcard": int(os.getenv("PROMPT_BUDGET_FLASHCARD", "800")),
+}
+
+# Logging: records are queued and written by a background thread (JSON to stdout and a rotating file)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text" for the console
+LOG_FILE = os.getenv("LOG_FILE", "logs/exam_agent.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# Records buffered for the log writer thread; overflow is dropped and counted in log_records_dropped_total
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Share of DEBUG records kept per logger prefix, e.g. {"app.agents": 0.1}
+LOG_SAMPLE_RATES = json.loads(os.getenv("LOG_SAMPLE_RATES", "{}"))
 
 # LangSmith Configuration
 LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "true")
@@ -3,17 +3,30 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 import html
+import asyncio
+from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
-from app.models.db import get_db, engine, Base
-from app.routes import workflow_routes, auth_routes
-from app.utils.logger import logger
+from app.models.db import get_db
+from app.config import DB_AUTO_CREATE
+from app.routes import (
+    workflow_routes, auth_routes, history_routes, flashcard_routes, search_routes, analytics_routes, health_routes
+)
+from app.utils.logger import logger, setup_logging
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-logger.info("Database tables created")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    if DB_AUTO_CREATE:
+        from app.models.init_db import init_db
+        init_db()
+    from app.monitoring.health import readiness
+    await readiness.refresh()
+    probe_task = asyncio.create_task(readiness.run_forever())
+    logger.info("FastAPI app initialized")
+    yield
+    probe_task.cancel()
 
-app = FastAPI(title="Exam Prep Agent")
-logger.info("FastAPI app initialized")
+app = FastAPI(title="Exam Prep Agent", lifespan=lifespan)
 templates = Jinja2Templates(directory="app/templates")
 templates.env.autoescape = True
 
@@ -22,8 +35,13 @@ async def test():
     return {"message": "Server is working!"}
 
 # Include routes
+app.include_router(health_routes.router)
 app.include_router(workflow_routes.router, prefix="/api")
 app.include_router(auth_routes.router, prefix="/api")
+app.include_router(history_routes.router, prefix="/api")
+app.include_router(flashcard_routes.router, prefix="/api")
+app.include_router(search_routes.router, prefix="/api")
+app.include_router(analytics_routes.router, prefix="/api")
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -1,10 +1,31 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from app.config import DATABASE_URL, DATABASE_REPLICA_URL, SQLITE_BUSY_TIMEOUT_MS
+
+def _create_engine(url: str):
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            # WAL lets readers run alongside the single writer, and busy_timeout makes
+            # concurrent writers wait for the lock instead of failing with "database is locked"
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+        
+        return engine
+    return create_engine(url, pool_pre_ping=True)
+
+engine = _create_engine(DATABASE_URL)
+# Read-only routes use the replica when one is configured
+read_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else engine
 
-engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 def get_db():
@@ -12,4 +33,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """Session for routes that only read; served by the read replica if configured"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
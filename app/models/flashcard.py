@@ -6,7 +6,7 @@ class Flashcard(Base):
     __tablename__ = "flashcards"
     
     id = Column(Integer, primary_key=True, index=True)
-    syllabus_id = Column(Integer, ForeignKey("syllabus.id"))
+    syllabus_id = Column(Integer, ForeignKey("syllabus.id"), index=True)
     front = Column(Text)
     back = Column(Text)
     topic = Column(String)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .db import Base
+
+class FlashcardReview(Base):
+    """A user's spaced-repetition state for one flashcard"""
+    __tablename__ = "flashcard_reviews"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    flashcard_id = Column(Integer, ForeignKey("flashcards.id"), nullable=False)
+    ease_factor = Column(Float, default=2.5)
+    interval_days = Column(Integer, default=0)
+    repetitions = Column(Integer, default=0)
+    lapses = Column(Integer, default=0)
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # UTC
+    last_reviewed_at = Column(DateTime)
+    
+    flashcard = relationship("Flashcard")
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "flashcard_id", name="uq_flashcard_reviews_user_card"),
+        # "Next N due cards" is a range scan over one user's slice of this index
+        Index("ix_flashcard_reviews_user_due", "user_id", "due_at", "id"),
+    )
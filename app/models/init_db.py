@@ -0,0 +1,23 @@
+"""Create the database schema.
+
+Run once per deployment (`python -m app.models.init_db`) instead of on every
+worker boot; development servers still call it from the app lifespan when
+DB_AUTO_CREATE is enabled.
+"""
+import logging
+from app.models.db import engine, Base
+# Import every model so its table is registered on Base.metadata
+from app.models import (  # noqa: F401
+    user, syllabus, syllabus_chunk, mcq, quiz, quiz_attempt, flashcard, flashcard_review, topic,
+    score_bucket, leaderboard_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+def init_db():
+    Base.metadata.create_all(bind=engine)
+    logger.info("Database tables created")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_db()
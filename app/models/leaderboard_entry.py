@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from .db import Base
+
+class LeaderboardEntry(Base):
+    """A user's best quiz score for a syllabus"""
+    __tablename__ = "leaderboard_entries"
+    
+    syllabus_id = Column(Integer, ForeignKey("syllabus.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    best_score = Column(Float, nullable=False)
+    attempts = Column(Integer, nullable=False, default=1)
+    achieved_at = Column(DateTime, default=datetime.utcnow)  # when best_score was reached
+    
+    __table_args__ = (
+        # Top-N per syllabus is a scan of the first N entries of this index
+        Index("ix_leaderboard_syllabus_score", "syllabus_id", best_score.desc(), "achieved_at"),
+    )
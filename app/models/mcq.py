@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .db import Base
+from .topic import Topic  # registers the topics table referenced by topic_id
 
 class MCQ(Base):
     __tablename__ = "mcqs"
@@ -15,5 +16,11 @@ class MCQ(Base):
     correct_answer = Column(String)
     explanation = Column(Text)
     topic = Column(String)
+    topic_id = Column(Integer, ForeignKey("topics.id"), index=True)  # canonical topic
     
-    syllabus = relationship("Syllabus")
\ No newline at end of file
+    syllabus = relationship("Syllabus")
+    
+    __table_args__ = (
+        # Keyset pagination of a syllabus's question bank
+        Index("ix_mcqs_syllabus_id_id", "syllabus_id", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Bring an existing database up to the current models.
+
+`create_all` (init_db) only creates missing tables; it never touches tables that already
+exist. Run this once per database after upgrading
+(`python -m app.models.migrate_schema`): it creates missing tables, adds missing
+nullable columns (such as mcqs.topic_id) and creates missing indexes (such as the
+keyset pagination indexes). Safe to run again; it only adds what is not there.
+"""
+import logging
+from typing import Dict, List
+
+from sqlalchemy import inspect, text
+
+from app.models.db import Base, engine
+from app.models.init_db import init_db
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column) -> str:
+    ddl = f"{column.name} {column.type.compile(dialect=engine.dialect)}"
+    foreign_keys = list(column.foreign_keys)
+    if len(foreign_keys) == 1:
+        target = foreign_keys[0].column
+        ddl += f" REFERENCES {target.table.name} ({target.name})"
+    return ddl
+
+
+def migrate_schema() -> Dict[str, List[str]]:
+    existing_tables = set(inspect(engine).get_table_names())
+    init_db()
+    added = {"columns": [], "indexes": []}
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                if not column.nullable or column.primary_key:
+                    logger.warning(f"Cannot add required column {table.name}.{column.name}; migrate it by hand")
+                    continue
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column)}"))
+                added["columns"].append(f"{table.name}.{column.name}")
+
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(bind=conn)
+                    added["indexes"].append(index.name)
+    logger.info(f"Added columns {added['columns'] or 'none'}; created indexes {added['indexes'] or 'none'}")
+    return added
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_schema()
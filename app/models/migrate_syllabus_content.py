@@ -0,0 +1,85 @@
+"""Move existing syllabi to compressed content with a stored content hash.
+
+Run once per database after upgrading (`python -m app.models.migrate_syllabus_content`).
+It adds the content_hash column, turns a Postgres TEXT content column into BYTEA, and
+rewrites every row whose content is not compressed yet, with its hash. Rows are picked
+by their stored bytes rather than a missing hash, because prepare-exam fills in hashes
+on its own. Safe to run again; until it has run, old rows are still read correctly.
+"""
+import zlib
+import logging
+
+from sqlalchemy import LargeBinary, bindparam, inspect, select, text, type_coerce, update
+
+from app.models.db import SessionLocal, engine
+from app.models import user  # noqa: F401  (registers User for Syllabus.owner)
+from app.models.syllabus import Syllabus
+from app.models.types import CompressedText
+from app.utils.syllabus_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _compressed(raw) -> bool:
+    if not isinstance(raw, (bytes, memoryview)):
+        return False
+    try:
+        zlib.decompress(bytes(raw))
+    except zlib.error:
+        return False
+    return True
+
+
+def _stored_text(raw) -> str:
+    if isinstance(raw, str):
+        return raw
+    raw = bytes(raw)
+    return zlib.decompress(raw).decode("utf-8") if _compressed(raw) else raw.decode("utf-8")
+
+
+def migrate_syllabus_content(batch_size: int = 100) -> int:
+    columns = {column["name"]: column for column in inspect(engine).get_columns("syllabus")}
+    with engine.begin() as conn:
+        if "content_hash" not in columns:
+            conn.execute(text("ALTER TABLE syllabus ADD COLUMN content_hash VARCHAR(64)"))
+        # SQLite stores the compressed bytes in the existing column as they are
+        if engine.dialect.name == "postgresql" and not isinstance(columns["content"]["type"], LargeBinary):
+            conn.execute(text(
+                "ALTER TABLE syllabus ALTER COLUMN content TYPE BYTEA USING convert_to(content, 'UTF8')"
+            ))
+
+    table = Syllabus.__table__
+    rewrite = update(table).where(table.c.id == bindparam("row_id")).values(
+        content=bindparam("text", type_=CompressedText()), content_hash=bindparam("digest")
+    )
+    db = SessionLocal()
+    migrated, last_id = 0, 0
+    try:
+        while True:
+            # Raw stored values: text or unconverted bytes in rows written before compression
+            rows = db.execute(
+                select(table.c.id, type_coerce(table.c.content, LargeBinary).label("raw"), table.c.content_hash)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            pending = [row for row in rows if row.content_hash is None or (row.raw is not None and not _compressed(row.raw))]
+            if not pending:
+                continue
+            texts = [(row.id, _stored_text(row.raw) if row.raw is not None else None) for row in pending]
+            db.execute(rewrite, [
+                {"row_id": row_id, "text": content, "digest": content_hash(content)} for row_id, content in texts
+            ])
+            db.commit()
+            migrated += len(pending)
+    finally:
+        db.close()
+    logger.info(f"Compressed content of {migrated} syllabi")
+    return migrated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_syllabus_content()
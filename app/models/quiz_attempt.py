@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .db import Base
@@ -15,4 +15,9 @@ class QuizAttempt(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    syllabus = relationship("Syllabus")
\ No newline at end of file
+    syllabus = relationship("Syllabus")
+    
+    __table_args__ = (
+        # Keyset pagination of a user's attempts, newest first
+        Index("ix_quiz_attempts_user_created", "user_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from .db import Base
+
+class ScoreBucket(Base):
+    """Number of quiz submissions for a syllabus per whole-percent score (0-100)"""
+    __tablename__ = "score_buckets"
+    
+    syllabus_id = Column(Integer, ForeignKey("syllabus.id"), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
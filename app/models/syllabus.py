@@ -1,17 +1,28 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from .db import Base
+from .types import CompressedText
 
 class Syllabus(Base):
     __tablename__ = "syllabus"
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
-    content = Column(Text)
+    # Compressed, and only loaded when accessed; most queries never need the text
+    content = deferred(Column(CompressedText))
+    # sha256 of content, so work can be keyed on a revision without loading it
+    content_hash = Column(String(64))
+    # content_hash of the revision in the search index; set once indexing has finished
+    search_index_hash = Column(String(64))
     topics = Column(Text)  # JSON string of extracted topics
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    owner = relationship("User", back_populates="syllabi")
\ No newline at end of file
+    owner = relationship("User", back_populates="syllabi")
+    
+    __table_args__ = (
+        # Keyset pagination of a user's syllabi, newest first
+        Index("ix_syllabus_user_created", "user_id", "created_at", "id"),
+    )
\ No newline at end of file
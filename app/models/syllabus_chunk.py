@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from .db import Base
+
+class SyllabusChunk(Base):
+    __tablename__ = "syllabus_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    syllabus_id = Column(Integer, ForeignKey("syllabus.id"), index=True)
+    position = Column(Integer)
+    content_hash = Column(String(64))
+    topics = Column(Text)  # JSON list of topics found in this chunk
+    
+    syllabus = relationship("Syllabus")
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from .db import Base
+
+# Canonical topics covered by each syllabus
+syllabus_topics = Table(
+    "syllabus_topics",
+    Base.metadata,
+    Column("syllabus_id", Integer, ForeignKey("syllabus.id"), primary_key=True),
+    Column("topic_id", Integer, ForeignKey("topics.id"), primary_key=True, index=True),
+)
+
+class Topic(Base):
+    __tablename__ = "topics"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    embedding = Column(Text)  # JSON list of floats, empty when no embedder is available
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    aliases = relationship("TopicAlias", back_populates="topic")
+
+class TopicAlias(Base):
+    __tablename__ = "topic_aliases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String, unique=True, index=True, nullable=False)  # normalized topic name
+    topic_id = Column(Integer, ForeignKey("topics.id"), index=True, nullable=False)
+    
+    topic = relationship("Topic", back_populates="aliases")
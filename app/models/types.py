@@ -0,0 +1,31 @@
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.config import SYLLABUS_COMPRESSION_LEVEL
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed in a binary column.
+
+    Rows written before compression are still read: plain text comes back unchanged
+    from a text column, and as undecompressable bytes from one converted to binary.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), SYLLABUS_COMPRESSION_LEVEL)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        try:
+            return zlib.decompress(value).decode("utf-8")
+        except zlib.error:
+            return value.decode("utf-8")
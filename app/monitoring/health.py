@@ -0,0 +1,149 @@
+"""Cheap liveness/readiness answers and a rate-limited deep agent check.
+
+Dependency probes (database, Chroma, Redis) run in a background task every
+HEALTH_PROBE_INTERVAL_SECONDS; `/ready` only reads the last result. The agent check
+makes real LLM calls, so it runs at most once per AGENT_HEALTH_INTERVAL_SECONDS and
+its result is shared by every caller in the process, and through Redis, across
+workers.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import (
+    CHROMA_PERSIST_DIRECTORY,
+    HEALTH_PROBE_INTERVAL_SECONDS,
+    HEALTH_PROBE_TIMEOUT_SECONDS,
+    AGENT_HEALTH_INTERVAL_SECONDS,
+)
+from app.utils.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+STARTED_AT = time.time()
+
+
+def probe_database() -> str:
+    from sqlalchemy import text
+    from app.models.db import engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return engine.pool.status()
+
+
+def probe_chroma() -> str:
+    from app.utils import embeddings
+
+    if embeddings._client is not None:
+        embeddings._client.heartbeat()
+        return "client ok"
+    # Not opened yet in this worker; loading chromadb just to probe it would undo lazy loading
+    directory = CHROMA_PERSIST_DIRECTORY if os.path.isdir(CHROMA_PERSIST_DIRECTORY) else os.path.dirname(
+        os.path.abspath(CHROMA_PERSIST_DIRECTORY))
+    if not os.access(directory, os.W_OK):
+        raise OSError(f"{directory} is not writable")
+    return "storage writable"
+
+
+def probe_redis() -> str:
+    redis = get_redis()
+    if redis is None:
+        return "disabled"
+    redis.ping()
+    return "ok"
+
+
+class ReadinessProbes:
+    def __init__(self, probes: Dict[str, Callable[[], str]], interval: float, timeout: float):
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self.result = {"status": "starting", "checks": {}, "checked_at": None}
+
+    async def _run(self, name: str, probe: Callable[[], str]) -> dict:
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(run_in_threadpool(probe), self.timeout)
+            check = {"ok": True, "detail": detail}
+        except Exception as e:
+            check = {"ok": False, "error": str(e) or type(e).__name__}
+        check["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return check
+
+    async def refresh(self) -> dict:
+        names = list(self.probes)
+        checks = await asyncio.gather(*(self._run(name, self.probes[name]) for name in names))
+        ready = all(check["ok"] for check in checks)
+        if not ready and self.result["status"] != "starting":
+            failed = [name for name, check in zip(names, checks) if not check["ok"]]
+            logger.warning(f"Readiness probes failing: {', '.join(failed)}")
+        self.result = {
+            "status": "ready" if ready else "unavailable",
+            "checks": dict(zip(names, checks)),
+            "checked_at": time.time(),
+        }
+        return self.result
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Readiness probe loop failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+class AgentHealthCache:
+    """Deep agent health, recomputed at most once per `interval` seconds"""
+
+    REDIS_KEY = "health:agents"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self.interval
+
+    def get(self) -> dict:
+        if self._fresh():
+            return self._result
+        with self._lock:
+            # Another thread may have refreshed it while this one waited
+            if self._fresh():
+                return self._result
+            redis = get_redis()
+            shared = None
+            if redis is not None:
+                try:
+                    shared = redis.get(self.REDIS_KEY)
+                except Exception as e:
+                    logger.warning(f"Shared agent health unavailable: {e}")
+                    redis = None
+            if shared is not None:
+                result = json.loads(shared)
+            else:
+                from app.agents.supervisor_agent import SupervisorAgent
+                result = SupervisorAgent().check_agents_health()
+                result["checked_at"] = time.time()
+                if redis is not None:
+                    redis.set(self.REDIS_KEY, json.dumps(result, default=str), ex=max(1, int(self.interval)))
+            self._result, self._checked_at = result, time.monotonic()
+            return result
+
+
+readiness = ReadinessProbes(
+    {"database": probe_database, "chroma": probe_chroma, "redis": probe_redis},
+    interval=HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=HEALTH_PROBE_TIMEOUT_SECONDS,
+)
+agent_health = AgentHealthCache(AGENT_HEALTH_INTERVAL_SECONDS)
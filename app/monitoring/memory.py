@@ -0,0 +1,37 @@
+import os
+from typing import Dict, List
+
+
+def process_memory(pid: int = None) -> Dict[str, int]:
+    """RSS/PSS and shared vs private memory of a process in kB (Linux only)"""
+    pid = pid or os.getpid()
+    fields = {"Rss": "rss_kb", "Pss": "pss_kb", "Shared_Clean": "shared_clean_kb",
+              "Shared_Dirty": "shared_dirty_kb", "Private_Clean": "private_clean_kb",
+              "Private_Dirty": "private_dirty_kb"}
+    usage = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    usage[fields[name]] = int(rest.split()[0])
+    except OSError:
+        pass
+    return usage
+
+
+def child_pids(parent_pid: int) -> List[int]:
+    """PIDs whose parent is `parent_pid` (gunicorn workers of a master)"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid:
+            children.append(int(entry))
+    return sorted(children)
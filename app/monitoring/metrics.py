@@ -7,6 +7,12 @@ REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request dura
 MCQ_GENERATION_TIME = Histogram('mcq_generation_duration_seconds', 'MCQ generation time')
 ACTIVE_USERS = Gauge('active_users_total', 'Number of active users')
 EXAM_ATTEMPTS = Counter('exam_attempts_total', 'Total exam attempts', ['status'])
+# Wasted-token rate per agent: mcq_wasted_tokens_total / mcq_completion_tokens_total
+MCQ_COMPLETION_TOKENS = Counter('mcq_completion_tokens_total', 'Completion tokens spent generating MCQs', ['agent'])
+MCQ_WASTED_TOKENS = Counter('mcq_wasted_tokens_total', 'Completion tokens spent on MCQs that failed validation',
+                            ['agent'])
+MCQ_ITEMS = Counter('mcq_items_total', 'Generated MCQs by validation outcome', ['agent', 'status'])
+LOG_RECORDS_DROPPED = Counter('log_records_dropped_total', 'Log records dropped because the log queue was full')
 
 class MetricsMiddleware:
     def __init__(self, app):
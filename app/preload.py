@@ -0,0 +1,52 @@
+"""Load read-only model state once, before gunicorn forks its workers.
+
+Everything loaded here lives in the master process and is shared copy-on-write with
+every worker; the topic embeddings are additionally memory-mapped from disk, so their
+pages stay shared even after a worker touches them.
+"""
+import importlib
+import logging
+import time
+
+from app.config import TOPIC_EMBEDDINGS_ENABLED, TOPIC_INDEX_SNAPSHOT
+
+logger = logging.getLogger(__name__)
+
+
+def preload() -> dict:
+    """Warm the tokenizer, sentence embedder and topic index; returns per-step timings"""
+    timings = {}
+
+    start = time.perf_counter()
+    from app.utils.prompt_builder import get_encoding
+    get_encoding()
+    timings["tokenizer"] = time.perf_counter() - start
+
+    if TOPIC_EMBEDDINGS_ENABLED:
+        start = time.perf_counter()
+        try:
+            from app.utils.embeddings import get_sentence_embedder
+            get_sentence_embedder()
+        except Exception as e:
+            logger.warning(f"Sentence embedder not preloaded: {e}")
+        timings["embedder"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from app.models.db import SessionLocal
+        from app.utils.topic_index import topic_index
+        db = SessionLocal()
+        try:
+            topic_index.warm(db, TOPIC_INDEX_SNAPSHOT)
+        except Exception as e:
+            logger.warning(f"Topic index not preloaded: {e}")
+        finally:
+            db.close()
+        timings["topic_index"] = time.perf_counter() - start
+
+    # Import the agent graph too, so workers do not each pay for LangGraph/LangChain
+    start = time.perf_counter()
+    importlib.import_module("app.agents.exam_workflow")
+    timings["agents"] = time.perf_counter() - start
+
+    logger.info("Preloaded " + ", ".join(f"{name} in {seconds:.2f}s" for name, seconds in timings.items()))
+    return timings
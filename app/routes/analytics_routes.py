@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.models.db import get_read_db
+from app.models.syllabus import Syllabus
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.auth.dependencies import get_current_user_data, get_optional_user_data
+from app.utils.score_stats import score_distribution, score_percentile, top_scores
+from typing import Optional
+
+router = APIRouter()
+
+MAX_LEADERBOARD_SIZE = 100
+
+def _require_syllabus(db: Session, syllabus_id: int):
+    if not db.query(Syllabus.id).filter(Syllabus.id == syllabus_id).first():
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+
+@router.get("/analytics/syllabi/{syllabus_id}/percentile")
+async def get_score_percentile(
+    syllabus_id: int,
+    score: Optional[float] = Query(None, ge=0, le=100),
+    user_data: Optional[dict] = Depends(get_optional_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """How a score (by default the signed-in user's best) ranks among all submissions"""
+    _require_syllabus(db, syllabus_id)
+    if score is None:
+        if not user_data:
+            raise HTTPException(status_code=400, detail="Pass a score or sign in")
+        score = db.query(LeaderboardEntry.best_score).filter(
+            LeaderboardEntry.syllabus_id == syllabus_id, LeaderboardEntry.user_id == user_data["user_id"]
+        ).scalar()
+        if score is None:
+            raise HTTPException(status_code=404, detail="No attempts for this syllabus yet")
+    return {"syllabus_id": syllabus_id, **score_percentile(db, syllabus_id, score)}
+
+@router.get("/analytics/syllabi/{syllabus_id}/leaderboard")
+async def get_leaderboard(
+    syllabus_id: int,
+    limit: int = Query(10),
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """Best score per user, highest first; signed-in users only, and other users are shown by initials"""
+    _require_syllabus(db, syllabus_id)
+    return {
+        "syllabus_id": syllabus_id,
+        "entries": top_scores(db, syllabus_id, max(1, min(limit, MAX_LEADERBOARD_SIZE)), user_data["user_id"])
+    }
+
+@router.get("/analytics/syllabi/{syllabus_id}/distribution")
+async def get_score_distribution(syllabus_id: int, db: Session = Depends(get_read_db)):
+    """Submission counts per whole-percent score, index 0..100"""
+    _require_syllabus(db, syllabus_id)
+    counts = score_distribution(db, syllabus_id)
+    return {"syllabus_id": syllabus_id, "attempts": sum(counts), "counts": counts}
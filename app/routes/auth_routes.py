@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.models.db import get_db
+from app.models.db import get_db, get_read_db
 from app.models.user import User
 from app.auth.jwt_handler import verify_google_token, create_access_token
 from pydantic import BaseModel
@@ -56,7 +56,7 @@ async def google_auth(auth_request: GoogleAuthRequest, db: Session = Depends(get
     }
 
 @router.get("/auth/me")
-async def get_current_user(request: Request, db: Session = Depends(get_db)):
+async def get_current_user(request: Request, db: Session = Depends(get_read_db)):
     """Get current authenticated user"""
     from app.auth.jwt_handler import verify_token
     
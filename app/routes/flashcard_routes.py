@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.db import get_db
+from app.models.syllabus import Syllabus
+from app.models.flashcard import Flashcard
+from app.models.flashcard_review import FlashcardReview
+from app.auth.dependencies import get_current_user_data
+from app.utils.spaced_repetition import apply_review, due_cards
+from pydantic import BaseModel, Field
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_DUE_CARDS = 100
+
+class ReviewGrade(BaseModel):
+    quality: int = Field(..., ge=0, le=5)  # 0 = blackout, 5 = perfect recall
+
+@router.post("/flashcards/syllabus/{syllabus_id}/enroll")
+async def enroll_syllabus_flashcards(
+    syllabus_id: int,
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_db)
+):
+    """Add a syllabus's flashcards to the user's review queue, due now"""
+    user_id = user_data["user_id"]
+    if not db.query(Syllabus.id).filter(Syllabus.id == syllabus_id, Syllabus.user_id == user_id).first():
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+    
+    enrolled_ids = db.query(FlashcardReview.flashcard_id).join(
+        Flashcard, Flashcard.id == FlashcardReview.flashcard_id
+    ).filter(FlashcardReview.user_id == user_id, Flashcard.syllabus_id == syllabus_id)
+    for attempt in range(2):
+        new_ids = [
+            row[0] for row in
+            db.query(Flashcard.id).filter(Flashcard.syllabus_id == syllabus_id, ~Flashcard.id.in_(enrolled_ids)).all()
+        ]
+        if not new_ids:
+            break
+        now = datetime.utcnow()
+        try:
+            db.execute(insert(FlashcardReview), [
+                {"user_id": user_id, "flashcard_id": flashcard_id, "due_at": now} for flashcard_id in new_ids
+            ])
+            db.commit()
+            break
+        except IntegrityError:
+            # A concurrent enroll or first review added some of these cards; enroll the rest
+            db.rollback()
+            if attempt:
+                raise HTTPException(status_code=409, detail="Enrollment is changing, retry")
+    return {"syllabus_id": syllabus_id, "enrolled": len(new_ids)}
+
+@router.get("/flashcards/due")
+async def get_due_flashcards(
+    limit: int = Query(20),
+    user_data: dict = Depends(get_current_user_data),
+    # Primary, not the replica: a card reviewed a moment ago must not be served again
+    db: Session = Depends(get_db)
+):
+    """The user's next cards to review, most overdue first"""
+    rows = due_cards(db, user_data["user_id"], max(1, min(limit, MAX_DUE_CARDS)))
+    return {
+        "cards": [{
+            "flashcard_id": row.flashcard_id,
+            "front": row.front,
+            "back": row.back,
+            "topic": row.topic,
+            "due_at": row.due_at,
+            "repetitions": row.repetitions
+        } for row in rows]
+    }
+
+@router.post("/flashcards/{flashcard_id}/review")
+async def review_flashcard(
+    flashcard_id: int,
+    grade: ReviewGrade,
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_db)
+):
+    """Record a review and schedule the card's next one"""
+    user_id = user_data["user_id"]
+    review = db.query(FlashcardReview).filter(
+        FlashcardReview.user_id == user_id, FlashcardReview.flashcard_id == flashcard_id
+    ).first()
+    if review is None:
+        # First review of a card that was never enrolled; only the syllabus owner's cards
+        owned = db.query(Flashcard.id).join(Syllabus, Syllabus.id == Flashcard.syllabus_id).filter(
+            Flashcard.id == flashcard_id, Syllabus.user_id == user_id
+        ).first()
+        if not owned:
+            raise HTTPException(status_code=404, detail="Flashcard not found")
+        try:
+            with db.begin_nested():
+                review = FlashcardReview(user_id=user_id, flashcard_id=flashcard_id)
+                db.add(review)
+                db.flush()
+        except IntegrityError:
+            # A concurrent first review created the row; grade that one
+            review = db.query(FlashcardReview).filter(
+                FlashcardReview.user_id == user_id, FlashcardReview.flashcard_id == flashcard_id
+            ).one()
+    
+    apply_review(review, grade.quality)
+    db.commit()
+    return {
+        "flashcard_id": flashcard_id,
+        "due_at": review.due_at,
+        "interval_days": review.interval_days,
+        "ease_factor": review.ease_factor,
+        "repetitions": review.repetitions,
+        "lapses": review.lapses
+    }
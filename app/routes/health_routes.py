@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, Response
+from app.monitoring.health import STARTED_AT, readiness
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+import time
+
+router = APIRouter()
+
+@router.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok", "uptime_seconds": round(time.time() - STARTED_AT, 1)}
+
+@router.get("/ready")
+async def ready():
+    """Readiness from the last background probe of the database, Chroma and Redis"""
+    result = readiness.result
+    return JSONResponse(result, status_code=200 if result["status"] == "ready" else 503)
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus metrics of this worker"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
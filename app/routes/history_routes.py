@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.models.db import get_read_db
+from app.models.syllabus import Syllabus
+from app.models.mcq import MCQ
+from app.models.quiz_attempt import QuizAttempt
+from app.auth.dependencies import get_current_user_data
+from app.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, newest_first_after, page_size, paginate
+from typing import Optional
+import json
+
+router = APIRouter()
+
+@router.get("/history/syllabi")
+async def list_syllabi(
+    limit: int = Query(DEFAULT_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """List the user's syllabi, newest first"""
+    limit = page_size(limit)
+    query = db.query(Syllabus.id, Syllabus.title, Syllabus.topics, Syllabus.created_at).filter(
+        Syllabus.user_id == user_data["user_id"]
+    )
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(newest_first_after(Syllabus, after, db.get_bind().dialect.name))
+    rows = query.order_by(Syllabus.created_at.desc(), Syllabus.id.desc()).limit(limit + 1).all()
+    page, next_cursor = paginate(rows, limit)
+
+    return {
+        "items": [{
+            "id": row.id,
+            "title": row.title,
+            "topics": json.loads(row.topics) if row.topics else [],
+            "created_at": row.created_at
+        } for row in page],
+        "next_cursor": next_cursor
+    }
+
+@router.get("/history/syllabi/{syllabus_id}/mcqs")
+async def list_syllabus_mcqs(
+    syllabus_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """List a syllabus's question bank in creation order"""
+    owner_id = db.query(Syllabus.user_id).filter(Syllabus.id == syllabus_id).scalar()
+    if owner_id is None or owner_id != user_data["user_id"]:
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+
+    limit = page_size(limit)
+    query = db.query(MCQ.id, MCQ.question, MCQ.topic).filter(MCQ.syllabus_id == syllabus_id)
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(MCQ.id > after.id)
+    rows = query.order_by(MCQ.id).limit(limit + 1).all()
+    page, next_cursor = paginate(rows, limit)
+
+    return {
+        "items": [{"id": row.id, "question": row.question, "topic": row.topic} for row in page],
+        "next_cursor": next_cursor
+    }
+
+@router.get("/history/attempts")
+async def list_attempts(
+    limit: int = Query(DEFAULT_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """List the user's quiz attempts, newest first"""
+    limit = page_size(limit)
+    query = db.query(
+        QuizAttempt.id, QuizAttempt.syllabus_id, QuizAttempt.score,
+        QuizAttempt.total_questions, QuizAttempt.created_at
+    ).filter(QuizAttempt.user_id == user_data["user_id"])
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(newest_first_after(QuizAttempt, after, db.get_bind().dialect.name))
+    rows = query.order_by(QuizAttempt.created_at.desc(), QuizAttempt.id.desc()).limit(limit + 1).all()
+    page, next_cursor = paginate(rows, limit)
+
+    return {
+        "items": [{
+            "id": row.id,
+            "syllabus_id": row.syllabus_id,
+            "score": row.score,
+            "total_questions": row.total_questions,
+            "created_at": row.created_at
+        } for row in page],
+        "next_cursor": next_cursor
+    }
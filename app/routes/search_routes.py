@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.models.db import get_read_db
+from app.models.syllabus import Syllabus
+from app.auth.dependencies import get_current_user_data
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_SEARCH_RESULTS = 20
+
+@router.get("/search")
+async def search_syllabus_content(
+    q: str = Query(..., min_length=1, max_length=500),
+    syllabus_id: Optional[int] = None,
+    limit: int = Query(5),
+    user_data: dict = Depends(get_current_user_data),
+    db: Session = Depends(get_read_db)
+):
+    """Passages of the user's syllabi (or of one of them) closest in meaning to `q`"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    if syllabus_id is not None:
+        owner_id = db.query(Syllabus.user_id).filter(Syllabus.id == syllabus_id).scalar()
+        if owner_id is None or owner_id != user_data["user_id"]:
+            raise HTTPException(status_code=404, detail="Syllabus not found")
+    
+    from app.utils.embeddings import search_similar_content
+    try:
+        # Embedding and the HNSW query are CPU-bound; keep them off the event loop
+        results = await run_in_threadpool(
+            search_similar_content, q, max(1, min(limit, MAX_SEARCH_RESULTS)),
+            syllabus_id=syllabus_id, user_id=user_data["user_id"]
+        )
+    except Exception as e:
+        logger.error(f"Search failed: {str(e)}")
+        raise HTTPException(status_code=503, detail="Search is unavailable")
+    
+    return {"query": q, "syllabus_id": syllabus_id, "results": results}
@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.db import get_db
 from app.models.syllabus import Syllabus
 from app.models.mcq import MCQ
 from app.models.quiz import Quiz
-from app.agents.exam_workflow import ExamWorkflow
-from app.utils.pdf_loader import extract_text_from_pdf
+from app.models.quiz_attempt import QuizAttempt
+from app.models.flashcard import Flashcard
+from app.models.syllabus_chunk import SyllabusChunk
+from app.auth.dependencies import get_optional_user_data
+from app.utils.mcq_parser import REQUIRED_MCQ_FIELDS
+from app.utils.dedup import build_syllabus_index, minhash, mcq_text
+from app.utils.topic_index import QuestionBank, normalize_topic, topic_index
+from app.utils.syllabus_diff import build_revision
+from app.utils.syllabus_store import content_hash, ensure_content_hash, syllabus_store
+from app.utils.single_flight import SingleFlight, IdempotencyStore
+from app.utils.score_stats import record_score, score_percentile
+from app.utils.quiz_sessions import quiz_sessions
+from app.config import PREPARE_LOCK_TTL_SECONDS, PREPARE_WAIT_TIMEOUT_SECONDS
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
 import json
 import logging
 
@@ -15,12 +28,28 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# One exam preparation per syllabus content at a time, across requests and workers
+prepare_flight = SingleFlight("prepare-exam", lock_ttl=PREPARE_LOCK_TTL_SECONDS, wait_timeout=PREPARE_WAIT_TIMEOUT_SECONDS)
+idempotency_store = IdempotencyStore("prepare-exam")
+
 class ExamAnswers(BaseModel):
     answers: Dict[str, str]
+    # From GET /workflow/quiz; grades exactly the questions that were served
+    session_id: Optional[str] = None
 
 @router.post("/syllabus/upload")
-async def upload_syllabus(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)):
-    """Upload and process syllabus file"""
+async def upload_syllabus(
+    request: Request,
+    file: UploadFile = File(...),
+    syllabus_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Upload and process syllabus file.
+    
+    Passing `syllabus_id` uploads a new revision of that syllabus: only chunks that
+    changed go through topic extraction, and MCQs of topics that are still present
+    are kept.
+    """
     try:
         logger.info(f"Uploading syllabus file: {file.filename}")
         
@@ -28,132 +57,288 @@ async def upload_syllabus(request: Request, file: UploadFile = File(...), db: Se
         if not file.filename.lower().endswith(('.pdf', '.txt')):
             raise HTTPException(status_code=400, detail="Only PDF and TXT files are supported")
         
-        # Read file content
-        content = await file.read()
-        
-        # Extract text based on file type
-        if file.filename.lower().endswith('.pdf'):
-            text_content = extract_text_from_pdf(content)
-        else:
-            text_content = content.decode('utf-8')
-        
-        logger.info(f"Extracted {len(text_content)} characters from file")
-        
-        # Extract topics using syllabus agent
-        from app.agents.syllabus_agent import SyllabusAgent
-        syllabus_agent = SyllabusAgent()
-        topics = syllabus_agent.extract_topics(text_content)
-        
         # Get current user from token
         auth_header = request.headers.get("Authorization")
-        logger.info(f"Auth header: {auth_header}")
         
         if not auth_header or not auth_header.startswith("Bearer "):
             raise HTTPException(status_code=401, detail="Authentication required")
         
         token = auth_header.split(" ")[1]
-        logger.info(f"Token: {token[:20]}...")
         
         from app.auth.jwt_handler import verify_token
         user_data = verify_token(token)
-        logger.info(f"User data: {user_data}")
         
         if not user_data:
             raise HTTPException(status_code=401, detail="Invalid token")
+        logger.debug(f"Upload authorized for user {user_data['user_id']}")
+        
+        syllabus = None
+        previous_chunks = []
+        if syllabus_id is not None:
+            syllabus = db.query(Syllabus).filter(
+                Syllabus.id == syllabus_id, Syllabus.user_id == user_data["user_id"]
+            ).first()
+            if not syllabus:
+                raise HTTPException(status_code=404, detail="Syllabus not found")
+            previous_chunks = [
+                {"content_hash": chunk.content_hash, "topics": json.loads(chunk.topics or "[]")}
+                for chunk in db.query(SyllabusChunk).filter(SyllabusChunk.syllabus_id == syllabus_id).all()
+            ]
         
-        # Save to database
-        syllabus = Syllabus(
-            title=file.filename,
-            content=text_content,
-            topics=json.dumps(topics),
-            user_id=user_data["user_id"]
+        # Read file content
+        content = await file.read()
+        
+        # Extract text based on file type
+        if file.filename.lower().endswith('.pdf'):
+            from app.utils.pdf_loader import extract_text_from_pdf
+            text_content = extract_text_from_pdf(content)
+        else:
+            text_content = content.decode('utf-8')
+        
+        logger.info(f"Extracted {len(text_content)} characters from file")
+        
+        # Extract topics using syllabus agent, for new or edited chunks only
+        from app.agents.syllabus_agent import SyllabusAgent
+        from app.agents.llm_scheduler import Priority
+        # The user is waiting on this call, so it goes ahead of background generation
+        syllabus_agent = SyllabusAgent(priority=Priority.INTERACTIVE)
+        # Chunking, hashing and the blocking LLM call stay off the event loop
+        revision = await run_in_threadpool(
+            build_revision, text_content, previous_chunks,
+            syllabus_agent.extract_topics, syllabus_agent.extract_revision_topics
+        )
+        topics = revision["topics"] or ["General Topics"]
+        logger.info(
+            f"Syllabus chunks: {revision['changed_chunks']} changed, {revision['unchanged_chunks']} unchanged, "
+            f"{revision['removed_chunks']} removed"
         )
-        db.add(syllabus)
+        
+        # Save to database
+        removed_topics = []
+        if syllabus is None:
+            syllabus = Syllabus(
+                title=file.filename,
+                content=text_content,
+                content_hash=content_hash(text_content),
+                topics=json.dumps(topics),
+                user_id=user_data["user_id"]
+            )
+            db.add(syllabus)
+            db.flush()
+        else:
+            old_topics = json.loads(syllabus.topics) if syllabus.topics else []
+            current_keys = {normalize_topic(topic) for topic in topics}
+            removed_topics = [topic for topic in old_topics if normalize_topic(topic) not in current_keys]
+            syllabus.title = file.filename
+            syllabus.content = text_content
+            syllabus.content_hash = content_hash(text_content)
+            syllabus.topics = json.dumps(topics)
+            db.query(SyllabusChunk).filter(SyllabusChunk.syllabus_id == syllabus.id).delete(synchronize_session=False)
+            if removed_topics:
+                # Questions about material that is gone from the syllabus
+                db.query(MCQ).filter(
+                    MCQ.syllabus_id == syllabus.id, MCQ.topic.in_(removed_topics)
+                ).delete(synchronize_session=False)
+        db.add_all([SyllabusChunk(syllabus_id=syllabus.id, **chunk) for chunk in revision["chunks"]])
         db.commit()
         db.refresh(syllabus)
         
         logger.info(f"Syllabus saved with ID: {syllabus.id}")
+        # Exam preparation usually follows; spare it reading the text back
+        syllabus_store.put(syllabus.id, text_content)
+        
+        try:
+            # Embeds each topic (loading the model on first use) under a process-wide lock
+            await run_in_threadpool(topic_index.link_syllabus, db, syllabus.id, topics)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not link topics of syllabus {syllabus.id}: {str(e)}")
+        
+        try:
+            from app.utils.embeddings import add_syllabus_to_vector_db
+            indexed = await run_in_threadpool(
+                add_syllabus_to_vector_db, syllabus.id, text_content, topics, user_id=user_data["user_id"]
+            )
+            logger.info(f"Indexed {indexed} chunks of syllabus {syllabus.id} for search")
+        except Exception as e:
+            logger.warning(f"Could not index syllabus {syllabus.id} for search: {str(e)}")
         
         return {
             "id": syllabus.id,
             "title": syllabus.title,
             "topics": topics,
-            "content_length": len(text_content)
+            "content_length": len(text_content),
+            "revision": {
+                "changed_chunks": revision["changed_chunks"],
+                "unchanged_chunks": revision["unchanged_chunks"],
+                "removed_chunks": revision["removed_chunks"],
+                "removed_topics": removed_topics
+            }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading syllabus: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _prepare_exam(db: Session, syllabus_id: int, digest: str, regenerate: bool) -> dict:
+    """Run the workflow for an existing syllabus and save what it generated"""
+    syllabus = db.query(Syllabus).filter(Syllabus.id == syllabus_id).first()
+    logger.info(f"Found syllabus: {syllabus.title}")
+    
+    # Initialize workflow; topics already covered by other syllabi come from the shared bank
+    from app.agents.exam_workflow import ExamWorkflow
+    question_bank = QuestionBank(db, syllabus_id)
+    workflow = ExamWorkflow(question_bank=question_bank)
+    
+    # Run exam preparation
+    logger.info("Running exam preparation workflow")
+    stored_topics = json.loads(syllabus.topics) if syllabus.topics else None
+    covered_topics = []
+    if stored_topics and not regenerate:
+        banked_keys = {
+            normalize_topic(row[0]) for row in
+            db.query(MCQ.topic).filter(MCQ.syllabus_id == syllabus_id).distinct().all() if row[0]
+        }
+        covered_topics = [topic for topic in stored_topics if normalize_topic(topic) in banked_keys]
+    # Flashcards are generated alongside the MCQs for topics that have none yet
+    flashcard_topics = None
+    if stored_topics and not regenerate:
+        carded_keys = {
+            normalize_topic(row[0]) for row in
+            db.query(Flashcard.topic).filter(Flashcard.syllabus_id == syllabus_id).distinct().all() if row[0]
+        }
+        flashcard_topics = [topic for topic in stored_topics if normalize_topic(topic) not in carded_keys]
+    result = workflow.run_exam_preparation(
+        syllabus_id, digest, topics=stored_topics, covered_topics=covered_topics,
+        flashcard_topics=flashcard_topics
+    )
+    
+    # Save MCQs to database, skipping near-duplicates of the existing bank and of each other
+    mcqs_saved = 0
+    duplicates_skipped = 0
+    if result.get("mcqs"):
+        logger.info(f"Saving {len(result['mcqs'])} MCQs to database")
+        try:
+            # Resumed runs skip the bank lookup, so resolve the canonical topics here as well
+            topic_ids = question_bank.resolve_topic_ids([mcq_data.get("topic") for mcq_data in result["mcqs"]])
+            dedup_index = build_syllabus_index(db, syllabus_id)
+            for mcq_data in result["mcqs"]:
+                if all(key in mcq_data for key in REQUIRED_MCQ_FIELDS):
+                    signature = minhash(mcq_text(mcq_data))
+                    if dedup_index.find_duplicate(signature=signature) is not None:
+                        duplicates_skipped += 1
+                        continue
+                    dedup_index.add(("new", mcqs_saved), signature=signature)
+                    mcq = MCQ(
+                        syllabus_id=syllabus_id,
+                        question=mcq_data["question"],
+                        option_a=mcq_data["option_a"],
+                        option_b=mcq_data["option_b"],
+                        option_c=mcq_data["option_c"],
+                        option_d=mcq_data["option_d"],
+                        correct_answer=mcq_data["correct_answer"],
+                        explanation=mcq_data.get("explanation", ""),
+                        topic=mcq_data.get("topic", "General"),
+                        topic_id=mcq_data.get("topic_id") or topic_ids.get(mcq_data.get("topic"))
+                    )
+                    db.add(mcq)
+                    mcqs_saved += 1
+                else:
+                    missing = [key for key in REQUIRED_MCQ_FIELDS if key not in mcq_data]
+                    logger.warning(f"Skipping invalid MCQ for topic '{mcq_data.get('topic')}': missing {missing}")
+            db.commit()
+            logger.info(f"Successfully saved {mcqs_saved} MCQs ({duplicates_skipped} near-duplicates skipped)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to save MCQs: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to save MCQs: {str(e)}")
+    else:
+        logger.warning("No MCQs generated from workflow")
+    
+    # Save flashcards in one bulk INSERT, only for topics this run was asked to cover
+    wanted_topics = None if flashcard_topics is None else set(flashcard_topics)
+    flashcard_rows = [
+        {"syllabus_id": syllabus_id, "front": card["front"], "back": card["back"], "topic": card["topic"]}
+        for card in result.get("flashcards") or []
+        if wanted_topics is None or card["topic"] in wanted_topics
+    ]
+    if flashcard_rows:
+        try:
+            db.execute(insert(Flashcard), flashcard_rows)
+            db.commit()
+            logger.info(f"Saved {len(flashcard_rows)} flashcards")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to save flashcards: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to save flashcards: {str(e)}")
+    
+    return {
+        "status": "success",
+        "syllabus_id": syllabus_id,
+        "topics": result.get("topics", []),
+        "topics_carried_forward": covered_topics,
+        "mcqs_generated": mcqs_saved,
+        "duplicates_skipped": duplicates_skipped,
+        "flashcards_generated": len(flashcard_rows),
+        "topics_from_bank": sorted({m["topic"] for m in result.get("mcqs", []) if m.get("generated_by") == "question_bank"}),
+        "quiz_questions": len(result.get("quiz_questions", [])),
+        "agent_health": result.get("agent_health", {}),
+        "errors": result.get("errors", []),
+        "workflow_complete": True
+    }
+
 @router.post("/workflow/prepare-exam/{syllabus_id}")
-async def prepare_exam_workflow(syllabus_id: int, db: Session = Depends(get_db)):
-    """Run complete exam preparation workflow using LangGraph"""
+async def prepare_exam_workflow(
+    syllabus_id: int,
+    regenerate: bool = False,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Run complete exam preparation workflow using LangGraph.
+    
+    Topics that already have MCQs for this syllabus are skipped unless `regenerate` is set.
+    Concurrent calls for the same syllabus content share one run, and a retry with the
+    same `Idempotency-Key` header gets the first response back.
+    """
     try:
-        logger.info(f"Starting exam preparation for syllabus_id: {syllabus_id}")
+        if idempotency_key:
+            replay = await idempotency_store.get(f"{syllabus_id}:{idempotency_key}")
+            if replay is not None:
+                logger.info(f"Replaying prepare-exam response for syllabus_id: {syllabus_id}")
+                return replay
         
-        # Get syllabus
-        syllabus = db.query(Syllabus).filter(Syllabus.id == syllabus_id).first()
-        if not syllabus:
+        logger.info(f"Starting exam preparation for syllabus_id: {syllabus_id}")
+        digest = ensure_content_hash(db, syllabus_id)
+        if digest is None:
             logger.error(f"Syllabus not found: {syllabus_id}")
             raise HTTPException(status_code=404, detail="Syllabus not found")
         
-        logger.info(f"Found syllabus: {syllabus.title}")
-        
-        # Initialize workflow
-        workflow = ExamWorkflow()
-        
-        # Run exam preparation
-        logger.info("Running exam preparation workflow")
-        result = workflow.run_exam_preparation(syllabus.content, syllabus_id)
-        
-        # Save MCQs to database
-        mcqs_saved = 0
-        if result.get("mcqs"):
-            logger.info(f"Saving {len(result['mcqs'])} MCQs to database")
-            try:
-                for mcq_data in result["mcqs"]:
-                    if all(key in mcq_data for key in ["question", "option_a", "option_b", "option_c", "option_d", "correct_answer"]):
-                        mcq = MCQ(
-                            syllabus_id=syllabus_id,
-                            question=mcq_data["question"],
-                            option_a=mcq_data["option_a"],
-                            option_b=mcq_data["option_b"],
-                            option_c=mcq_data["option_c"],
-                            option_d=mcq_data["option_d"],
-                            correct_answer=mcq_data["correct_answer"],
-                            explanation=mcq_data.get("explanation", ""),
-                            topic=mcq_data.get("topic", "General")
-                        )
-                        db.add(mcq)
-                        mcqs_saved += 1
-                    else:
-                        logger.warning(f"Skipping invalid MCQ data: {mcq_data}")
-                db.commit()
-                logger.info(f"Successfully saved {mcqs_saved} MCQs")
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Failed to save MCQs: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"Failed to save MCQs: {str(e)}")
-        else:
-            logger.warning("No MCQs generated from workflow")
-        
-        return {
-            "status": "success",
-            "syllabus_id": syllabus_id,
-            "topics": result.get("topics", []),
-            "mcqs_generated": mcqs_saved,
-            "quiz_questions": len(result.get("quiz_questions", [])),
-            "agent_health": result.get("agent_health", {}),
-            "errors": result.get("errors", []),
-            "workflow_complete": True
-        }
+        flight_key = f"{syllabus_id}:{digest[:16]}:{int(regenerate)}"
+        result = await prepare_flight.do(flight_key, lambda: _prepare_exam(db, syllabus_id, digest, regenerate))
         
+        if idempotency_key:
+            await idempotency_store.set(f"{syllabus_id}:{idempotency_key}", result)
+        return result
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/workflow/quiz/{syllabus_id}")
-async def get_quiz_questions(syllabus_id: int, db: Session = Depends(get_db)):
-    """Get quiz questions for exam"""
+async def get_quiz_questions(
+    syllabus_id: int,
+    # Primary, not the replica: the quiz is fetched right after prepare-exam wrote its MCQs
+    db: Session = Depends(get_db),
+    user_data: Optional[dict] = Depends(get_optional_user_data)
+):
+    """Get quiz questions for exam.
+    
+    Starts a quiz session holding the served questions' answer key; pass its
+    `session_id` to submit-exam.
+    """
     try:
         # Check if syllabus exists
         syllabus = db.query(Syllabus).filter(Syllabus.id == syllabus_id).first()
@@ -177,47 +362,70 @@ async def get_quiz_questions(syllabus_id: int, db: Session = Depends(get_db)):
                 "topic": mcq.topic
             })
         
+        session_id = await quiz_sessions.create(syllabus_id, [{
+            "id": mcq.id,
+            "question": mcq.question,
+            "correct_answer": mcq.correct_answer,
+            "explanation": mcq.explanation,
+            "topic": mcq.topic
+        } for mcq in mcqs], user_id=user_data["user_id"] if user_data else None)
+        
         return {
+            "session_id": session_id,
             "quiz_questions": quiz_questions,
-            "total_questions": len(quiz_questions)
+            "total_questions": len(quiz_questions),
+            "expires_in": quiz_sessions.ttl
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/workflow/submit-exam/{syllabus_id}")
-async def submit_exam_workflow(syllabus_id: int, exam_answers: ExamAnswers, db: Session = Depends(get_db)):
-    """Submit exam and get detailed evaluation using supervisor agent"""
+async def submit_exam_workflow(
+    syllabus_id: int,
+    exam_answers: ExamAnswers,
+    db: Session = Depends(get_db),
+    user_data: Optional[dict] = Depends(get_optional_user_data)
+):
+    """Submit exam and get detailed evaluation using supervisor agent.
+    
+    A quiz session is graded once; other submissions of it, concurrent or later, get 409.
+    """
+    claimed_session = None
     try:
         logger.info(f"Starting exam evaluation for syllabus_id: {syllabus_id}")
         
-        # Get quiz questions (limit to 10)
-        mcqs = db.query(MCQ).filter(MCQ.syllabus_id == syllabus_id).limit(10).all()
+        if exam_answers.session_id:
+            # Grade against the answer key of the quiz that was served; no MCQ query
+            session = await quiz_sessions.get(exam_answers.session_id)
+            if not session or session["syllabus_id"] != syllabus_id:
+                raise HTTPException(status_code=410, detail="Quiz session expired or not found. Please reload the quiz.")
+            if session["user_id"] is not None and (not user_data or user_data["user_id"] != session["user_id"]):
+                raise HTTPException(status_code=403, detail="This quiz session belongs to another user")
+            # Checked before claiming, so a request that may not submit cannot use the session up
+            if not await quiz_sessions.claim(exam_answers.session_id):
+                raise HTTPException(status_code=409, detail="This quiz session was already submitted")
+            claimed_session = exam_answers.session_id
+            quiz_questions = session["answer_key"]
+        else:
+            # Clients without a session: grade the first 10 questions, as served by GET /workflow/quiz
+            mcqs = db.query(
+                MCQ.id, MCQ.question, MCQ.correct_answer, MCQ.explanation, MCQ.topic
+            ).filter(MCQ.syllabus_id == syllabus_id).limit(10).all()
+            quiz_questions = [row._asdict() for row in mcqs]
         
-        if not mcqs:
+        if not quiz_questions:
             logger.error(f"No MCQs found for syllabus_id: {syllabus_id}")
             raise HTTPException(status_code=404, detail="No MCQs found for this syllabus. Please generate MCQs first.")
         
-        logger.info(f"Found {len(mcqs)} MCQs for evaluation")
-        
-        # Convert to quiz format
-        quiz_questions = []
-        for mcq in mcqs:
-            quiz_questions.append({
-                "id": mcq.id,
-                "question": mcq.question,
-                "option_a": mcq.option_a,
-                "option_b": mcq.option_b,
-                "option_c": mcq.option_c,
-                "option_d": mcq.option_d,
-                "correct_answer": mcq.correct_answer,
-                "explanation": mcq.explanation,
-                "topic": mcq.topic
-            })
+        logger.info(f"Grading {len(quiz_questions)} questions")
         
         logger.info(f"User submitted {len(exam_answers.answers)} answers")
         
         # Initialize workflow for evaluation
+        from app.agents.exam_workflow import ExamWorkflow
         workflow = ExamWorkflow()
         
         # Run evaluation
@@ -232,29 +440,55 @@ async def submit_exam_workflow(syllabus_id: int, exam_answers: ExamAnswers, db:
             total_questions=len(quiz_questions)
         )
         db.add(quiz)
+        # Signed-in users get the attempt in their history and count in the score stats
+        if user_data:
+            db.add(QuizAttempt(
+                user_id=user_data["user_id"],
+                syllabus_id=syllabus_id,
+                score=results.get("score_percentage", 0),
+                total_questions=len(quiz_questions),
+                answers=json.dumps(exam_answers.answers)
+            ))
+            record_score(db, syllabus_id, results.get("score_percentage", 0), user_id=user_data["user_id"])
         db.commit()
+        # Saved: keep the claim, which blocks resubmission until the session expires
+        claimed_session = None
         
         return {
             "status": "success",
             "quiz_id": quiz.id,
             "results": results,
+            "cohort": score_percentile(db, syllabus_id, results.get("score_percentage", 0)),
             "supervisor_evaluated": True
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
+        if claimed_session:
+            # Nothing was saved; let the user submit again
+            await quiz_sessions.release(claimed_session)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/workflow/agent-health")
 async def check_agent_health():
-    """Check health status of all agents"""
+    """Check health status of all agents.
+    
+    The agents are probed with real LLM calls at most once per AGENT_HEALTH_INTERVAL_SECONDS;
+    calls in between get the shared cached result.
+    """
     try:
-        workflow = ExamWorkflow()
-        health_status = workflow.supervisor.check_agents_health()
+        from app.monitoring.health import agent_health
+        health_status = await run_in_threadpool(agent_health.get)
         
+        from app.agents.llm_scheduler import llm_scheduler
+        from app.agents.model_router import model_router
         return {
             "status": "success",
             "health_check": health_status,
-            "timestamp": "now"
+            "llm_scheduler": llm_scheduler.snapshot(),
+            "model_routing": model_router.snapshot(),
+            "checked_at": health_status.get("checked_at")
         }
         
     except Exception as e:
@@ -17,5 +17,11 @@ celery_app.conf.update(
     task_routes={
         "app.tasks.exam_tasks.generate_mcqs_async": {"queue": "mcq_generation"},
         "app.tasks.exam_tasks.evaluate_exam_async": {"queue": "evaluation"},
+    },
+    beat_schedule={
+        "compact-mcq-bank-nightly": {
+            "task": "app.tasks.exam_tasks.compact_mcq_bank",
+            "schedule": 24 * 60 * 60,
+        },
     }
 )
\ No newline at end of file
@@ -0,0 +1,19 @@
+import logging
+
+from app.tasks.celery_app import celery_app
+from app.models.db import SessionLocal
+from app.utils.dedup import compact_mcq_bank
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.exam_tasks.compact_mcq_bank")
+def compact_mcq_bank_task(syllabus_id: int = None) -> dict:
+    """Remove near-duplicate MCQs from one syllabus, or from the whole bank"""
+    db = SessionLocal()
+    try:
+        stats = compact_mcq_bank(db, syllabus_id)
+        logger.info(f"MCQ bank compaction finished: {stats}")
+        return stats
+    finally:
+        db.close()
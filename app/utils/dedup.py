@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import MCQ_DEDUP_THRESHOLD
+from app.models.mcq import MCQ
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, k: int = 2) -> set:
+    """Word k-gram shingles of the normalized text"""
+    words = _WORD_RE.findall(text.casefold())
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles(text)]
+    if not hashes:
+        return tuple([_PRIME] * NUM_PERM)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def mcq_text(mcq) -> str:
+    """Text that identifies a question: its stem plus the correct option"""
+    get = mcq.get if isinstance(mcq, dict) else lambda field, default="": getattr(mcq, field, default)
+    answer = (get("correct_answer", "") or "").strip().upper()[:1]
+    correct_option = get(f"option_{answer.lower()}", "") if answer in "ABCD" and answer else ""
+    return f"{get('question', '')} {correct_option or ''}"
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index answering "is there a near-duplicate of this text?" in ~O(1)"""
+
+    def __init__(self, threshold: float = MCQ_DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.rows = NUM_PERM // BANDS
+        self.signatures: Dict[object, Tuple[int, ...]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[object]] = {}
+
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key, text: str = None, signature: Tuple[int, ...] = None):
+        signature = signature or minhash(text)
+        self.signatures[key] = signature
+        for band in self._bands(signature):
+            self.buckets.setdefault(band, []).append(key)
+        return signature
+
+    def find_duplicate(self, text: str = None, signature: Tuple[int, ...] = None) -> Optional[object]:
+        """Key of the most similar indexed item at or above the threshold, if any"""
+        signature = signature or minhash(text)
+        candidates = set()
+        for band in self._bands(signature):
+            candidates.update(self.buckets.get(band, ()))
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            score = similarity(signature, self.signatures[key])
+            if score >= self.threshold and score > best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+def build_syllabus_index(db: Session, syllabus_id: int) -> NearDuplicateIndex:
+    """Index the existing question bank of a syllabus"""
+    index = NearDuplicateIndex()
+    rows = db.query(
+        MCQ.id, MCQ.question, MCQ.option_a, MCQ.option_b, MCQ.option_c, MCQ.option_d, MCQ.correct_answer
+    ).filter(MCQ.syllabus_id == syllabus_id).all()
+    for row in rows:
+        index.add(row.id, mcq_text(row))
+    return index
+
+
+def compact_mcq_bank(db: Session, syllabus_id: int = None, batch_size: int = 500) -> dict:
+    """Delete near-duplicate MCQs, keeping the oldest question of each cluster.
+
+    Runs per syllabus (or over every syllabus when `syllabus_id` is None).
+    """
+    if syllabus_id is None:
+        syllabus_ids = [row[0] for row in db.query(MCQ.syllabus_id).distinct().all() if row[0] is not None]
+    else:
+        syllabus_ids = [syllabus_id]
+
+    checked, removed = 0, 0
+    for sid in syllabus_ids:
+        index = NearDuplicateIndex()
+        duplicate_ids = []
+        rows = db.query(
+            MCQ.id, MCQ.question, MCQ.option_a, MCQ.option_b, MCQ.option_c, MCQ.option_d, MCQ.correct_answer
+        ).filter(MCQ.syllabus_id == sid).order_by(MCQ.id).yield_per(batch_size)
+        for row in rows:
+            checked += 1
+            signature = minhash(mcq_text(row))
+            if index.find_duplicate(signature=signature) is not None:
+                duplicate_ids.append(row.id)
+            else:
+                index.add(row.id, signature=signature)
+
+        for start in range(0, len(duplicate_ids), batch_size):
+            chunk = duplicate_ids[start:start + batch_size]
+            db.query(MCQ).filter(MCQ.id.in_(chunk)).delete(synchronize_session=False)
+        db.commit()
+        removed += len(duplicate_ids)
+        if duplicate_ids:
+            logger.info(f"Compacted syllabus {sid}: removed {len(duplicate_ids)} near-duplicate MCQs")
+
+    return {"syllabi": len(syllabus_ids), "checked": checked, "removed": removed}
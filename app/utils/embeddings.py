@@ -1,56 +1,225 @@
-import chromadb
-from chromadb.config import Settings
-from app.config import CHROMA_PERSIST_DIRECTORY
+from app.config import (
+    CHROMA_PERSIST_DIRECTORY,
+    SEARCH_COLLECTION,
+    CHROMA_HNSW_M,
+    CHROMA_HNSW_CONSTRUCTION_EF,
+    CHROMA_HNSW_SEARCH_EF,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL_SECONDS,
+)
+from app.utils.cache import TTLCache
+from functools import lru_cache
+from typing import List, Optional
+import hashlib
+import json
+import logging
 import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+# Keyed on the indexed revisions of the searched syllabi (stored in the database, so shared
+# by every worker): a reindex anywhere changes the key and cached results of the old one are never served
+_search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL_SECONDS)
 
 def get_chroma_client():
-    # Create directory if it doesn't exist
-    os.makedirs(CHROMA_PERSIST_DIRECTORY, exist_ok=True)
-    
-    client = chromadb.PersistentClient(
-        path=CHROMA_PERSIST_DIRECTORY,
-        settings=Settings(anonymized_telemetry=False)
-    )
-    return client
+    """Shared persistent Chroma client, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            # Create directory if it doesn't exist
+            os.makedirs(CHROMA_PERSIST_DIRECTORY, exist_ok=True)
 
-def get_or_create_collection(collection_name="exam_prep"):
+            _client = chromadb.PersistentClient(
+                path=CHROMA_PERSIST_DIRECTORY,
+                settings=Settings(anonymized_telemetry=False)
+            )
+        return _client
+
+def hnsw_metadata(m: int = CHROMA_HNSW_M, construction_ef: int = CHROMA_HNSW_CONSTRUCTION_EF,
+                  search_ef: int = CHROMA_HNSW_SEARCH_EF) -> dict:
+    return {
+        "hnsw:space": "cosine",
+        "hnsw:M": m,
+        "hnsw:construction_ef": construction_ef,
+        "hnsw:search_ef": search_ef,
+    }
+
+def get_or_create_collection(collection_name=SEARCH_COLLECTION):
+    """The search collection; HNSW settings apply only when it is created (see reindex_syllabi)"""
     client = get_chroma_client()
     collection = client.get_or_create_collection(
         name=collection_name,
-        metadata={"hnsw:space": "cosine"}
+        metadata=hnsw_metadata()
     )
     return collection
 
-def add_syllabus_to_vector_db(syllabus_id: int, content: str, topics: list):
-    collection = get_or_create_collection()
-    
-    # Split content into semantic chunks
+def split_search_chunks(content: str, max_chars: int = 1000) -> List[str]:
+    """Sentence-aligned chunks of at most about `max_chars` characters"""
     sentences = content.split('. ')
     chunks = []
     current_chunk = ""
-    
+
     for sentence in sentences:
-        if len(current_chunk + sentence) < 1000:
+        if len(current_chunk + sentence) < max_chars:
             current_chunk += sentence + ". "
         else:
             if current_chunk:
                 chunks.append(current_chunk.strip())
             current_chunk = sentence + ". "
-    
+
     if current_chunk:
         chunks.append(current_chunk.strip())
-    
-    for i, chunk in enumerate(chunks):
+    return chunks
+
+def add_syllabus_to_vector_db(syllabus_id: int, content: str, topics: list, user_id: int = None):
+    """(Re)index a syllabus's chunks, tagged with the syllabus and its owner for filtered search"""
+    from app.models.db import SessionLocal
+    from app.models.syllabus import Syllabus
+    from app.utils.syllabus_store import content_hash
+
+    collection = get_or_create_collection()
+    chunks = split_search_chunks(content)
+
+    # Drop the chunks of a previous revision
+    collection.delete(where={"syllabus_id": syllabus_id})
+    if chunks:
+        embeddings = get_sentence_embedder().encode(chunks, normalize_embeddings=True, batch_size=64)
+        metadata = {"syllabus_id": syllabus_id, "topics": json.dumps(topics)}
+        if user_id is not None:
+            metadata["user_id"] = user_id
         collection.add(
-            documents=[chunk],
-            metadatas=[{"syllabus_id": syllabus_id, "chunk_id": i, "topics": str(topics)}],
-            ids=[f"syllabus_{syllabus_id}_chunk_{i}"]
+            documents=chunks,
+            embeddings=[vector.tolist() for vector in embeddings],
+            metadatas=[{**metadata, "chunk_id": i} for i in range(len(chunks))],
+            ids=[f"syllabus_{syllabus_id}_chunk_{i}" for i in range(len(chunks))]
+        )
+
+    db = SessionLocal()
+    try:
+        db.query(Syllabus).filter(Syllabus.id == syllabus_id).update(
+            {"search_index_hash": content_hash(content)}, synchronize_session=False
         )
+        db.commit()
+    finally:
+        db.close()
+    return len(chunks)
+
+def index_version(syllabus_id: Optional[int] = None, user_id: Optional[int] = None) -> str:
+    """Digest of the indexed revisions of the syllabi a search covers"""
+    from app.models.db import SessionLocal
+    from app.models.syllabus import Syllabus
+
+    db = SessionLocal()
+    try:
+        query = db.query(Syllabus.id, Syllabus.search_index_hash)
+        if syllabus_id is not None:
+            query = query.filter(Syllabus.id == syllabus_id)
+        if user_id is not None:
+            query = query.filter(Syllabus.user_id == user_id)
+        rows = query.order_by(Syllabus.id).all()
+    finally:
+        db.close()
+    return hashlib.sha256(json.dumps([list(row) for row in rows]).encode()).hexdigest()
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def embed_query(query: str) -> tuple:
+    """Query embedding, cached so repeated and paginated searches skip the model"""
+    return tuple(get_sentence_embedder().encode(query, normalize_embeddings=True).tolist())
+
+def search_similar_content(query: str, n_results: int = 5, syllabus_id: Optional[int] = None,
+                           user_id: Optional[int] = None) -> List[dict]:
+    """Chunks closest to `query`, limited to one syllabus and/or one user's syllabi"""
+    query = " ".join(query.split())
+    filters = []
+    if syllabus_id is not None:
+        filters.append({"syllabus_id": syllabus_id})
+    if user_id is not None:
+        filters.append({"user_id": user_id})
+    where = filters[0] if len(filters) == 1 else ({"$and": filters} if filters else None)
+
+    cache_key = (query, n_results, json.dumps(where, sort_keys=True), index_version(syllabus_id, user_id))
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-def search_similar_content(query: str, n_results: int = 5):
     collection = get_or_create_collection()
-    results = collection.query(
-        query_texts=[query],
-        n_results=n_results
-    )
-    return results
\ No newline at end of file
+    params = {"query_embeddings": [list(embed_query(query))], "n_results": n_results}
+    if where:
+        params["where"] = where
+    results = collection.query(**params)
+
+    hits = [{
+        "id": chunk_id,
+        "text": document,
+        "syllabus_id": metadata.get("syllabus_id"),
+        "chunk_id": metadata.get("chunk_id"),
+        "score": round(1 - distance, 4)  # cosine similarity
+    } for chunk_id, document, metadata, distance in zip(
+        results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+    )]
+    _search_cache.set(cache_key, hits)
+    return hits
+
+_sentence_embedder = None
+
+def get_sentence_embedder():
+    """Shared sentence-transformers model, loaded on first use"""
+    global _sentence_embedder
+    if _sentence_embedder is None:
+        from sentence_transformers import SentenceTransformer
+        from app.config import EMBEDDING_MODEL
+        _sentence_embedder = SentenceTransformer(EMBEDDING_MODEL)
+    return _sentence_embedder
+
+
+def reindex_syllabi(rebuild: bool = False) -> int:
+    """Index syllabi whose current revision is not in the search index.
+
+    That covers syllabi indexed before chunks carried their owner's user_id (user-scoped
+    search does not find them until then). `rebuild` recreates the collection first,
+    which is the only way to apply changed CHROMA_HNSW_* settings to it.
+    """
+    from app.models.db import SessionLocal
+    from app.models.syllabus import Syllabus
+
+    if rebuild:
+        client = get_chroma_client()
+        if SEARCH_COLLECTION in [getattr(c, "name", c) for c in client.list_collections()]:
+            client.delete_collection(SEARCH_COLLECTION)
+    db = SessionLocal()
+    indexed, last_id = 0, 0
+    try:
+        while True:
+            query = db.query(Syllabus.id, Syllabus.content, Syllabus.topics, Syllabus.user_id).filter(Syllabus.id > last_id)
+            if not rebuild:
+                query = query.filter(
+                    (Syllabus.search_index_hash.is_(None)) | (Syllabus.search_index_hash != Syllabus.content_hash)
+                )
+            rows = query.order_by(Syllabus.id).limit(100).all()
+            if not rows:
+                break
+            for row in rows:
+                add_syllabus_to_vector_db(row.id, row.content or "", json.loads(row.topics) if row.topics else [],
+                                          user_id=row.user_id)
+            indexed += len(rows)
+            last_id = rows[-1].id
+    finally:
+        db.close()
+    logger.info(f"Reindexed {indexed} syllabi for search")
+    return indexed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bring the search index up to date with the stored syllabi")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recreate the collection (applies new HNSW settings) and index every syllabus")
+    logging.basicConfig(level=logging.INFO)
+    reindex_syllabi(rebuild=parser.parse_args().rebuild)
@@ -0,0 +1,201 @@
+import json
+import re
+from typing import Annotated, Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, StringConstraints, ValidationError, field_validator
+
+REQUIRED_MCQ_FIELDS = ["question", "option_a", "option_b", "option_c", "option_d", "correct_answer"]
+
+
+def _topic_key(topic: str) -> str:
+    return re.sub(r"\s+", " ", topic).strip().casefold()
+
+
+def match_topic(key: Optional[str], topics: List[str]) -> Optional[str]:
+    """Map a response key back to one of the requested topics (case/whitespace-insensitive)"""
+    if key is None:
+        return None
+    wanted = _topic_key(key)
+    for topic in topics:
+        if _topic_key(topic) == wanted:
+            return topic
+    return None
+
+
+_ANSWER_LETTER = re.compile(r"^\s*(?:(?:option|answer)\s*[:.-]?\s*)?\(?([A-D])\)?[.:]?\s*$", re.IGNORECASE)
+
+Text = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+class MCQSchema(BaseModel):
+    """Shape every generated MCQ must have before it is used"""
+
+    question: Text
+    option_a: Text
+    option_b: Text
+    option_c: Text
+    option_d: Text
+    correct_answer: Literal["A", "B", "C", "D"]
+    explanation: str = ""
+
+    @field_validator("correct_answer", mode="before")
+    @classmethod
+    def _answer_letter(cls, value):
+        # Only spellings of the letter itself ("a", "B)", "(C)", "Option D", "Answer: C");
+        # anything else, such as the answer's text, fails and goes to repair
+        if isinstance(value, str):
+            match = _ANSWER_LETTER.match(value)
+            if match:
+                return match.group(1).upper()
+        return value
+
+    @field_validator("explanation", mode="before")
+    @classmethod
+    def _explanation_text(cls, value):
+        return str(value or "")
+
+
+def mcq_errors(item: Any) -> List[str]:
+    """Why an item fails MCQSchema, one message per field; empty when it is valid"""
+    if isinstance(item, str):
+        return ["not valid JSON"]
+    if not isinstance(item, dict):
+        return ["not a JSON object"]
+    try:
+        MCQSchema.model_validate(item)
+    except ValidationError as e:
+        return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+    return []
+
+
+def validate_mcq(item: Any) -> Optional[dict]:
+    """Return a normalized MCQ dict, or None if the item is unusable"""
+    if not isinstance(item, dict):
+        return None
+    try:
+        mcq = MCQSchema.model_validate(item)
+    except ValidationError:
+        return None
+    # Extra keys such as difficulty are kept
+    return {**item, **mcq.model_dump()}
+
+
+class IncrementalMCQParser:
+    """Incremental parser for streamed LLM JSON output.
+
+    Feed text chunks as they arrive; every object that is an element of an array is
+    returned as soon as its closing brace is seen, together with the key of the
+    enclosing top-level object property (None for a bare top-level array). This covers
+    both `[{...}, ...]` and `{"<topic>": [{...}], ...}` responses. Items that fail to
+    decode are kept in `rejected`, as (key, text) pairs, instead of aborting the whole
+    response.
+    """
+
+    def __init__(self):
+        self.rejected: List[Tuple[Optional[str], str]] = []
+        self._stack: List[str] = []
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._string_chars: List[str] = []
+        self._last_string = ""
+        self._key: Optional[str] = None
+        self._capture: Optional[List[str]] = None
+        self._capture_depth = 0
+
+    def feed(self, chunk: str) -> List[Tuple[Optional[str], Any]]:
+        items = []
+        for ch in chunk:
+            if self._done:
+                break
+            if self._capture is not None:
+                self._feed_capture(ch, items)
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._string_chars.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._string_chars.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = "".join(self._string_chars)
+                else:
+                    self._string_chars.append(ch)
+                continue
+            if not self._stack:
+                # Skip any prose the model put before the JSON value
+                if ch in "[{":
+                    self._stack.append(ch)
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_chars = []
+            elif ch == ":" and self._stack == ["{"]:
+                try:
+                    self._key = json.loads(f'"{self._last_string}"')
+                except json.JSONDecodeError:
+                    self._key = self._last_string
+            elif ch == "{" and self._stack[-1] == "[":
+                self._capture = ["{"]
+                self._capture_depth = 1
+            elif ch in "[{":
+                self._stack.append(ch)
+            elif ch in "]}":
+                self._stack.pop()
+                if not self._stack:
+                    self._done = True
+        return items
+
+    def _feed_capture(self, ch: str, items: list):
+        self._capture.append(ch)
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+            return
+        if ch == '"':
+            self._in_string = True
+        elif ch in "[{":
+            self._capture_depth += 1
+        elif ch in "]}":
+            self._capture_depth -= 1
+            if self._capture_depth == 0:
+                text = "".join(self._capture)
+                self._capture = None
+                try:
+                    items.append((self._key, json.loads(text)))
+                except json.JSONDecodeError:
+                    self.rejected.append((self._key, text))
+
+
+def iter_mcqs(chunks: Iterable[str], invalid: Optional[list] = None) -> Iterator[Tuple[Optional[str], dict]]:
+    """Yield (key, mcq) for each valid MCQ as soon as it is complete in the stream.
+
+    Items that are malformed or fail validation are appended to `invalid`, as (key,
+    item) pairs, when given; undecodable items are kept as their raw text.
+    """
+    parser = IncrementalMCQParser()
+    for chunk in chunks:
+        for key, item in parser.feed(chunk):
+            mcq = validate_mcq(item)
+            if mcq is not None:
+                yield key, mcq
+            elif invalid is not None:
+                invalid.append((key, item))
+    if invalid is not None:
+        invalid.extend(parser.rejected)
+
+
+def group_mcqs_by_topic(pairs: Iterable[Tuple[Optional[str], dict]], topics: List[str]) -> Dict[str, list]:
+    """Collect keyed (topic, mcq) pairs from a batched response into per-topic lists"""
+    grouped = {}
+    for key, mcq in pairs:
+        topic = match_topic(key, topics)
+        if topic is not None:
+            grouped.setdefault(topic, []).append(mcq)
+    return grouped
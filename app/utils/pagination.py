@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import String, literal, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class Cursor(NamedTuple):
+    """Sort key of the last row of a page"""
+    id: int
+    created_at: Optional[datetime] = None
+
+
+def encode_cursor(last_id: int, created_at: Optional[datetime] = None) -> str:
+    """Opaque cursor pointing just past the row with this id (and creation time)"""
+    data = {"id": last_id}
+    if created_at is not None:
+        data["created_at"] = created_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(data["created_at"]) if "created_at" in data else None
+        return Cursor(int(data["id"]), created_at)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def newest_first_after(model, cursor: Cursor, dialect: str):
+    """Rows that sort after `cursor` in (created_at DESC, id DESC) order.
+
+    One row-value comparison against the values in the cursor, so the database seeks
+    the (..., created_at, id) index and the page does not depend on the cursor row
+    still existing.
+    """
+    if cursor.created_at is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    created_at = cursor.created_at
+    if dialect == "sqlite":
+        # SQLite compares the stored text. The server-side now() default every row gets
+        # stores "YYYY-MM-DD HH:MM:SS", while a bound datetime always carries microseconds
+        created_at = literal(str(created_at.replace(tzinfo=None)), String)
+    return tuple_(model.created_at, model.id) < tuple_(created_at, cursor.id)
+
+
+def page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(rows: list, limit: int):
+    """Split rows fetched with limit + 1 into (page, next_cursor)"""
+    has_more = len(rows) > limit
+    page = rows[:limit]
+    if not (has_more and page):
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last.id, getattr(last, "created_at", None))
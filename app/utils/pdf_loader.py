@@ -8,6 +8,7 @@ def extract_text_from_pdf(pdf_content: bytes) -> str:
         text_parts = []
         for page in pdf_reader.pages:
             text_parts.append(page.extract_text())
-        return ''.join(text_parts)
+        # Form feeds keep page boundaries so repeated headers/footers can be stripped later
+        return '\f'.join(text_parts)
     except Exception as e:
         return f"Error extracting PDF: {str(e)}"
\ No newline at end of file
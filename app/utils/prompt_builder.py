@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+from app.config import PROMPT_TOKEN_BUDGETS, SYLLABUS_CACHE_SIZE
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Sentinel so a failed tokenizer load is not retried on every call
+_UNLOADED = object()
+_encoding = _UNLOADED
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+_DIGITS_RE = re.compile(r"\d+")
+# Fitted contexts keyed by a digest of the document, so only the short results stay in
+# memory; the full texts are held by the (small) syllabus and prepare_context caches
+_contexts = TTLCache(maxsize=256, ttl=3600)
+
+
+def get_encoding():
+    """Return the local tiktoken encoding, or None to fall back to the estimator"""
+    global _encoding
+    if _encoding is _UNLOADED:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+            _encoding = None
+    return _encoding
+
+
+def _estimate_tokens(word: str) -> int:
+    # BPE vocabularies cover ~4 characters of English per token
+    return max(1, math.ceil(len(word) / 4))
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the local tokenizer (or a close estimate without it)"""
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(_estimate_tokens(match.group()) for match in _WORD_RE.finditer(text))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces, trailing whitespace and blank lines"""
+    text = text.replace("\f", "\n").replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"[ \t\u00a0]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def strip_page_furniture(text: str, edge_lines: int = 2, min_share: float = 0.6) -> str:
+    """Drop headers/footers that repeat across form-feed separated PDF pages.
+
+    A line within `edge_lines` of the top or bottom of a page is furniture when the same
+    line (digits ignored, so "Page 3 of 9" matches "Page 4 of 9") appears on at least
+    `min_share` of the pages.
+    """
+    pages = text.split("\f")
+    if len(pages) < 3:
+        return text
+
+    def key(line: str) -> str:
+        return _DIGITS_RE.sub("#", line.strip().casefold())
+
+    page_lines = [[line for line in page.split("\n") if line.strip()] for page in pages]
+    edge_counts = Counter()
+    for lines in page_lines:
+        edges = {key(line) for line in lines[:edge_lines] + lines[-edge_lines:]}
+        edge_counts.update(edges)
+
+    threshold = max(2, math.ceil(len(pages) * min_share))
+    furniture = {k for k, n in edge_counts.items() if n >= threshold}
+    if not furniture:
+        return text
+
+    cleaned = []
+    for lines in page_lines:
+        split = max(edge_lines, len(lines) - edge_lines)
+        top, middle, bottom = lines[:edge_lines], lines[edge_lines:split], lines[split:]
+        kept = [l for l in top if key(l) not in furniture] + middle + [l for l in bottom if key(l) not in furniture]
+        cleaned.append("\n".join(kept))
+    return "\f".join(cleaned)
+
+
+@lru_cache(maxsize=SYLLABUS_CACHE_SIZE)
+def prepare_context(text: str) -> str:
+    """Clean raw syllabus text once; agents call this repeatedly with the same document"""
+    return normalize_whitespace(strip_page_furniture(text))
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """Truncate text to at most `max_tokens`, preferring to end on a paragraph or sentence"""
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = encoding.decode(tokens[:max_tokens])
+    else:
+        used = 0
+        cut = len(text)
+        for match in _WORD_RE.finditer(text):
+            used += _estimate_tokens(match.group())
+            if used > max_tokens:
+                cut = match.start()
+                break
+        if cut == len(text):
+            return text
+        truncated = text[:cut]
+
+    # Back off to a natural boundary if one is close to the cut
+    for boundary in ("\n\n", "\n", ". "):
+        position = truncated.rfind(boundary)
+        if position >= len(truncated) * 0.8:
+            return truncated[:position + len(boundary)].rstrip()
+    return truncated.rstrip()
+
+
+def _document_key(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def build_context(text: str, agent: str) -> str:
+    """Syllabus context for `agent`'s prompt, cleaned and fitted to its token budget"""
+    key = ("context", _document_key(text), agent)
+    context = _contexts.get(key)
+    if context is None:
+        context = fit_to_budget(prepare_context(text), PROMPT_TOKEN_BUDGETS[agent])
+        _contexts.set(key, context)
+    return context
+
+
+def _word_stems(text: str) -> set:
+    # 5-character prefixes, so "equations" and "equation" match
+    return {word[:5] for word in re.findall(r"\w+", text.casefold()) if len(word) > 3}
+
+
+def build_topic_context(text: str, topic: str, agent: str) -> str:
+    """Context for one topic: the paragraphs that mention it, fitted to `agent`'s budget.
+
+    Falls back to the document's opening context when no paragraph mentions the topic.
+    """
+    key = ("topic", _document_key(text), topic, agent)
+    context = _contexts.get(key)
+    if context is None:
+        stems = _word_stems(topic)
+        paragraphs = [p for p in prepare_context(text).split("\n\n") if p.strip()]
+        relevant = [p for p in paragraphs if stems & _word_stems(p)] if stems else []
+        if relevant:
+            context = fit_to_budget("\n\n".join(relevant), PROMPT_TOKEN_BUDGETS[agent])
+        else:
+            context = build_context(text, agent)
+        _contexts.set(key, context)
+    return context
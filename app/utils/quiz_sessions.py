@@ -0,0 +1,78 @@
+import json
+import logging
+import secrets
+import time
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import QUIZ_SESSION_TTL_SECONDS
+from app.utils.cache import TTLCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Fields of an MCQ needed to grade it and explain the result; options stay in the database
+ANSWER_KEY_FIELDS = ("id", "question", "correct_answer", "explanation", "topic")
+
+
+class QuizSessionStore:
+    """The questions served in a quiz and their answer key, kept until they expire.
+
+    Sessions live in Redis when it is configured (so any worker can grade them) and in
+    an in-process TTL cache otherwise. A submission first claims its session; the claim
+    is atomic and lasts as long as the session, so each session is graded at most once.
+    Redis calls run in the threadpool, since the methods are awaited by async handlers.
+    """
+
+    def __init__(self, ttl: float = QUIZ_SESSION_TTL_SECONDS, maxsize: int = 10000):
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._claims = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def create(self, syllabus_id: int, mcqs: List[Dict], user_id: Optional[int] = None) -> str:
+        session_id = secrets.token_urlsafe(16)
+        session = {
+            "syllabus_id": syllabus_id,
+            "user_id": user_id,
+            "created_at": time.time(),
+            "answer_key": [{field: mcq.get(field) for field in ANSWER_KEY_FIELDS} for mcq in mcqs],
+        }
+        redis = get_redis()
+        if redis is None:
+            self._local.set(session_id, session)
+        else:
+            await run_in_threadpool(redis.set, self._key(session_id), json.dumps(session), ex=int(self.ttl))
+        return session_id
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        redis = get_redis()
+        if redis is None:
+            return self._local.get(session_id)
+        value = await run_in_threadpool(redis.get, self._key(session_id))
+        return json.loads(value) if value is not None else None
+
+    async def claim(self, session_id: str) -> bool:
+        """Mark a session as being submitted; of concurrent callers only one gets True"""
+        redis = get_redis()
+        if redis is None:
+            return self._claims.add(session_id, True)
+        return bool(await run_in_threadpool(redis.set, self._claim_key(session_id), "1", nx=True, ex=int(self.ttl)))
+
+    async def release(self, session_id: str):
+        """Undo a claim whose submission failed, so it can be submitted again"""
+        redis = get_redis()
+        if redis is None:
+            self._claims.pop(session_id)
+        else:
+            await run_in_threadpool(redis.delete, self._claim_key(session_id))
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"quiz-session:{session_id}"
+
+    @staticmethod
+    def _claim_key(session_id: str) -> str:
+        return f"quiz-session:{session_id}:submitted"
+
+
+quiz_sessions = QuizSessionStore()
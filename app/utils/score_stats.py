@@ -0,0 +1,150 @@
+"""Per-syllabus score distribution and leaderboard, maintained on every submission.
+
+Only signed-in submissions count: anonymous ones could be replayed without limit to move
+everyone's percentile. Scores are percentages, so the distribution is 101 whole-percent buckets per syllabus:
+a percentile reads at most 101 rows however many attempts exist. The leaderboard
+keeps one row per (syllabus, user) with the best score, and top-N reads the head of
+an index ordered by score.
+
+Run `python -m app.utils.score_stats` once to build both from existing quiz results.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.quiz_attempt import QuizAttempt
+from app.models.score_bucket import ScoreBucket
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+NUM_BUCKETS = 101
+
+
+def score_bucket(score: float) -> int:
+    return max(0, min(NUM_BUCKETS - 1, int(score or 0)))
+
+
+def _insert(db: Session):
+    """INSERT construct with ON CONFLICT support for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def record_score(db: Session, syllabus_id: int, score: float, user_id: int):
+    """Count a signed-in submission in the distribution and the leaderboard; the caller commits"""
+    insert = _insert(db)
+    bucket_insert = insert(ScoreBucket).values(syllabus_id=syllabus_id, bucket=score_bucket(score), count=1)
+    db.execute(bucket_insert.on_conflict_do_update(
+        index_elements=[ScoreBucket.syllabus_id, ScoreBucket.bucket],
+        set_={"count": ScoreBucket.count + 1}
+    ))
+
+    entry_insert = insert(LeaderboardEntry).values(
+        syllabus_id=syllabus_id, user_id=user_id, best_score=score, attempts=1, achieved_at=datetime.utcnow()
+    )
+    improved = entry_insert.excluded.best_score > LeaderboardEntry.best_score
+    db.execute(entry_insert.on_conflict_do_update(
+        index_elements=[LeaderboardEntry.syllabus_id, LeaderboardEntry.user_id],
+        set_={
+            "best_score": case((improved, entry_insert.excluded.best_score), else_=LeaderboardEntry.best_score),
+            "achieved_at": case((improved, entry_insert.excluded.achieved_at), else_=LeaderboardEntry.achieved_at),
+            "attempts": LeaderboardEntry.attempts + 1,
+        }
+    ))
+
+
+def score_distribution(db: Session, syllabus_id: int) -> List[int]:
+    """Submission counts for scores 0..100"""
+    counts = [0] * NUM_BUCKETS
+    for bucket, count in db.query(ScoreBucket.bucket, ScoreBucket.count).filter(
+        ScoreBucket.syllabus_id == syllabus_id
+    ):
+        counts[bucket] = count
+    return counts
+
+
+def score_percentile(db: Session, syllabus_id: int, score: float) -> Dict:
+    """Share of the syllabus's signed-in submissions that scored below `score`"""
+    counts = score_distribution(db, syllabus_id)
+    total = sum(counts)
+    below = sum(counts[:score_bucket(score)])
+    return {
+        "score": score,
+        "attempts": total,
+        "better_than_percent": round(100 * below / total, 1) if total else None,
+    }
+
+
+def initials(full_name: str) -> str:
+    """What the leaderboard shows of another user's name"""
+    parts = (full_name or "").split()
+    return "".join(part[0].upper() + "." for part in parts[:3]) or "Anonymous"
+
+
+def top_scores(db: Session, syllabus_id: int, limit: int = 10, viewer_id: int = None) -> List[Dict]:
+    """Leaderboard rows; other users appear only by their initials"""
+    rows = db.query(
+        LeaderboardEntry.user_id, LeaderboardEntry.best_score, LeaderboardEntry.attempts,
+        LeaderboardEntry.achieved_at, User.full_name
+    ).outerjoin(User, User.id == LeaderboardEntry.user_id).filter(
+        LeaderboardEntry.syllabus_id == syllabus_id
+    ).order_by(LeaderboardEntry.best_score.desc(), LeaderboardEntry.achieved_at).limit(limit).all()
+    return [{
+        "rank": rank,
+        "name": initials(row.full_name),
+        "is_you": row.user_id == viewer_id,
+        "best_score": row.best_score,
+        "attempts": row.attempts,
+        "achieved_at": row.achieved_at,
+    } for rank, row in enumerate(rows, start=1)]
+
+
+def rebuild_score_stats(db: Session) -> Dict:
+    """Recompute the distribution and leaderboard from stored quizzes and attempts"""
+    db.query(ScoreBucket).delete(synchronize_session=False)
+    db.query(LeaderboardEntry).delete(synchronize_session=False)
+
+    buckets: Dict[tuple, int] = {}
+    scores = db.query(QuizAttempt.syllabus_id, QuizAttempt.score).filter(
+        QuizAttempt.user_id.isnot(None), QuizAttempt.syllabus_id.isnot(None)
+    ).yield_per(5000)
+    for syllabus_id, score in scores:
+        key = (syllabus_id, score_bucket(score))
+        buckets[key] = buckets.get(key, 0) + 1
+    db.bulk_insert_mappings(ScoreBucket, [
+        {"syllabus_id": syllabus_id, "bucket": bucket, "count": count}
+        for (syllabus_id, bucket), count in buckets.items()
+    ])
+
+    best = db.query(
+        QuizAttempt.syllabus_id, QuizAttempt.user_id, func.max(QuizAttempt.score).label("best_score"),
+        func.count(QuizAttempt.id).label("attempts"),
+        # Latest attempt; the time of the best one is not worth a second pass here
+        func.max(QuizAttempt.created_at).label("achieved_at")
+    ).filter(QuizAttempt.user_id.isnot(None), QuizAttempt.syllabus_id.isnot(None)).group_by(
+        QuizAttempt.syllabus_id, QuizAttempt.user_id
+    ).all()
+    db.bulk_insert_mappings(LeaderboardEntry, [row._asdict() for row in best])
+    db.commit()
+    logger.info(f"Rebuilt score stats: {len(buckets)} buckets, {len(best)} leaderboard entries")
+    return {"buckets": len(buckets), "leaderboard_entries": len(best)}
+
+
+if __name__ == "__main__":
+    from app.models.db import SessionLocal
+    from app.utils.logger import setup_logging
+
+    setup_logging()
+    session = SessionLocal()
+    try:
+        print(rebuild_score_stats(session))
+    finally:
+        session.close()
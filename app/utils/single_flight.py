@@ -0,0 +1,188 @@
+"""Request coalescing and idempotent replay for expensive endpoints.
+
+`SingleFlight.do(key, fn)` runs `fn` once per key at a time. Concurrent callers in
+the same process await the leader's future. Callers in other workers wait on a Redis
+lock and read the leader's result from Redis. The Redis lock is short-lived and the
+leader renews it while it runs, so a crashed leader is taken over quickly. Without Redis, Postgres deployments
+serialize runs with an advisory lock, and followers run `fn` only after the leader
+has finished, when its work is already saved.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import IDEMPOTENCY_TTL_SECONDS
+from app.utils.cache import TTLCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lock only if this leader still owns it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Extends the lock only if this leader still owns it
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _advisory_lock_id(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class SingleFlight:
+    """Coalesces concurrent runs per key.
+
+    `lock_ttl` is how long a Redis lock outlives a leader that stopped renewing it;
+    `wait_timeout` is how long a follower waits for the leader's result.
+    """
+
+    def __init__(self, namespace: str, lock_ttl: float, wait_timeout: float,
+                 result_ttl: float = 60.0, poll_interval: float = 0.5):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "local_followers": 0, "remote_followers": 0}
+
+    async def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Result of `fn()`, shared with every concurrent caller using the same key.
+
+        `fn` runs in the threadpool and must return a JSON-serializable value.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["local_followers"] += 1
+            logger.info(f"Waiting for in-flight {self.namespace} run {key}")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved even when no follower awaited it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._run_exclusive(key, fn)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_exclusive(self, key: str, fn: Callable[[], Any]) -> Any:
+        redis = get_redis()
+        if redis is not None:
+            return await self._run_with_redis(redis, key, fn)
+        return await run_in_threadpool(self._run_with_advisory_lock, key, fn)
+
+    async def _run_with_redis(self, redis, key: str, fn: Callable[[], Any]) -> Any:
+        # The client is synchronous, so every call goes through the threadpool
+        lock_key = f"{self.namespace}:lock:{key}"
+        deadline = time.monotonic() + self.wait_timeout
+        token = uuid.uuid4().hex
+        lock_ms = int(self.lock_ttl * 1000)
+        while True:
+            if await run_in_threadpool(redis.set, lock_key, token, nx=True, px=lock_ms):
+                break
+            leader = await run_in_threadpool(redis.get, lock_key)
+            if leader is not None:
+                self.stats["remote_followers"] += 1
+                logger.info(f"Waiting for {self.namespace} run {key} in another worker")
+                result = await self._wait_for_result(redis, lock_key, leader, deadline)
+                if result is not None:
+                    return json.loads(result)
+                # The leader died or its lock expired without a result; try to take over
+
+        self.stats["leaders"] += 1
+        renewal = asyncio.create_task(self._renew_lock(redis, lock_key, token, lock_ms))
+        try:
+            result = await run_in_threadpool(fn)
+            await run_in_threadpool(redis.set, f"{self.namespace}:result:{key}:{token}",
+                                    json.dumps(result, default=str), px=int(self.result_ttl * 1000))
+            return result
+        finally:
+            renewal.cancel()
+            await run_in_threadpool(redis.eval, _RELEASE_SCRIPT, 1, lock_key, token)
+
+    async def _renew_lock(self, redis, lock_key: str, token: str, lock_ms: int):
+        """Keep extending the leader's lock until cancelled, or until it is lost"""
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                renewed = await run_in_threadpool(redis.eval, _RENEW_SCRIPT, 1, lock_key, token, lock_ms)
+            except Exception as e:
+                logger.warning(f"Could not renew lock {lock_key}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost lock {lock_key}; another worker may start the same run")
+                return
+
+    async def _wait_for_result(self, redis, lock_key: str, leader: str, deadline: float) -> Optional[str]:
+        """The leader's serialized result, or None once its lock is gone without one"""
+        result_key = lock_key.replace(":lock:", ":result:", 1) + f":{leader}"
+        while True:
+            result = await run_in_threadpool(redis.get, result_key)
+            if result is not None:
+                return result
+            if await run_in_threadpool(redis.get, lock_key) != leader:
+                return await run_in_threadpool(redis.get, result_key)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {self.namespace} run {lock_key}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _run_with_advisory_lock(self, key: str, fn: Callable[[], Any]) -> Any:
+        from sqlalchemy import text
+        from app.models.db import engine
+
+        self.stats["leaders"] += 1
+        if engine.dialect.name != "postgresql":
+            # Single-node SQLite: in-process coalescing is all there is
+            return fn()
+        lock_id = _advisory_lock_id(f"{self.namespace}:{key}")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": lock_id})
+            try:
+                return fn()
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+
+
+class IdempotencyStore:
+    """Responses keyed by a client-supplied Idempotency-Key, in Redis or in process"""
+
+    def __init__(self, namespace: str, ttl: float = IDEMPOTENCY_TTL_SECONDS, maxsize: int = 10000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        redis = get_redis()
+        if redis is None:
+            return self._local.get(key)
+        value = await run_in_threadpool(redis.get, f"{self.namespace}:idempotency:{key}")
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, response: Any):
+        redis = get_redis()
+        if redis is None:
+            self._local.set(key, response)
+        else:
+            await run_in_threadpool(redis.set, f"{self.namespace}:idempotency:{key}",
+                                    json.dumps(response, default=str), ex=int(self.ttl))
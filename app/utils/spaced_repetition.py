@@ -0,0 +1,64 @@
+"""SM-2 scheduling for flashcard reviews.
+
+Quality is graded 0-5: below 3 counts as a lapse and restarts the card at a one-day
+interval; otherwise the interval grows 1 day, 6 days, then by the card's ease factor,
+and the ease factor moves with how easy the recall was.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.flashcard import Flashcard
+from app.models.flashcard_review import FlashcardReview
+
+MIN_EASE_FACTOR = 1.3
+PASSING_QUALITY = 3
+
+
+def next_review(repetitions: int, interval_days: int, ease_factor: float, quality: int) -> Dict[str, float]:
+    """New (repetitions, interval_days, ease_factor) after a review graded `quality`"""
+    if not 0 <= quality <= 5:
+        raise ValueError("quality must be between 0 and 5")
+    if quality < PASSING_QUALITY:
+        repetitions, interval_days = 0, 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = max(1, round(interval_days * ease_factor))
+    ease_factor = max(MIN_EASE_FACTOR, ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return {"repetitions": repetitions, "interval_days": interval_days, "ease_factor": round(ease_factor, 4)}
+
+
+def apply_review(review: FlashcardReview, quality: int, now: datetime = None) -> FlashcardReview:
+    """Update `review` in place for a review graded `quality` at `now` (UTC)"""
+    now = now or datetime.utcnow()
+    schedule = next_review(review.repetitions or 0, review.interval_days or 0, review.ease_factor or 2.5, quality)
+    if quality < PASSING_QUALITY:
+        review.lapses = (review.lapses or 0) + 1
+    review.repetitions = schedule["repetitions"]
+    review.interval_days = schedule["interval_days"]
+    review.ease_factor = schedule["ease_factor"]
+    review.last_reviewed_at = now
+    review.due_at = now + timedelta(days=schedule["interval_days"])
+    return review
+
+
+def due_cards(db: Session, user_id: int, limit: int, now: datetime = None) -> List:
+    """The user's `limit` most overdue cards.
+
+    Filters and orders on (user_id, due_at, id), so it is one range scan of
+    ix_flashcard_reviews_user_due however many reviews the table holds.
+    """
+    now = now or datetime.utcnow()
+    return db.query(
+        FlashcardReview.flashcard_id, FlashcardReview.due_at, FlashcardReview.repetitions,
+        Flashcard.front, Flashcard.back, Flashcard.topic
+    ).join(Flashcard, Flashcard.id == FlashcardReview.flashcard_id).filter(
+        FlashcardReview.user_id == user_id,
+        FlashcardReview.due_at <= now
+    ).order_by(FlashcardReview.due_at, FlashcardReview.id).limit(limit).all()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional
+
+from app.config import PROMPT_TOKEN_BUDGETS, REVISION_NEW_TOPICS, SYLLABUS_MAX_TOPICS
+from app.utils.prompt_builder import count_tokens, prepare_context
+from app.utils.topic_index import normalize_topic
+
+# On average one paragraph in this many ends a chunk
+_BOUNDARY_MODULUS = 4
+
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode()).hexdigest()
+
+
+def split_chunks(text: str, max_tokens: int = None) -> List[str]:
+    """Split a syllabus into paragraph-aligned, content-defined chunks.
+
+    A chunk ends after a paragraph whose hash hits the boundary modulus (or once it
+    reaches `max_tokens`), so boundaries depend only on nearby text: an edit changes
+    the chunk it lands in and leaves the chunks around it, and their hashes, intact.
+    """
+    max_tokens = max_tokens or PROMPT_TOKEN_BUDGETS["syllabus"]
+    paragraphs = [p for p in prepare_context(text).split("\n\n") if p.strip()]
+    chunks, current, used = [], [], 0
+    for paragraph in paragraphs:
+        current.append(paragraph)
+        used += count_tokens(paragraph)
+        if int(chunk_hash(paragraph)[:8], 16) % _BOUNDARY_MODULUS == 0 or used >= max_tokens:
+            chunks.append("\n\n".join(current))
+            current, used = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def attribute_topics(chunks: List[str], topics: List[str]) -> List[List[str]]:
+    """Assign topics to the chunks that mention them.
+
+    A topic no chunk mentions well enough goes to the chunk sharing the most words with
+    it (the first chunk when none does), so it is dropped once that chunk is.
+    """
+    chunk_words = [set(normalize_topic(chunk).split()) for chunk in chunks]
+    assigned = [[] for _ in chunks]
+    if not chunks:
+        return assigned
+    for topic in topics:
+        words = set(normalize_topic(topic).split())
+        overlaps = [len(words & found) for found in chunk_words]
+        matches = [i for i, overlap in enumerate(overlaps) if words and overlap * 2 >= len(words)]
+        for i in matches or [overlaps.index(max(overlaps))]:
+            assigned[i].append(topic)
+    return assigned
+
+
+def merge_topics(per_chunk: List[List[str]]) -> List[str]:
+    """Ordered union of chunk topics, treating names with the same alias key as one"""
+    merged, seen = [], set()
+    for topics in per_chunk:
+        for topic in topics:
+            key = normalize_topic(topic)
+            if key not in seen:
+                seen.add(key)
+                merged.append(topic)
+    return merged
+
+
+def match_revision_topics(extracted: List[str], existing: List[str], max_new: int = REVISION_NEW_TOPICS) -> List[str]:
+    """Topics found in edited chunks, spelled as the existing topic they match.
+
+    Names with the alias key of an existing topic become that topic; of the rest, only
+    the first `max_new` are kept.
+    """
+    by_key = {normalize_topic(topic): topic for topic in existing}
+    matched, new = [], []
+    for topic in extracted:
+        key = normalize_topic(topic)
+        if key in by_key:
+            matched.append(by_key[key])
+        elif len(new) < max_new:
+            by_key[key] = topic
+            new.append(topic)
+    return merge_topics([matched + new])
+
+
+def cap_topics(per_chunk: List[List[str]], existing: List[str], limit: int = SYLLABUS_MAX_TOPICS) -> List[List[str]]:
+    """Drop topics past `limit`, keeping existing topics ahead of new ones"""
+    merged = merge_topics(per_chunk)
+    if len(merged) <= limit:
+        return per_chunk
+    existing_keys = {normalize_topic(topic) for topic in existing}
+    ordered = [t for t in merged if normalize_topic(t) in existing_keys] + \
+        [t for t in merged if normalize_topic(t) not in existing_keys]
+    keep = {normalize_topic(topic) for topic in ordered[:limit]}
+    return [[topic for topic in topics if normalize_topic(topic) in keep] for topics in per_chunk]
+
+
+def build_revision(text: str, previous: List[dict], extract_topics: Callable[[str], List[str]],
+                   revise_topics: Optional[Callable[[str, List[str]], List[str]]] = None) -> Dict:
+    """Chunk a (revised) syllabus and extract topics only for chunks that changed.
+
+    `previous` holds the prior revision's chunks as {"content_hash", "topics"} dicts
+    (empty for a first upload). Unchanged chunks reuse their stored topics; the changed
+    ones go through one call: `extract_topics` on a first upload, or `revise_topics`
+    with the existing topics on a re-upload. Topics found in changed chunks are matched
+    to the existing ones, at most REVISION_NEW_TOPICS of them are new, and the syllabus
+    keeps at most SYLLABUS_MAX_TOPICS, so repeated small edits do not grow the list.
+    """
+    known = {chunk["content_hash"]: chunk["topics"] for chunk in previous}
+    existing = merge_topics(chunk["topics"] for chunk in previous)
+    chunks = split_chunks(text)
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    changed = [i for i, h in enumerate(hashes) if h not in known]
+
+    per_chunk = [known.get(h, []) for h in hashes]
+    if changed:
+        changed_text = "\n\n".join(chunks[i] for i in changed)
+        if existing:
+            extracted = (revise_topics or (lambda section, _: extract_topics(section)))(changed_text, existing)
+            extracted = match_revision_topics(extracted, existing)
+        else:
+            extracted = extract_topics(changed_text)
+        for i, topics in zip(changed, attribute_topics([chunks[i] for i in changed], extracted)):
+            per_chunk[i] = topics
+    per_chunk = cap_topics(per_chunk, existing)
+
+    return {
+        "chunks": [
+            {"position": i, "content_hash": h, "topics": json.dumps(topics)}
+            for i, (h, topics) in enumerate(zip(hashes, per_chunk))
+        ],
+        "topics": merge_topics(per_chunk),
+        "changed_chunks": len(changed),
+        "unchanged_chunks": len(chunks) - len(changed),
+        "removed_chunks": len(set(known) - set(hashes)),
+    }
@@ -0,0 +1,113 @@
+"""Syllabus text for running workflows, loaded from the database on first use.
+
+Workflow state and checkpoints carry only a reference (syllabus id and content hash);
+nodes ask the store for the document. Each revision is read and decompressed at most
+once per process while it stays in the cache, and split into chunks at most once,
+however many nodes and parallel branches use it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from app.config import SYLLABUS_CACHE_SIZE
+from app.utils.syllabus_diff import split_chunks
+
+
+def content_hash(text: Optional[str]) -> str:
+    return hashlib.sha256((text or "").encode()).hexdigest()
+
+
+def load_content(syllabus_id: int) -> Optional[str]:
+    from app.models.db import SessionLocal
+    from app.models.syllabus import Syllabus
+
+    db = SessionLocal()
+    try:
+        return db.query(Syllabus.content).filter(Syllabus.id == syllabus_id).scalar()
+    finally:
+        db.close()
+
+
+def ensure_content_hash(db, syllabus_id: int) -> Optional[str]:
+    """Stored content hash of a syllabus (None if it does not exist).
+
+    Rows saved before the hash was stored get it computed and saved here, once.
+    """
+    from app.models.syllabus import Syllabus
+
+    row = db.query(Syllabus.id, Syllabus.content_hash).filter(Syllabus.id == syllabus_id).first()
+    if row is None:
+        return None
+    if row.content_hash:
+        return row.content_hash
+    digest = content_hash(db.query(Syllabus.content).filter(Syllabus.id == syllabus_id).scalar())
+    db.query(Syllabus).filter(Syllabus.id == syllabus_id).update({"content_hash": digest}, synchronize_session=False)
+    db.commit()
+    return digest
+
+
+class SyllabusDocument:
+    """One revision of a syllabus; the text and its chunks are produced on first access"""
+
+    def __init__(self, syllabus_id: int, content_hash: str, loader: Callable[[int], Optional[str]]):
+        self.syllabus_id = syllabus_id
+        self.content_hash = content_hash
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._content: Optional[str] = None
+        self._chunks: Optional[List[str]] = None
+
+    @property
+    def content(self) -> str:
+        with self._lock:
+            if self._content is None:
+                text = self._loader(self.syllabus_id)
+                if text is None:
+                    raise LookupError(f"Syllabus {self.syllabus_id} not found")
+                if content_hash(text) != self.content_hash:
+                    raise ValueError(f"Syllabus {self.syllabus_id} changed since this workflow started")
+                self._content = text
+            return self._content
+
+    @property
+    def chunks(self) -> List[str]:
+        content = self.content
+        with self._lock:
+            if self._chunks is None:
+                self._chunks = split_chunks(content)
+            return self._chunks
+
+
+class SyllabusStore:
+    """LRU of syllabus documents keyed by (syllabus id, content hash)"""
+
+    def __init__(self, loader: Callable[[int], Optional[str]] = load_content, maxsize: int = SYLLABUS_CACHE_SIZE):
+        self.loader = loader
+        self.maxsize = maxsize
+        self._documents: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, syllabus_id: int, digest: str) -> SyllabusDocument:
+        key = (syllabus_id, digest)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = SyllabusDocument(syllabus_id, digest, self.loader)
+                self._documents[key] = document
+                while len(self._documents) > self.maxsize:
+                    self._documents.popitem(last=False)
+            else:
+                self._documents.move_to_end(key)
+            return document
+
+    def put(self, syllabus_id: int, content: str) -> str:
+        """Cache text that is already in memory, saving the reload; returns its hash"""
+        digest = content_hash(content)
+        document = self.get(syllabus_id, digest)
+        with document._lock:
+            document._content = content
+        return digest
+
+
+syllabus_store = SyllabusStore()
@@ -0,0 +1,291 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import QUESTION_BANK_SHARED, TOPIC_EMBEDDINGS_ENABLED, TOPIC_MATCH_THRESHOLD
+from app.models.mcq import MCQ
+from app.models.syllabus import Syllabus
+from app.models.topic import Topic, TopicAlias, syllabus_topics
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that do not change what a topic is about ("Introduction to Photosynthesis")
+_FILLER_WORDS = {
+    "a", "an", "the", "of", "to", "and", "in", "on", "for",
+    "intro", "introduction", "basic", "basics", "fundamentals", "overview",
+}
+
+
+def _lemma(word: str) -> str:
+    """Crude English singular: equations -> equation, theories -> theory"""
+    if len(word) <= 3 or word.endswith(("ss", "is", "us")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_topic(name: str) -> str:
+    """Alias key of a topic name: casefolded, filler words dropped, words singularized"""
+    words = _WORD_RE.findall(name.casefold())
+    kept = [w for w in words if w not in _FILLER_WORDS] or words
+    return " ".join(_lemma(w) for w in kept)
+
+
+def _database_identity(db: Session) -> str:
+    url = db.get_bind().url.render_as_string(hide_password=True)
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+class TopicIndex:
+    """Resolves extracted topic names to canonical topics.
+
+    A name first goes through the alias table (exact match on its normalized key). On a
+    miss, its sentence embedding is compared against every canonical topic; a close
+    enough match becomes a new alias, otherwise a new canonical topic is created.
+    Embeddings are kept as float32 matrix blocks and topics created by other workers are
+    picked up incrementally by id. The first block can be a read-only memory map of a
+    snapshot file, so every worker on a node shares the same pages.
+    """
+
+    def __init__(self, threshold: float = TOPIC_MATCH_THRESHOLD, use_embeddings: bool = TOPIC_EMBEDDINGS_ENABLED):
+        self.threshold = threshold
+        self.use_embeddings = use_embeddings
+        self._blocks = []  # (topic ids, unit vectors) pairs
+        self._loaded_up_to = 0
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        if not self.use_embeddings:
+            return None
+        try:
+            from app.utils.embeddings import get_sentence_embedder
+            return get_sentence_embedder().encode(text, normalize_embeddings=True).tolist()
+        except Exception as e:
+            logger.warning(f"Topic embeddings unavailable, matching on names only: {e}")
+            self.use_embeddings = False
+            return None
+
+    def _add_block(self, ids: List[int], vectors: List[List[float]]):
+        import numpy as np
+        self._blocks.append((np.asarray(ids, dtype=np.int64), np.asarray(vectors, dtype=np.float32)))
+        if len(self._blocks) > 16:
+            # Merge the small incremental blocks; the (possibly mapped) first block stays as is
+            head, tail = self._blocks[0], self._blocks[1:]
+            self._blocks = [head, (np.concatenate([b[0] for b in tail]), np.vstack([b[1] for b in tail]))]
+
+    def _refresh(self, db: Session) -> int:
+        rows = db.query(Topic.id, Topic.embedding).filter(Topic.id > self._loaded_up_to).order_by(Topic.id).all()
+        ids, vectors = [], []
+        for topic_id, embedding in rows:
+            if embedding:
+                ids.append(topic_id)
+                vectors.append(json.loads(embedding))
+            self._loaded_up_to = max(self._loaded_up_to, topic_id)
+        if ids:
+            self._add_block(ids, vectors)
+        return len(ids)
+
+    def _nearest(self, vector: List[float]) -> Optional[int]:
+        import numpy as np
+        query = np.asarray(vector, dtype=np.float32)
+        best_id, best_score = None, self.threshold
+        for ids, matrix in self._blocks:
+            if not len(ids):
+                continue
+            # Vectors are unit length, so the dot product is the cosine similarity
+            scores = matrix @ query
+            row = int(scores.argmax())
+            if scores[row] >= best_score:
+                best_id, best_score = int(ids[row]), float(scores[row])
+        return best_id
+
+    def load_snapshot(self, path: str):
+        """Memory-map a snapshot written by save_snapshot"""
+        import numpy as np
+        ids = np.load(f"{path}.ids.npy", mmap_mode="r")
+        vectors = np.load(f"{path}.vectors.npy", mmap_mode="r")
+        self._blocks = [(ids, vectors)]
+        self._loaded_up_to = int(ids.max()) if len(ids) else 0
+
+    def _snapshot_matches(self, db: Session, path: str) -> bool:
+        """Whether the loaded snapshot was taken from this database as it is now.
+
+        A snapshot from another DATABASE_URL, or from before the topics table was reset,
+        would hide newer rows with lower ids and match names against topics that are gone.
+        """
+        import numpy as np
+        try:
+            with open(f"{path}.meta.json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        ids, vectors = self._blocks[0]
+        if meta.get("database") != _database_identity(db) or meta.get("max_id") != self._loaded_up_to:
+            return False
+        stored = db.query(func.count(Topic.id)).filter(
+            Topic.id <= self._loaded_up_to, Topic.embedding.isnot(None)
+        ).scalar()
+        if stored != len(ids):
+            return False
+        if not len(ids):
+            return True
+        last = db.query(Topic.embedding).filter(Topic.id == int(ids[-1])).scalar()
+        return last is not None and np.allclose(json.loads(last), vectors[-1], atol=1e-5)
+
+    def save_snapshot(self, path: str, database: str):
+        import numpy as np
+        if not self._blocks:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {
+            "ids": np.concatenate([b[0] for b in self._blocks]),
+            "vectors": np.vstack([b[1] for b in self._blocks]),
+        }
+        for name, array in arrays.items():
+            # Write then rename so workers never map a half-written file
+            tmp = f"{path}.{name}.npy.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, f"{path}.{name}.npy")
+        tmp = f"{path}.meta.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"database": database, "max_id": int(arrays["ids"].max()) if len(arrays["ids"]) else 0}, f)
+        os.replace(tmp, f"{path}.meta.json")
+
+    def warm(self, db: Session, snapshot_path: str = None):
+        """Load every topic embedding up front: the snapshot first, then newer rows from the DB"""
+        if not self.use_embeddings:
+            return
+        with self._lock:
+            stale = False
+            if snapshot_path and os.path.exists(f"{snapshot_path}.ids.npy"):
+                try:
+                    self.load_snapshot(snapshot_path)
+                    stale = not self._snapshot_matches(db, snapshot_path)
+                    if stale:
+                        logger.warning("Topic index snapshot does not match the database; rebuilding it")
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable topic index snapshot: {e}")
+                    stale = True
+                if stale:
+                    self._blocks, self._loaded_up_to = [], 0
+            if (self._refresh(db) or stale) and snapshot_path and self._blocks:
+                self.save_snapshot(snapshot_path, _database_identity(db))
+                self.load_snapshot(snapshot_path)
+
+    def resolve(self, db: Session, name: str) -> Topic:
+        key = normalize_topic(name)
+        alias = db.query(TopicAlias).filter(TopicAlias.alias == key).first()
+        if alias:
+            return alias.topic
+
+        with self._lock:
+            vector = self._embed(name)
+            topic = None
+            if vector is not None:
+                self._refresh(db)
+                topic_id = self._nearest(vector)
+                if topic_id is not None:
+                    topic = db.query(Topic).filter(Topic.id == topic_id).first()
+            try:
+                with db.begin_nested():
+                    if topic is None:
+                        topic = Topic(name=name.strip(), embedding=json.dumps(vector) if vector else None)
+                        db.add(topic)
+                        db.flush()
+                    db.add(TopicAlias(alias=key, topic_id=topic.id))
+            except IntegrityError:
+                # Another worker registered the same name first
+                return db.query(TopicAlias).filter(TopicAlias.alias == key).one().topic
+            return topic
+
+    def link_syllabus(self, db: Session, syllabus_id: int, topics: List[str]) -> Dict[str, int]:
+        """Resolve a syllabus's topic names to canonical topic ids and record the links"""
+        topic_ids = {name: self.resolve(db, name).id for name in topics}
+        linked = {
+            row[0] for row in
+            db.query(syllabus_topics.c.topic_id).filter(syllabus_topics.c.syllabus_id == syllabus_id).all()
+        }
+        new_ids = set(topic_ids.values()) - linked
+        if new_ids:
+            db.execute(syllabus_topics.insert(), [{"syllabus_id": syllabus_id, "topic_id": t} for t in new_ids])
+        db.commit()
+        return topic_ids
+
+
+topic_index = TopicIndex()
+
+
+class QuestionBank:
+    """MCQs already generated for other syllabi, looked up by canonical topic.
+
+    The bank is shared by design: generated questions carry no user data, so a topic
+    covered by any user's syllabus is served to everyone. Set QUESTION_BANK_SHARED=false
+    to only reuse questions from syllabi of the same owner.
+    """
+
+    def __init__(self, db: Session, syllabus_id: int, index: TopicIndex = None, shared: bool = QUESTION_BANK_SHARED):
+        self.db = db
+        self.syllabus_id = syllabus_id
+        self.index = index or topic_index
+        self.shared = shared
+        self.topic_ids: Dict[str, int] = {}
+
+    def resolve_topic_ids(self, topics: List[str]) -> Dict[str, int]:
+        """Canonical topic ids of `topics`, linking any new ones to the syllabus.
+
+        Ids resolved earlier (by `lookup` or a previous call) are reused; a failure is
+        logged and leaves the unresolved topics out.
+        """
+        missing = [topic for topic in dict.fromkeys(topics) if topic and topic not in self.topic_ids]
+        if missing:
+            try:
+                self.topic_ids.update(self.index.link_syllabus(self.db, self.syllabus_id, missing))
+            except Exception as e:
+                self.db.rollback()
+                logger.warning(f"Could not resolve canonical topics of syllabus {self.syllabus_id}: {e}")
+        return {topic: self.topic_ids[topic] for topic in topics if topic in self.topic_ids}
+
+    def lookup(self, topics: List[str], count: int) -> Dict[str, List[dict]]:
+        """`count` bank MCQs for every topic the bank already covers"""
+        # Topics that cannot be resolved are left out, and so generated
+        topic_ids = self.resolve_topic_ids(topics)
+
+        owner_syllabi = None
+        if not self.shared:
+            owner = select(Syllabus.user_id).where(Syllabus.id == self.syllabus_id).scalar_subquery()
+            owner_syllabi = select(Syllabus.id).where(Syllabus.user_id == owner)
+
+        banked = {}
+        for topic, topic_id in topic_ids.items():
+            query = self.db.query(MCQ).filter(MCQ.topic_id == topic_id, MCQ.syllabus_id != self.syllabus_id)
+            if owner_syllabi is not None:
+                query = query.filter(MCQ.syllabus_id.in_(owner_syllabi))
+            rows = query.order_by(MCQ.id).limit(count).all()
+            if len(rows) < count:
+                continue
+            banked[topic] = [{
+                "question": mcq.question,
+                "option_a": mcq.option_a,
+                "option_b": mcq.option_b,
+                "option_c": mcq.option_c,
+                "option_d": mcq.option_d,
+                "correct_answer": mcq.correct_answer,
+                "explanation": mcq.explanation or "",
+                "topic_id": topic_id,
+            } for mcq in rows]
+        return banked
@@ -0,0 +1,77 @@
+from typing import Dict, List
+
+from app.utils.prompt_builder import count_tokens
+from app.utils.topic_index import normalize_topic
+
+
+def group_windows(chunks: List[str], window_tokens: int) -> List[str]:
+    """Pack consecutive chunks into windows of about `window_tokens` tokens each.
+
+    A chunk goes to the window its starting token offset falls in, so a text of N
+    tokens yields about N / window_tokens windows however the chunk sizes vary.
+    """
+    windows, current, current_index, offset = [], [], 0, 0
+    for chunk in chunks:
+        index = offset // window_tokens
+        if current and index != current_index:
+            windows.append("\n\n".join(current))
+            current = []
+        current_index = index
+        current.append(chunk)
+        offset += count_tokens(chunk)
+    if current:
+        windows.append("\n\n".join(current))
+    return windows
+
+
+# Distinct names merge only when they share at least this many key words, so a one-word
+# name such as "Energy" does not absorb "Kinetic Energy" and "Potential Energy"
+MIN_SHARED_WORDS = 2
+
+
+def _similar(words_a: set, words_b: set, threshold: float) -> bool:
+    shared = len(words_a & words_b)
+    if shared < MIN_SHARED_WORDS:
+        return False
+    # "Newton's Laws" vs "Newton's Laws of Motion": one name contained in the other
+    if words_a <= words_b or words_b <= words_a:
+        return True
+    return shared / len(words_a | words_b) >= threshold
+
+
+def cluster_candidates(per_window: List[List[str]], threshold: float = 0.5) -> List[Dict]:
+    """Merge candidate topics from every window into ranked clusters.
+
+    Names with the same alias key are one candidate. Another candidate joins a cluster
+    when it shares at least MIN_SHARED_WORDS key words with one of the cluster's names
+    and either overlaps it by at least `threshold` (Jaccard) or contains it, or the
+    other way round. Clusters are ranked by how many windows mention them, then by first
+    appearance. Each cluster is named after its most frequent spelling.
+    """
+    clusters: List[Dict] = []
+    by_key: Dict[str, Dict] = {}
+    for window, topics in enumerate(per_window):
+        for topic in topics:
+            if not isinstance(topic, str) or not topic.strip():
+                continue
+            topic = topic.strip()
+            key = normalize_topic(topic)
+            cluster = by_key.get(key)
+            if cluster is None:
+                words = set(key.split())
+                cluster = next((c for c in clusters if any(_similar(words, member, threshold)
+                                                            for member in c["members"])), None)
+                if cluster is None:
+                    cluster = {"members": [], "windows": set(), "names": {}, "first_seen": len(clusters)}
+                    clusters.append(cluster)
+                cluster["members"].append(words)
+                by_key[key] = cluster
+            cluster["windows"].add(window)
+            cluster["names"][topic] = cluster["names"].get(topic, 0) + 1
+
+    ranked = sorted(clusters, key=lambda c: (-len(c["windows"]), c["first_seen"]))
+    return [{
+        "name": max(c["names"], key=lambda name: (c["names"][name], -len(name))),
+        "count": len(c["windows"]),
+        "variants": sorted(c["names"]),
+    } for c in ranked]
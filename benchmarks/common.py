@@ -0,0 +1,37 @@
+import math
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) into count/mean/percentiles in milliseconds"""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p90_ms": round(percentile(values, 90) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+def print_table(rows: Dict[str, Dict[str, float]], title: str = ""):
+    """Print a per-label latency summary as a fixed-width table"""
+    if title:
+        print(f"\n{title}")
+    columns = ["count", "errors", "mean_ms", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms"]
+    width = max([len(label) for label in rows] + [8])
+    print(f"{'label':<{width}}  " + "  ".join(f"{c:>9}" for c in columns))
+    for label, stats in rows.items():
+        print(f"{label:<{width}}  " + "  ".join(f"{stats.get(c, 0):>9}" for c in columns))
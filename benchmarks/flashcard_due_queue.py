@@ -0,0 +1,105 @@
+"""Show that "next N due cards" latency stays flat as review history grows.
+
+    python -m benchmarks.flashcard_due_queue --sizes 10000 100000 1000000 --users 5000
+
+Fills a scratch database with review rows in steps, and after each step times the
+due-cards query for random users. Latency should track the page size, not the table
+size, because the query is one range scan of ix_flashcard_reviews_user_due. The
+query plan is printed so an unindexed scan shows up immediately.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db import Base
+from app.models.flashcard import Flashcard
+from app.models.flashcard_review import FlashcardReview
+from app.models.syllabus import Syllabus
+from app.models.user import User
+from app.utils.spaced_repetition import due_cards
+from benchmarks.common import print_table, summarize
+
+
+def fill(engine, start: int, stop: int, users: int, now: datetime, batch_size: int = 50000):
+    """Insert review rows start..stop, spreading due dates a year either side of now"""
+    rng = random.Random(start)
+    with engine.begin() as conn:
+        for offset in range(start, stop, batch_size):
+            conn.execute(insert(FlashcardReview), [{
+                # Row i is card i // users for user i % users, so (user, card) stays unique
+                "user_id": i % users + 1,
+                "flashcard_id": i // users + 1,
+                "due_at": now + timedelta(minutes=rng.randint(-525600, 525600)),
+                "interval_days": rng.randint(1, 200),
+                "repetitions": rng.randint(0, 10),
+                "ease_factor": 2.5,
+            } for i in range(offset, min(offset + batch_size, stop))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500, help="Timed queries per size")
+    parser.add_argument("--limit", type=int, default=20, help="Cards per query")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'due_queue.db')}"
+    engine = create_engine(url)
+    # Only the tables the due queue touches, plus the ones their foreign keys reference
+    tables = [User.__table__, Syllabus.__table__, Flashcard.__table__, FlashcardReview.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    Session = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+
+    cards_needed = max(args.sizes) // args.users + 1
+    with engine.begin() as conn:
+        conn.execute(insert(Flashcard), [
+            {"id": i, "front": f"Front {i}", "back": f"Back {i}", "topic": "Benchmark"} for i in range(1, cards_needed + 1)
+        ])
+
+    results, plan = {}, []
+    rows_loaded = 0
+    for size in sorted(args.sizes):
+        fill(engine, rows_loaded, size, args.users, now)
+        rows_loaded = size
+        if engine.dialect.name == "sqlite":
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+
+        db = Session()
+        samples = []
+        try:
+            for _ in range(args.queries):
+                user_id = random.randint(1, args.users)
+                start = time.perf_counter()
+                due_cards(db, user_id, args.limit, now=now)
+                samples.append(time.perf_counter() - start)
+            if not plan and engine.dialect.name == "sqlite":
+                plan = [row[-1] for row in db.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM flashcard_reviews WHERE user_id = 1 AND due_at <= :now "
+                    "ORDER BY due_at, id LIMIT :limit"
+                ), {"now": now, "limit": args.limit})]
+        finally:
+            db.close()
+        results[f"{size} reviews"] = summarize(samples)
+
+    if args.json:
+        print(json.dumps({"results": results, "query_plan": plan}, indent=2))
+        return
+    print_table(results, title=f"due_cards(limit={args.limit}) over {args.users} users")
+    if plan:
+        print("\nQuery plan: " + "; ".join(plan))
+
+
+if __name__ == "__main__":
+    main()
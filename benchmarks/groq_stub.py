@@ -0,0 +1,254 @@
+"""Local Groq/OpenAI-compatible chat completions stub for load testing.
+
+Point the app at it with GROQ_API_BASE=http://localhost:9000 and any GROQ_API_KEY.
+
+    python -m benchmarks.groq_stub --port 9000 --latency lognormal --median 0.8 \
+        --rate-429 0.05 --rate-5xx 0.01 --max-concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class StubConfig:
+    latency: str = "lognormal"  # fixed | uniform | exponential | lognormal
+    median: float = 0.8  # seconds until the full completion is ready
+    sigma: float = 0.5  # lognormal shape / uniform half-width
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after: float = 1.0
+    max_concurrency: int = 0  # 0 = unlimited; above this the stub answers 429
+    stream_chunk_tokens: int = 8
+    rate_invalid_mcq: float = 0.0  # fraction of generated MCQs with no valid answer letter
+
+
+config = StubConfig()
+stats = Counter()
+in_flight = 0
+
+app = FastAPI(title="Groq stub")
+
+MATH_KEYWORDS = ["math", "algebra", "geometry", "calculus", "trigonometry", "equation", "formula", "number", "statistics"]
+
+
+def sample_latency() -> float:
+    """Draw one completion latency from the configured distribution"""
+    if config.latency == "fixed":
+        return config.median
+    if config.latency == "uniform":
+        return max(0.0, random.uniform(config.median - config.sigma, config.median + config.sigma))
+    if config.latency == "exponential":
+        return random.expovariate(math.log(2) / config.median) if config.median > 0 else 0.0
+    return random.lognormvariate(math.log(max(config.median, 1e-6)), config.sigma)
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def fake_mcqs(topic: str, count: int) -> list:
+    mcqs = [{
+        "question": f"[stub] Which statement about {topic} is correct? (#{i + 1})",
+        "option_a": f"{topic} fact {i + 1}",
+        "option_b": f"{topic} distractor {i + 1}a",
+        "option_c": f"{topic} distractor {i + 1}b",
+        "option_d": f"{topic} distractor {i + 1}c",
+        "correct_answer": "A",
+        "explanation": f"Stub explanation for {topic}",
+        "difficulty": "medium",
+    } for i in range(count)]
+    for mcq in mcqs:
+        if random.random() < config.rate_invalid_mcq:
+            mcq["correct_answer"] = "E"
+    return mcqs
+
+
+def fake_completion(prompt: str) -> str:
+    """Produce a plausible answer for each prompt shape the agents send"""
+    lowered = prompt.lower()
+    if "classify this topic" in lowered:
+        topic_line = re.search(r"Topic:\s*(.+)", prompt)
+        topic = topic_line.group(1).lower() if topic_line else ""
+        return "math" if any(k in topic for k in MATH_KEYWORDS) else "general"
+    if "flashcards" in lowered:
+        count_match = re.search(r"Generate (\d+) flashcards", prompt)
+        count = int(count_match.group(1)) if count_match else 5
+        return json.dumps([{"front": f"Stub concept {i + 1}", "back": f"Stub answer {i + 1}"} for i in range(count)])
+    if "failed validation" in lowered:
+        indexes = [int(index) for index in re.findall(r"^\s*(\d+)\. ", prompt, re.MULTILINE)]
+        return json.dumps({"mcqs": [{**fake_mcqs("Repaired", 1)[0], "correct_answer": "A", "index": index}
+                                    for index in indexes]})
+    if "multiple choice questions" in lowered:
+        count_match = re.search(r"Create (\d+)", prompt)
+        count = int(count_match.group(1)) if count_match else 3
+        if "each of these topics" in lowered:
+            block = re.search(r"each of these topics:(.*?)Content:", prompt, re.DOTALL | re.IGNORECASE)
+            topics = re.findall(r"^\s*- (.+)$", block.group(1) if block else "", re.MULTILINE)
+            return json.dumps({topic.strip(): fake_mcqs(topic.strip(), count) for topic in topics})
+        topic_match = re.search(r"(?:for|about): (.+)", prompt)
+        topic = topic_match.group(1).strip() if topic_match else "General"
+        if 'under "mcqs"' in prompt:
+            return json.dumps({"mcqs": fake_mcqs(topic, count)})
+        return json.dumps(fake_mcqs(topic, count))
+    if "topics" in lowered:
+        return json.dumps([f"Stub Topic {i + 1}" for i in range(random.randint(5, 8))])
+    return "4"
+
+
+def error_response(status: int, message: str) -> JSONResponse:
+    stats[f"status_{status}"] += 1
+    headers = {"retry-after": str(config.retry_after)} if status == 429 else {}
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": "stub_error", "code": status}},
+        headers=headers,
+    )
+
+
+@app.get("/openai/v1/models")
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "gemma2-9b-it", "object": "model"}]}
+
+
+@app.get("/stats")
+async def get_stats():
+    """Aggregate request, error and token counters since startup"""
+    return {"in_flight": in_flight, **stats}
+
+
+@app.post("/openai/v1/chat/completions")
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    global in_flight
+    body = await request.json()
+    stats["requests"] += 1
+
+    if config.max_concurrency and in_flight >= config.max_concurrency:
+        return error_response(429, "Rate limit reached (concurrency)")
+    roll = random.random()
+    if roll < config.rate_429:
+        return error_response(429, "Rate limit reached (injected)")
+    if roll < config.rate_429 + config.rate_5xx:
+        return error_response(random.choice([500, 502, 503]), "Internal server error (injected)")
+
+    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        stats["json_mode"] += 1
+        # Like the real API, JSON mode requires the prompt to ask for JSON
+        if "json" not in prompt.lower():
+            return error_response(400, "'messages' must contain the word 'json' in some form to use 'response_format' of type 'json_object'")
+    text = fake_completion(prompt)
+    model = body.get("model", "gemma2-9b-it")
+    usage = {
+        "prompt_tokens": count_tokens(prompt),
+        "completion_tokens": count_tokens(text),
+    }
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    stats["prompt_tokens"] += usage["prompt_tokens"]
+    stats["completion_tokens"] += usage["completion_tokens"]
+    stats[f"model_{model}"] += 1
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    latency = sample_latency()
+
+    if not body.get("stream"):
+        in_flight += 1
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            in_flight -= 1
+        stats["status_200"] += 1
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    async def event_stream():
+        global in_flight
+        in_flight += 1
+        try:
+            step = config.stream_chunk_tokens * 4
+            pieces = [text[i:i + step] for i in range(0, len(text), step)] or [""]
+            # Spend a third of the latency before the first token, spread the rest over the chunks
+            await asyncio.sleep(latency / 3)
+            per_chunk = (latency * 2 / 3) / len(pieces)
+            for index, piece in enumerate(pieces):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                        "finish_reason": None,
+                    }],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(per_chunk)
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "x_groq": {"id": completion_id, "usage": usage},
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+            stats["status_200"] += 1
+        finally:
+            in_flight -= 1
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Groq-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "exponential", "lognormal"], default=config.latency)
+    parser.add_argument("--median", type=float, default=config.median, help="Median completion latency in seconds")
+    parser.add_argument("--sigma", type=float, default=config.sigma, help="Lognormal sigma / uniform half-width")
+    parser.add_argument("--rate-429", type=float, default=config.rate_429, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=config.rate_5xx, help="Fraction of requests answered with 5xx")
+    parser.add_argument("--retry-after", type=float, default=config.retry_after, help="Retry-After seconds sent with 429")
+    parser.add_argument("--rate-invalid-mcq", type=float, default=config.rate_invalid_mcq,
+                        help="Fraction of generated MCQs given an invalid answer letter")
+    parser.add_argument("--max-concurrency", type=int, default=config.max_concurrency,
+                        help="Answer 429 above this many in-flight completions (0 = unlimited)")
+    args = parser.parse_args()
+
+    config.latency = args.latency
+    config.median = args.median
+    config.sigma = args.sigma
+    config.rate_429 = args.rate_429
+    config.rate_5xx = args.rate_5xx
+    config.retry_after = args.retry_after
+    config.max_concurrency = args.max_concurrency
+    config.rate_invalid_mcq = args.rate_invalid_mcq
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Drive upload -> prepare-exam -> quiz -> submit flows against a running server.
+
+    python -m benchmarks.load_test --base-url http://localhost:8000 --flows 40 --concurrency 8
+
+Tokens are minted locally with the app's SECRET_KEY unless --token is given, so the
+server under test must share the same .env.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from benchmarks.common import print_table, summarize
+
+SUBJECTS = [
+    ("Algebra", "Linear equations, quadratic equations, polynomials and factorisation."),
+    ("Geometry", "Triangles, circles, area and perimeter calculations, similarity."),
+    ("Statistics", "Mean, median, mode, variance and basic probability."),
+    ("Photosynthesis", "Light reactions, the Calvin cycle and chlorophyll."),
+    ("World War II", "Causes, major campaigns and the post-war settlement."),
+    ("Cell Biology", "Organelles, membranes, mitosis and meiosis."),
+    ("Thermodynamics", "Heat, work, entropy and the laws of thermodynamics."),
+]
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, label: str, seconds: float, ok: bool):
+        with self._lock:
+            self.samples[label].append(seconds)
+            if not ok:
+                self.errors[label] += 1
+
+    def report(self) -> dict:
+        rows = {}
+        for label in sorted(self.samples):
+            rows[label] = {**summarize(self.samples[label]), "errors": self.errors[label]}
+        return rows
+
+
+def make_syllabus(flow_id: int) -> str:
+    """Build a small synthetic syllabus, varied per flow so prompts are not identical"""
+    picked = random.sample(SUBJECTS, k=random.randint(3, len(SUBJECTS)))
+    lines = [f"Course syllabus #{flow_id}"]
+    lines += [f"{i + 1}. {title} - {detail}" for i, (title, detail) in enumerate(picked)]
+    return "\n".join(lines)
+
+
+def mint_token(user_id: int) -> str:
+    from app.auth.jwt_handler import create_access_token
+    return create_access_token({"user_id": user_id, "email": f"load{user_id}@example.com", "name": f"Load {user_id}"})
+
+
+def timed(recorder: LatencyRecorder, label: str, session: requests.Session, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+        ok = response.ok
+    except requests.RequestException:
+        response, ok = None, False
+    recorder.record(label, time.perf_counter() - start, ok)
+    if not ok:
+        raise RuntimeError(f"{label} failed: {response.status_code if response is not None else 'connection error'}")
+    return response.json()
+
+
+def run_flow(flow_id: int, args, recorder: LatencyRecorder) -> bool:
+    token = args.token or mint_token(args.user_id_base + flow_id)
+    headers = {"Authorization": f"Bearer {token}"}
+    base = args.base_url.rstrip("/") + "/api"
+    start = time.perf_counter()
+    ok = True
+    with requests.Session() as session:
+        session.headers.update(headers)
+        try:
+            upload = timed(
+                recorder, "POST /syllabus/upload", session, "POST", f"{base}/syllabus/upload",
+                files={"file": (f"syllabus_{flow_id}.txt", make_syllabus(flow_id).encode(), "text/plain")},
+                timeout=args.timeout,
+            )
+            syllabus_id = upload["id"]
+            timed(recorder, "POST /workflow/prepare-exam", session, "POST",
+                  f"{base}/workflow/prepare-exam/{syllabus_id}", timeout=args.timeout)
+            quiz = timed(recorder, "GET /workflow/quiz", session, "GET",
+                         f"{base}/workflow/quiz/{syllabus_id}", timeout=args.timeout)
+            answers = {str(q["id"]): random.choice("ABCD") for q in quiz["quiz_questions"]}
+            # Graded against the served quiz's session, as the frontend does
+            timed(recorder, "POST /workflow/submit-exam", session, "POST",
+                  f"{base}/workflow/submit-exam/{syllabus_id}",
+                  json={"answers": answers, "session_id": quiz["session_id"]}, timeout=args.timeout)
+        except (RuntimeError, KeyError, ValueError) as e:
+            print(f"flow {flow_id}: {e}")
+            ok = False
+    recorder.record("flow (end to end)", time.perf_counter() - start, ok)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load generator for the exam prep API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--flows", type=int, default=20, help="Total number of flows to run")
+    parser.add_argument("--concurrency", type=int, default=4, help="Flows in flight at once")
+    parser.add_argument("--token", help="Use this bearer token instead of minting one per flow")
+    parser.add_argument("--user-id-base", type=int, default=100000, help="First user_id used for minted tokens")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    recorder = LatencyRecorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(run_flow, i, args, recorder) for i in range(args.flows)]
+        succeeded = sum(1 for f in as_completed(futures) if f.result())
+    elapsed = time.perf_counter() - start
+
+    report = recorder.report()
+    summary = {
+        "flows": args.flows,
+        "succeeded": succeeded,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "flows_per_s": round(args.flows / elapsed, 3) if elapsed else 0,
+    }
+    if args.json:
+        print(json.dumps({"summary": summary, "endpoints": report}, indent=2))
+    else:
+        print_table(report, title="Endpoint latency")
+        print(f"\n{summary}")
+
+
+if __name__ == "__main__":
+    main()
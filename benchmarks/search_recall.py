@@ -0,0 +1,91 @@
+"""Recall vs latency of the Chroma HNSW index for different M / search_ef settings.
+
+    python -m benchmarks.search_recall --docs 20000 --queries 200 --m 8 16 32 --ef 16 64 128
+
+Indexes a synthetic corpus of clustered unit vectors (the embedding size of the
+default sentence model) into in-memory collections and compares each query's top-k
+with the exact top-k from brute force. Use it to pick CHROMA_HNSW_M and
+CHROMA_HNSW_SEARCH_EF.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.utils.embeddings import hnsw_metadata
+from benchmarks.common import summarize
+
+BATCH_SIZE = 5000
+
+
+def synthetic_corpus(docs: int, queries: int, dim: int, clusters: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    corpus = centers[rng.integers(0, clusters, docs)] + 0.6 * rng.normal(size=(docs, dim))
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+    # Queries are noisy copies of documents, like a paraphrased passage
+    probes = corpus[rng.integers(0, docs, queries)] + 0.02 * rng.normal(size=(queries, dim))
+    probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+    return corpus.astype(np.float32), probes.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 64, 128], help="search_ef values")
+    parser.add_argument("--construction-ef", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    import chromadb
+    from chromadb.config import Settings
+
+    corpus, probes = synthetic_corpus(args.docs, args.queries, args.dim, args.clusters)
+    exact = np.argsort(-(probes @ corpus.T), axis=1)[:, :args.k]
+    ids = [str(i) for i in range(args.docs)]
+    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+
+    results = []
+    for m in args.m:
+        for ef in args.ef:
+            name = f"bench_m{m}_ef{ef}"
+            collection = client.create_collection(name, metadata=hnsw_metadata(m, args.construction_ef, ef))
+            start = time.perf_counter()
+            for offset in range(0, args.docs, BATCH_SIZE):
+                collection.add(ids=ids[offset:offset + BATCH_SIZE],
+                               embeddings=corpus[offset:offset + BATCH_SIZE].tolist())
+            build_seconds = time.perf_counter() - start
+
+            samples, hits = [], 0
+            for probe, truth in zip(probes, exact):
+                start = time.perf_counter()
+                found = collection.query(query_embeddings=[probe.tolist()], n_results=args.k)["ids"][0]
+                samples.append(time.perf_counter() - start)
+                hits += len(set(int(i) for i in found) & set(truth.tolist()))
+            stats = summarize(samples)
+            results.append({
+                "m": m, "search_ef": ef,
+                "recall": round(hits / (args.k * len(probes)), 4),
+                "p50_ms": stats["p50_ms"], "p95_ms": stats["p95_ms"],
+                "build_s": round(build_seconds, 1),
+            })
+            client.delete_collection(name)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"recall@{args.k} over {args.queries} queries, {args.docs} docs x {args.dim} dims")
+    print(f"{'M':>4}  {'search_ef':>9}  {'recall':>7}  {'p50_ms':>7}  {'p95_ms':>7}  {'build_s':>7}")
+    for row in results:
+        print(f"{row['m']:>4}  {row['search_ef']:>9}  {row['recall']:>7}  {row['p50_ms']:>7}  "
+              f"{row['p95_ms']:>7}  {row['build_s']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure how long `import app.main` takes in a fresh interpreter.
+
+    python -m benchmarks.startup_time --runs 5 --budget-ms 1500
+
+Each run imports the app under `-X importtime`. The script reports the median wall
+time, the slowest modules by cumulative import time, and any heavy dependency that
+was imported eagerly. It exits non-zero when the median exceeds the budget or a lazy
+dependency leaked into startup, so it can gate CI.
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Only loaded on first use; importing app.main must not pull these in
+LAZY_MODULES = ["langgraph", "langchain_groq", "chromadb", "PyPDF2", "google.auth", "sentence_transformers", "tiktoken"]
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)")
+_PROBE = "import sys, json, app.main; print(json.dumps(sorted(sys.modules)))"
+
+
+def run_once(module: str):
+    probe = _PROBE.replace("app.main", module)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            cumulative[match.group(3).strip()] = int(match.group(2))
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return wall, cumulative, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    walls = []
+    per_module = defaultdict(list)
+    leaked = set()
+    for _ in range(args.runs):
+        wall, cumulative, loaded = run_once(args.module)
+        walls.append(wall * 1000)
+        for name, micros in cumulative.items():
+            per_module[name].append(micros / 1000)
+        leaked.update(m for m in LAZY_MODULES if m in loaded)
+
+    median_ms = statistics.median(walls)
+    slowest = sorted(
+        ((name, statistics.median(values)) for name, values in per_module.items()),
+        key=lambda item: item[1], reverse=True
+    )[:args.top]
+    over_budget = median_ms > args.budget_ms
+
+    if args.json:
+        print(json.dumps({
+            "median_ms": round(median_ms, 1),
+            "runs_ms": [round(w, 1) for w in walls],
+            "budget_ms": args.budget_ms,
+            "slowest_modules_ms": {name: round(ms, 1) for name, ms in slowest},
+            "eager_heavy_imports": sorted(leaked),
+        }, indent=2))
+    else:
+        print(f"import {args.module}: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+        print(f"\n{'module':<50}  {'cumulative_ms':>13}")
+        for name, ms in slowest:
+            print(f"{name:<50}  {ms:>13.1f}")
+        if leaked:
+            print(f"\nImported eagerly, should be lazy: {', '.join(sorted(leaked))}")
+
+    if over_budget or leaked:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time topic extraction as syllabus size grows.
+
+    python -m benchmarks.groq_stub --port 9000 --median 0.8 &
+    GROQ_API_BASE=http://localhost:9000 GROQ_API_KEY=stub \\
+        python -m benchmarks.topic_extraction --pages 1 10 50 200
+
+Builds synthetic course packs (about 500 words a page) and runs
+SyllabusAgent.extract_topics on each. Long documents take the map-reduce path, so
+wall time should grow far slower than page count.
+"""
+import argparse
+import json
+import random
+import time
+
+from app.agents.syllabus_agent import SyllabusAgent
+
+SUBJECTS = [
+    "Cell Biology", "Organic Chemistry", "Linear Algebra", "Quantum Mechanics", "Plate Tectonics",
+    "Game Theory", "Number Theory", "Thermodynamics", "Roman History", "Modern Poetry",
+    "Machine Learning", "Graph Theory", "Microeconomics", "Genetics", "Optics", "Statistics",
+]
+WORDS = ("the of and study model theory example problem method system analysis structure process "
+         "principle equation review concept application data result").split()
+
+
+def synthetic_syllabus(pages: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    paragraphs = []
+    for i in range(pages * 5):
+        subject = SUBJECTS[i * len(SUBJECTS) // (pages * 5)]
+        paragraphs.append(f"{subject}: " + " ".join(rng.choice(WORDS) for _ in range(100)))
+    return "\n\n".join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    agent = SyllabusAgent()
+    results = []
+    for pages in args.pages:
+        text = synthetic_syllabus(pages)
+        start = time.perf_counter()
+        topics = agent.extract_topics(text)
+        results.append({"pages": pages, "seconds": round(time.perf_counter() - start, 2), "topics": len(topics)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'pages':>6}  {'seconds':>8}  {'topics':>6}")
+    for row in results:
+        print(f"{row['pages']:>6}  {row['seconds']:>8}  {row['topics']:>6}")
+
+
+if __name__ == "__main__":
+    main()
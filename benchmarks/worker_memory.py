@@ -0,0 +1,37 @@
+"""Report per-worker memory of a running gunicorn master.
+
+    python -m benchmarks.worker_memory --pid $(pgrep -o -f "gunicorn app.main:app")
+
+PSS splits shared pages evenly between the processes mapping them, so the PSS total is
+the node's real footprint; compare it with PRELOAD_APP=true and false.
+"""
+import argparse
+import json
+
+from app.monitoring.memory import child_pids, process_memory
+
+COLUMNS = ["rss_kb", "pss_kb", "shared_clean_kb", "shared_dirty_kb", "private_clean_kb", "private_dirty_kb"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pid", type=int, required=True, help="gunicorn master pid")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    rows = {"master": process_memory(args.pid)}
+    for pid in child_pids(args.pid):
+        rows[f"worker {pid}"] = process_memory(pid)
+    rows["total"] = {c: sum(r.get(c, 0) for r in rows.values()) for c in COLUMNS}
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    width = max(len(label) for label in rows)
+    print(f"{'process':<{width}}  " + "  ".join(f"{c:>16}" for c in COLUMNS))
+    for label, usage in rows.items():
+        print(f"{label:<{width}}  " + "  ".join(f"{usage.get(c, 0):>16}" for c in COLUMNS))
+
+
+if __name__ == "__main__":
+    main()
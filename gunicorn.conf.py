@@ -0,0 +1,48 @@
+"""Gunicorn settings for production.
+
+With PRELOAD_APP enabled (the default) the app and its read-only model state are
+loaded once in the master and shared copy-on-write with the forked workers.
+"""
+import gc
+import logging
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# HuggingFace tokenizers must not start their thread pool before fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    # Keep the collector from touching (and so un-sharing) preloaded objects, then move
+    # everything allocated so far into the permanent generation right before forking
+    gc.disable()
+    from app.preload import preload
+    preload()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+    if preload_app:
+        # Connections opened in the master must not be shared with the workers
+        from app.models.db import engine, read_engine
+        engine.dispose(close=False)
+        read_engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from app.monitoring.memory import process_memory
+    usage = process_memory()
+    if usage:
+        logger.info(
+            f"Worker {worker.pid} ready: rss={usage['rss_kb'] // 1024}MB pss={usage['pss_kb'] // 1024}MB "
+            f"shared={(usage['shared_clean_kb'] + usage['shared_dirty_kb']) // 1024}MB"
+        )
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+# Point the app at throwaway storage before anything under app/ reads its config
+_tmp = tempfile.mkdtemp(prefix="exam-prep-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["WORKFLOW_CHECKPOINT_DB"] = f"{_tmp}/checkpoints.db"
+os.environ["LOG_FILE"] = f"{_tmp}/exam_agent.log"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["TOPIC_EMBEDDINGS_ENABLED"] = "false"
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.pop("REDIS_URL", None)
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+import pytest
+
+# Imported here rather than in the fixture: it registers every model, so mappers that
+# refer to each other by name configure even in tests that never use the database
+from app.models.db import Base, SessionLocal, engine
+from app.models.init_db import init_db
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables"""
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,60 @@
+from app.models.mcq import MCQ
+from app.models.syllabus import Syllabus
+from app.utils.dedup import (
+    NearDuplicateIndex, build_syllabus_index, compact_mcq_bank, mcq_text, minhash, shingles, similarity,
+)
+
+
+def _mcq(question: str, answer: str = "B", correct: str = "Mitochondria") -> dict:
+    return {
+        "question": question, "option_a": "Nucleus", "option_b": correct, "option_c": "Ribosome",
+        "option_d": "Golgi body", "correct_answer": answer,
+    }
+
+
+def test_shingles_normalize_case_and_punctuation():
+    assert shingles("The Cell, the cell!") == {"the cell", "cell the"}
+    assert shingles("Cell") == {"cell"}
+    assert shingles("") == set()
+
+
+def test_minhash_estimates_jaccard():
+    a = minhash("which organelle produces most of the energy of the cell")
+    assert similarity(a, minhash("Which organelle produces most of the energy of the cell?")) == 1.0
+    near = minhash("which organelle produces most of the energy in the cell")
+    far = minhash("what is the capital city of france")
+    assert similarity(a, near) > 0.4
+    assert similarity(a, far) < 0.2
+
+
+def test_mcq_text_uses_question_and_correct_option():
+    assert mcq_text(_mcq("Powerhouse of the cell?")) == "Powerhouse of the cell? Mitochondria"
+    assert mcq_text({"question": "Q", "correct_answer": ""}) == "Q "
+
+
+def test_index_finds_rewordings_only():
+    index = NearDuplicateIndex(threshold=0.6)
+    index.add(1, mcq_text(_mcq("Which organelle is known as the powerhouse of the cell?")))
+    assert index.find_duplicate(mcq_text(_mcq("Which organelle is known as the powerhouse of a cell?"))) == 1
+    assert index.find_duplicate(mcq_text(_mcq("What does DNA polymerase do?"))) is None
+    assert len(index) == 1
+
+
+def test_compact_mcq_bank_keeps_oldest_of_each_cluster(db):
+    syllabus = Syllabus(title="Biology")
+    db.add(syllabus)
+    db.commit()
+    questions = [
+        "Which organelle is known as the powerhouse of the cell?",
+        "What does DNA polymerase do during replication?",
+        "Which organelle is known as the powerhouse of a cell?",
+    ]
+    for question in questions:
+        db.add(MCQ(syllabus_id=syllabus.id, topic="Cells", **_mcq(question)))
+    db.commit()
+
+    assert len(build_syllabus_index(db, syllabus.id)) == 3
+    stats = compact_mcq_bank(db, syllabus.id)
+    assert stats == {"syllabi": 1, "checked": 3, "removed": 1}
+    assert [row.question for row in db.query(MCQ).order_by(MCQ.id)] == questions[:2]
+    assert compact_mcq_bank(db)["removed"] == 0
@@ -0,0 +1,125 @@
+import pytest
+
+from app.agents import exam_workflow
+from app.agents.exam_workflow import ExamWorkflow, add_errors
+from app.agents.checkpointing import get_checkpointer
+from app.monitoring import health
+from app.utils.syllabus_store import SyllabusStore, content_hash
+
+CONTENT = "Unit 1: Algebra\n\nUnit 2: Geometry\n\nUnit 3: Optics"
+DIGEST = content_hash(CONTENT)
+
+
+def _mcqs(topic: str) -> list:
+    return [{
+        "question": f"{topic} question {n}", "option_a": "1", "option_b": "2", "option_c": "3", "option_d": "4",
+        "correct_answer": "A", "explanation": "",
+    } for n in range(3)]
+
+
+class FakeSupervisor:
+    """Generates MCQs per topic; topics listed in `failing` fail, topics in `crashing` raise"""
+
+    def __init__(self):
+        self.failing, self.crashing, self.calls = set(), set(), []
+
+    def plan_mcq_batches(self, topics, content, batch_size=5):
+        return [{"agent_type": "general", "topics": [topic]} for topic in topics]
+
+    def generate_mcq_batch(self, agent_type, topics, content, count=3):
+        self.calls.extend(topics)
+        if self.crashing & set(topics):
+            raise RuntimeError("worker died")
+        return {
+            topic: {"status": "failed", "mcqs": [], "agent_used": agent_type, "error": "model error"}
+            if topic in self.failing else
+            {"status": "success", "mcqs": _mcqs(topic), "agent_used": agent_type}
+            for topic in topics
+        }
+
+
+class FakeFlashcards:
+    def __init__(self):
+        self.calls = []
+
+    def generate_flashcards(self, topic, content, count=5):
+        self.calls.append(topic)
+        return [{"front": f"{topic} front", "back": f"{topic} back"}]
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    monkeypatch.setattr(exam_workflow, "syllabus_store", SyllabusStore(loader=lambda syllabus_id: CONTENT))
+    monkeypatch.setattr(health.agent_health, "get", lambda: {"healthy_agents": 2, "total_agents": 2})
+    workflow = ExamWorkflow()
+    workflow.supervisor = FakeSupervisor()
+    workflow.flashcard_agent = FakeFlashcards()
+    return workflow
+
+
+def _thread_exists(syllabus_id: int) -> bool:
+    config = {"configurable": {"thread_id": f"syllabus-{syllabus_id}-{DIGEST[:16]}"}}
+    return get_checkpointer().get_tuple(config) is not None
+
+
+def test_add_errors_appends_and_resets():
+    assert add_errors(["a"], ["b"]) == ["a", "b"]
+    assert add_errors(["a"], None) == []
+    assert add_errors(None, ["b"]) == ["b"]
+
+
+def test_finished_run_with_failed_topics_retries_only_those(workflow):
+    topics = ["Algebra", "Geometry", "Optics"]
+    workflow.supervisor.failing = {"Geometry"}
+    first = workflow.run_exam_preparation(1, DIGEST, topics=topics, flashcard_topics=[])
+    assert {m["topic"] for m in first["mcqs"]} == {"Algebra", "Optics"}
+    assert _thread_exists(1)
+
+    workflow.supervisor.failing = set()
+    workflow.supervisor.calls = []
+    second = workflow.run_exam_preparation(1, DIGEST, topics=topics, flashcard_topics=[])
+    assert workflow.supervisor.calls == ["Geometry"]
+    assert {m["topic"] for m in second["mcqs"]} == set(topics)
+    assert not _thread_exists(1)
+
+
+def test_crashed_run_resumes_without_redoing_finished_batches(workflow):
+    topics = ["Algebra", "Geometry", "Optics"]
+    workflow.supervisor.crashing = {"Optics"}
+    crashed = workflow.run_exam_preparation(2, DIGEST, topics=topics, flashcard_topics=[])
+    assert crashed["current_step"] == "failed"
+
+    workflow.supervisor.crashing = set()
+    workflow.supervisor.calls = []
+    resumed = workflow.run_exam_preparation(2, DIGEST, topics=topics, flashcard_topics=[])
+    assert workflow.supervisor.calls == ["Optics"]
+    assert {m["topic"] for m in resumed["mcqs"]} == set(topics)
+
+
+def test_errors_do_not_pile_up_across_runs(workflow):
+    topics = ["Algebra", "Geometry"]
+    workflow.supervisor.failing = {"Geometry"}
+
+    def failing_cards(topic, content, count=5):
+        raise RuntimeError("flashcard model down")
+
+    workflow.flashcard_agent.generate_flashcards = failing_cards
+    first = workflow.run_exam_preparation(3, DIGEST, topics=topics)
+    assert len(first["errors"]) == 2
+
+    second = workflow.run_exam_preparation(3, DIGEST, topics=topics)
+    assert len(second["errors"]) == 2
+
+
+def test_rerun_after_partial_failure_returns_only_new_flashcards(workflow):
+    topics = ["Algebra", "Geometry"]
+    workflow.supervisor.failing = {"Geometry"}
+    first = workflow.run_exam_preparation(4, DIGEST, topics=topics)
+    assert sorted(card["topic"] for card in first["flashcards"]) == topics
+
+    # Both topics have flashcards now, so the retry asks for none
+    workflow.supervisor.failing = set()
+    second = workflow.run_exam_preparation(4, DIGEST, topics=topics, flashcard_topics=[])
+    assert {m["topic"] for m in second["mcqs"]} == set(topics)
+    assert second["flashcards"] == []
+    assert workflow.flashcard_agent.calls == topics
@@ -0,0 +1,158 @@
+import threading
+import time as real_time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import llm_scheduler
+from app.agents.llm_scheduler import LLMScheduler, Priority, retry_after_seconds
+
+NOW = 1_000_000.0
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time for the scheduler; sleeps advance it instead of waiting"""
+    state = SimpleNamespace(now=0.0, sleeps=[])
+
+    def sleep(seconds):
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    monkeypatch.setattr(llm_scheduler, "time", SimpleNamespace(
+        monotonic=lambda: state.now, time=lambda: NOW, sleep=sleep,
+    ))
+    # Full jitter at its maximum, so the expected delays are exact
+    monkeypatch.setattr(llm_scheduler, "random", SimpleNamespace(uniform=lambda low, high: high))
+    return state
+
+
+def _failing(*errors, result="ok"):
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return call
+
+
+def test_retry_after_reads_seconds_and_http_dates(clock):
+    assert retry_after_seconds(ProviderError(429, {"retry-after": "7"})) == 7.0
+    date = format_datetime(datetime.fromtimestamp(NOW, timezone.utc) + timedelta(seconds=12), usegmt=True)
+    assert retry_after_seconds(ProviderError(429, {"retry-after": date})) == pytest.approx(12.0)
+    assert retry_after_seconds(ProviderError(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(ProviderError(429)) is None
+
+
+def test_successes_raise_the_limit_additively(clock):
+    scheduler = LLMScheduler(initial_limit=2, max_limit=3, target_latency=10)
+    for _ in range(4):
+        scheduler.run(lambda: "ok")
+    assert scheduler.limit == pytest.approx(3.0)
+    scheduler.run(lambda: "ok")
+    assert scheduler.limit == 3
+
+
+def test_rate_limit_halves_the_limit_once_per_cooldown_and_retries(clock):
+    scheduler = LLMScheduler(initial_limit=8, base_delay=0.5, max_delay=30, decrease_cooldown=1.0)
+    clock.now = 10.0
+    call = _failing(ProviderError(429), ProviderError(429, {"retry-after": "5"}))
+
+    assert scheduler.run(call) == "ok"
+    # The second 429 lands inside the cooldown, so the limit is halved once; its retry honours Retry-After
+    assert clock.sleeps == [0.5, 5.0]
+    assert scheduler.limit == pytest.approx(4 + 1 / 4)
+    assert scheduler.stats["rate_limited"] == 2 and scheduler.stats["retries"] == 2
+
+    scheduler.run(_failing(ProviderError(429)))
+    assert scheduler.limit < 3
+
+
+def test_non_retryable_errors_and_exhausted_retries_raise(clock):
+    scheduler = LLMScheduler(max_retries=2)
+    with pytest.raises(ProviderError):
+        scheduler.run(_failing(ProviderError(400)))
+    assert clock.sleeps == []
+    with pytest.raises(ProviderError):
+        scheduler.run(_failing(*[ProviderError(503)] * 3))
+    assert len(clock.sleeps) == 2
+    assert scheduler.stats["failures"] == 2
+    assert scheduler.in_flight == 0
+
+
+def test_slow_calls_trim_the_limit(clock):
+    scheduler = LLMScheduler(initial_limit=10, target_latency=1.0)
+
+    def slow():
+        clock.now += 5
+        return "ok"
+
+    scheduler.run(slow)
+    assert scheduler.limit == pytest.approx(9.0)
+
+
+def test_streams_retry_only_before_the_first_chunk(clock):
+    scheduler = LLMScheduler()
+    attempts = []
+
+    def flaky_start():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ProviderError(503)
+        yield "a"
+        yield "b"
+
+    assert list(scheduler.stream(flaky_start)) == ["a", "b"]
+    assert len(attempts) == 2
+
+    def broken_midway():
+        attempts.append(1)
+        yield "a"
+        raise ProviderError(503)
+
+    attempts.clear()
+    with pytest.raises(ProviderError):
+        list(scheduler.stream(broken_midway))
+    assert len(attempts) == 1
+    assert scheduler.in_flight == 0
+
+
+def test_closing_a_stream_early_releases_its_slot(clock):
+    scheduler = LLMScheduler(initial_limit=1)
+    stream = scheduler.stream(lambda: iter(["a", "b", "c"]))
+    assert next(stream) == "a"
+    assert scheduler.in_flight == 1
+    stream.close()
+    assert scheduler.in_flight == 0
+
+
+def test_waiters_are_served_by_priority_then_in_order(clock):
+    scheduler = LLMScheduler(initial_limit=1, max_limit=1)
+    gate, order = threading.Event(), []
+    holder = threading.Thread(target=scheduler.run, args=(gate.wait,))
+    holder.start()
+    while scheduler.in_flight == 0:
+        real_time.sleep(0.001)
+
+    threads = []
+    for name, priority in [("bg1", Priority.BACKGROUND), ("bg2", Priority.BACKGROUND), ("ui", Priority.INTERACTIVE)]:
+        thread = threading.Thread(target=scheduler.run, args=(order.append, name), kwargs={"priority": priority})
+        thread.start()
+        threads.append(thread)
+        while len(scheduler._waiting) < len(threads):
+            real_time.sleep(0.001)
+
+    gate.set()
+    for thread in [holder, *threads]:
+        thread.join(timeout=5)
+    assert order == ["ui", "bg1", "bg2"]
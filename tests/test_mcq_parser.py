@@ -0,0 +1,71 @@
+import json
+
+from app.utils.mcq_parser import (
+    IncrementalMCQParser, group_mcqs_by_topic, iter_mcqs, match_topic, mcq_errors, validate_mcq,
+)
+
+
+def _mcq(question: str, answer: str = "A") -> dict:
+    return {
+        "question": question, "option_a": "1", "option_b": "2", "option_c": "3", "option_d": "4",
+        "correct_answer": answer, "explanation": "",
+    }
+
+
+def _chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_parser_yields_items_as_soon_as_they_close():
+    text = json.dumps([_mcq("Q1"), _mcq("Q2")])
+    parser = IncrementalMCQParser()
+    end_of_first = text.index("}") + 1
+    first = parser.feed(text[:end_of_first])
+    assert [item["question"] for _, item in first] == ["Q1"]
+    rest = parser.feed(text[end_of_first:])
+    assert [item["question"] for _, item in rest] == ["Q2"]
+
+
+def test_parser_handles_any_chunking_and_leading_prose():
+    payload = {"Algebra": [_mcq('Solve "x" {twice}')], "Geometry": [_mcq("Q2"), _mcq("Q3")]}
+    text = "Here are your questions:\n" + json.dumps(payload)
+    for size in (1, 3, 7, len(text)):
+        pairs = list(iter_mcqs(_chunked(text, size)))
+        assert [(key, mcq["question"]) for key, mcq in pairs] == [
+            ("Algebra", 'Solve "x" {twice}'), ("Geometry", "Q2"), ("Geometry", "Q3"),
+        ]
+
+
+def test_parser_keeps_going_past_a_broken_item():
+    text = '[{"question": "Q1", "option_a": 1,}, ' + json.dumps(_mcq("Q2"))[:-1] + "}]"
+    invalid = []
+    pairs = list(iter_mcqs([text], invalid))
+    assert [mcq["question"] for _, mcq in pairs] == ["Q2"]
+    assert len(invalid) == 1 and invalid[0][0] is None and isinstance(invalid[0][1], str)
+
+
+def test_parser_ignores_text_after_the_value():
+    parser = IncrementalMCQParser()
+    items = parser.feed(json.dumps([_mcq("Q1")]) + ' trailing [{"question": "ignored"}]')
+    assert len(items) == 1
+
+
+def test_group_mcqs_by_topic_matches_keys_loosely():
+    pairs = [("  algebra ", _mcq("Q1")), ("GEOMETRY", _mcq("Q2")), ("Unasked", _mcq("Q3")), (None, _mcq("Q4"))]
+    grouped = group_mcqs_by_topic(pairs, ["Algebra", "Geometry"])
+    assert {topic: [m["question"] for m in mcqs] for topic, mcqs in grouped.items()} == {
+        "Algebra": ["Q1"], "Geometry": ["Q2"],
+    }
+    assert match_topic(None, ["Algebra"]) is None
+
+
+def test_answer_letter_accepts_only_spellings_of_the_letter():
+    for answer, letter in [("a", "A"), (" B) ", "B"), ("(c)", "C"), ("D.", "D"),
+                           ("Option B", "B"), ("option: d", "D"), ("Answer: C", "C")]:
+        assert validate_mcq(_mcq("Q", answer))["correct_answer"] == letter
+
+
+def test_answer_text_is_invalid_rather_than_read_as_a_letter():
+    for answer in ["Chlorophyll", "Cell wall", "C) Chlorophyll", "E", "Option E", ""]:
+        assert validate_mcq(_mcq("Q", answer)) is None
+        assert any(error.startswith("correct_answer") for error in mcq_errors(_mcq("Q", answer)))
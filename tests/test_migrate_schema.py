@@ -0,0 +1,34 @@
+from sqlalchemy import inspect, text
+
+from app.models.db import Base, engine
+from app.models.migrate_schema import migrate_schema
+
+
+def test_migrate_schema_upgrades_existing_tables():
+    Base.metadata.drop_all(bind=engine)
+    # mcqs and quiz_attempts as they were created before topic ids and keyset pagination
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE mcqs (id INTEGER PRIMARY KEY, syllabus_id INTEGER, question TEXT, option_a VARCHAR, "
+            "option_b VARCHAR, option_c VARCHAR, option_d VARCHAR, correct_answer VARCHAR, explanation TEXT, "
+            "topic VARCHAR)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE quiz_attempts (id INTEGER PRIMARY KEY, user_id INTEGER, syllabus_id INTEGER, "
+            "answers TEXT, score FLOAT, total_questions INTEGER, created_at DATETIME)"
+        ))
+        conn.execute(text("INSERT INTO mcqs (id, question, topic) VALUES (1, 'Q1', 'Cells')"))
+    try:
+        added = migrate_schema()
+        assert added["columns"] == ["mcqs.topic_id"]
+        assert {"ix_mcqs_topic_id", "ix_mcqs_syllabus_id_id", "ix_quiz_attempts_user_created"} <= set(added["indexes"])
+
+        inspector = inspect(engine)
+        assert "topic_id" in {column["name"] for column in inspector.get_columns("mcqs")}
+        assert "ix_syllabus_user_created" in {index["name"] for index in inspector.get_indexes("syllabus")}
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT question, topic_id FROM mcqs")).all() == [("Q1", None)]
+
+        assert migrate_schema() == {"columns": [], "indexes": []}
+    finally:
+        Base.metadata.drop_all(bind=engine)
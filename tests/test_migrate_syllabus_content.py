@@ -0,0 +1,32 @@
+import zlib
+
+from sqlalchemy import text
+
+from app.models.db import engine
+from app.models.migrate_syllabus_content import migrate_syllabus_content
+from app.models.syllabus import Syllabus
+from app.utils.syllabus_store import content_hash, ensure_content_hash
+
+
+def _stored(syllabus_id: int):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT content, content_hash FROM syllabus WHERE id = :id"), {"id": syllabus_id}).one()
+
+
+def test_rows_hashed_lazily_are_still_compressed(db):
+    with engine.begin() as conn:
+        # Written before compression: plain text and no hash
+        for syllabus_id, content in [(1, "Unit 1: Cells"), (2, "Unit 2: Optics")]:
+            conn.execute(text("INSERT INTO syllabus (id, title, content) VALUES (:id, 't', :content)"),
+                         {"id": syllabus_id, "content": content})
+    # prepare-exam ran on syllabus 1 before the migration did
+    assert ensure_content_hash(db, 1) == content_hash("Unit 1: Cells")
+    db.add(Syllabus(id=3, title="new", content="Unit 3: Waves", content_hash=content_hash("Unit 3: Waves")))
+    db.commit()
+
+    assert migrate_syllabus_content() == 2
+    for syllabus_id, content in [(1, "Unit 1: Cells"), (2, "Unit 2: Optics"), (3, "Unit 3: Waves")]:
+        raw, digest = _stored(syllabus_id)
+        assert zlib.decompress(raw).decode() == content
+        assert digest == content_hash(content)
+    assert migrate_syllabus_content() == 0
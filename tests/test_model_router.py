@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents import model_router
+from app.agents.model_router import ModelRouter, RoutedChatModel
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(model_router, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def router(clock):
+    return ModelRouter(
+        tiers={"fast": ["small"], "quality": ["large", "large-alt"]},
+        task_tiers={"classify": "fast", "mcq_generation": "quality"},
+        tier_fallback={"fast": "quality", "quality": "fast"},
+        p95_threshold=10.0, error_rate_threshold=0.25, min_samples=5,
+    )
+
+
+def _record(router, model, count, latency=1.0, ok=True):
+    for _ in range(count):
+        router.record(model, latency, ok)
+
+
+def test_candidates_follow_the_tier_then_its_fallback(router):
+    assert router.candidates("classify") == ["small", "large", "large-alt"]
+    assert router.candidates("mcq_generation") == ["large", "large-alt", "small"]
+    assert router.candidates("unknown") == ["large", "large-alt", "small"]
+
+
+def test_slow_p95_fails_over_to_the_next_model(router):
+    _record(router, "large", 18, latency=2.0)
+    _record(router, "large", 2, latency=30.0)
+    assert router.choose("mcq_generation") == "large-alt"
+
+
+def test_error_rate_fails_over(router):
+    _record(router, "large", 6)
+    _record(router, "large", 3, ok=False)
+    assert router.choose("mcq_generation") == "large-alt"
+
+
+def test_few_samples_do_not_trigger_failover(router):
+    _record(router, "large", 4, ok=False)
+    assert router.choose("mcq_generation") == "large"
+    router.record("large", 1.0, ok=False)
+    assert router.choose("mcq_generation") == "large-alt"
+
+
+def test_model_recovers_once_bad_samples_age_out(router, clock):
+    _record(router, "large", 5, latency=30.0)
+    assert router.choose("mcq_generation") == "large-alt"
+    clock.now += 121
+    assert router.choose("mcq_generation") == "large"
+    assert router.snapshot()["models"]["large"]["samples"] == 0
+
+
+def test_all_degraded_uses_the_preferred_model(router):
+    for model in ("large", "large-alt", "small"):
+        _record(router, model, 5, ok=False)
+    assert router.choose("mcq_generation") == "large"
+
+
+def test_routed_model_records_failures_against_the_chosen_model(router, monkeypatch):
+    class Failing:
+        def invoke(self, messages, **kwargs):
+            raise RuntimeError("503")
+
+    monkeypatch.setattr(model_router, "get_chat_model", lambda model, temperature: Failing())
+    chat = RoutedChatModel("classify", router=router)
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            chat.invoke([])
+    assert router.snapshot()["models"]["small"]["error_rate"] == 1.0
+    assert router.choose("classify") == "large"
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.quiz_attempt import QuizAttempt
+from app.models.syllabus import Syllabus
+from app.routes.history_routes import list_attempts, list_syllabi
+from app.utils.pagination import Cursor, decode_cursor, encode_cursor, page_size, paginate
+
+
+def test_cursor_round_trip():
+    created = datetime(2026, 10, 19, 8, 30, 15)
+    assert decode_cursor(encode_cursor(42, created)) == Cursor(42, created)
+    assert decode_cursor(encode_cursor(7)) == Cursor(7, None)
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(1)[:-2], "eyJ4IjogMX0"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_page_size_is_clamped():
+    assert page_size(0) == 1
+    assert page_size(1000) == 100
+
+
+def test_paginate_only_returns_a_cursor_when_more_rows_exist():
+    class Row:
+        def __init__(self, id):
+            self.id = id
+
+    page, cursor = paginate([Row(3), Row(2), Row(1)], 2)
+    assert [row.id for row in page] == [3, 2] and decode_cursor(cursor) == Cursor(2)
+    page, cursor = paginate([Row(1)], 2)
+    assert len(page) == 1 and cursor is None
+
+
+def _all_pages(route, user_id, db, limit=2):
+    seen, cursor = [], None
+    while True:
+        page = asyncio.run(route(limit=limit, cursor=cursor, user_data={"user_id": user_id}, db=db))
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_newest_first_pages_cover_every_row_once(db):
+    # Rows created in the same second tie on created_at and are ordered by id
+    db.add_all([Syllabus(title=f"S{n}", user_id=1) for n in range(5)] + [Syllabus(title="other", user_id=2)])
+    db.commit()
+    ids = [row.id for row in db.query(Syllabus).filter(Syllabus.user_id == 1)]
+    assert _all_pages(list_syllabi, 1, db) == sorted(ids, reverse=True)
+
+    db.add_all([
+        QuizAttempt(user_id=1, score=n, total_questions=10, created_at=datetime(2026, 1, 1 + n % 2, 12, 0, 0, 250000))
+        for n in range(5)
+    ])
+    db.commit()
+    expected = [row.id for row in db.query(QuizAttempt).order_by(QuizAttempt.created_at.desc(), QuizAttempt.id.desc())]
+    assert _all_pages(list_attempts, 1, db) == expected
+
+
+def test_next_page_survives_deleting_the_cursor_row(db):
+    db.add_all([Syllabus(title=f"S{n}", user_id=1) for n in range(4)])
+    db.commit()
+    first = asyncio.run(list_syllabi(limit=2, cursor=None, user_data={"user_id": 1}, db=db))
+    db.query(Syllabus).filter(Syllabus.id == first["items"][-1]["id"]).delete()
+    db.commit()
+    second = asyncio.run(list_syllabi(limit=2, cursor=first["next_cursor"], user_data={"user_id": 1}, db=db))
+    assert [item["id"] for item in second["items"]] == [2, 1]
@@ -0,0 +1,60 @@
+from app.utils import prompt_builder
+from app.utils.prompt_builder import (
+    build_context, build_topic_context, count_tokens, fit_to_budget, normalize_whitespace, strip_page_furniture,
+)
+
+
+def test_normalize_whitespace_collapses_runs():
+    text = "Unit 1  \t Algebra \r\n\r\n\r\n\r\nUnit 2  Calculus  \n"
+    assert normalize_whitespace(text) == "Unit 1 Algebra\n\nUnit 2 Calculus"
+
+
+def test_strip_page_furniture_drops_repeated_headers_and_footers():
+    topics = ["Kinematics", "Dynamics", "Optics", "Waves"]
+    pages = [
+        f"Physics Syllabus 2024\n{topic} overview\n{topic} problems\nPage {n} of 4"
+        for n, topic in enumerate(topics, 1)
+    ]
+    cleaned = strip_page_furniture("\f".join(pages))
+    assert "Physics Syllabus" not in cleaned
+    assert "Page" not in cleaned
+    for topic in topics:
+        assert f"{topic} overview" in cleaned
+
+
+def test_strip_page_furniture_keeps_short_documents():
+    text = "Header\nBody\fHeader\nOther"
+    assert strip_page_furniture(text) == text
+
+
+def test_fit_to_budget_respects_limit_and_boundary():
+    text = "\n\n".join(f"Paragraph {n}. " + "word " * 40 for n in range(20))
+    fitted = fit_to_budget(text, 100)
+    assert count_tokens(fitted) <= 100
+    assert text.startswith(fitted)
+    assert fit_to_budget("short text", 100) == "short text"
+    assert fit_to_budget(text, 0) == ""
+
+
+def test_estimator_is_used_without_tokenizer(monkeypatch):
+    monkeypatch.setattr(prompt_builder, "_encoding", None)
+    assert count_tokens("abcdefgh ij") == 3
+    assert count_tokens(fit_to_budget("one two three four five six", 3)) <= 3
+
+
+def test_topic_context_prefers_matching_paragraphs():
+    text = "Intro to the course.\n\nThermodynamics: heat engines and entropy.\n\nOptics: lenses and mirrors."
+    context = build_topic_context(text, "Thermodynamic cycles", "mcq")
+    assert "entropy" in context
+    assert "lenses" not in context
+    # No paragraph mentions the topic: fall back to the opening context
+    assert build_topic_context(text, "Genetics", "mcq").startswith("Intro to the course.")
+
+
+def test_context_caches_hold_results_not_documents():
+    text = "\n\n".join(f"Unit {n}: optics lenses mirrors refraction " * 40 for n in range(200))
+    context = build_context(text, "mcq")
+    assert build_context(text, "mcq") == context
+    assert build_topic_context(text, "Refraction", "flashcard")
+    cached = list(prompt_builder._contexts._data.items())
+    assert cached and all(text not in key and len(entry[1]) < len(text) for key, entry in cached)
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.agents import exam_workflow
+from app.models.db import SessionLocal
+from app.models.quiz import Quiz
+from app.models.syllabus import Syllabus
+from app.routes import workflow_routes
+from app.routes.workflow_routes import ExamAnswers, submit_exam_workflow
+from app.utils import quiz_sessions as quiz_sessions_module
+from app.utils.quiz_sessions import QuizSessionStore
+from app.utils.score_stats import score_distribution
+
+ANSWER_KEY = [{"id": 1, "question": "Q1", "correct_answer": "A", "explanation": "", "topic": "Cells"}]
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    monkeypatch.setattr(quiz_sessions_module, "get_redis", lambda: None)
+    store = QuizSessionStore(ttl=60)
+    monkeypatch.setattr(workflow_routes, "quiz_sessions", store)
+    return store
+
+
+class FakeGrader:
+    """Stands in for ExamWorkflow; `during` runs while the submission is being graded"""
+
+    during = None
+
+    def run_exam_evaluation(self, quiz_questions, answers):
+        if FakeGrader.during:
+            FakeGrader.during()
+        return {"score_percentage": 100.0 if answers.get("1") == "A" else 0.0}
+
+
+@pytest.fixture
+def grader(monkeypatch):
+    monkeypatch.setattr(exam_workflow, "ExamWorkflow", FakeGrader)
+    yield FakeGrader
+    FakeGrader.during = None
+
+
+def _submit(syllabus_id, session_id, db, user_data=None):
+    answers = ExamAnswers(answers={"1": "A"}, session_id=session_id)
+    return asyncio.run(submit_exam_workflow(syllabus_id, answers, db, user_data))
+
+
+def test_a_session_is_claimed_once(sessions):
+    async def run():
+        session_id = await sessions.create(7, ANSWER_KEY)
+        assert (await sessions.get(session_id))["answer_key"] == ANSWER_KEY
+        assert await sessions.claim(session_id) is True
+        assert await sessions.claim(session_id) is False
+        await sessions.release(session_id)
+        assert await sessions.claim(session_id) is True
+
+    asyncio.run(run())
+
+
+def test_concurrent_submission_is_rejected_and_graded_once(db, sessions, grader):
+    syllabus = Syllabus(title="Biology")
+    db.add(syllabus)
+    db.commit()
+    session_id = asyncio.run(sessions.create(syllabus.id, ANSWER_KEY))
+    competing = {}
+
+    def submit_again():
+        other_db = SessionLocal()
+        try:
+            _submit(syllabus.id, session_id, other_db)
+        except HTTPException as e:
+            competing["status"] = e.status_code
+        finally:
+            other_db.close()
+
+    def race():
+        thread = threading.Thread(target=submit_again)
+        thread.start()
+        thread.join()
+
+    grader.during = race
+    result = _submit(syllabus.id, session_id, db)
+
+    assert result["results"]["score_percentage"] == 100.0
+    assert competing["status"] == 409
+    assert db.query(Quiz).count() == 1
+    # Anonymous submissions stay out of the cohort statistics
+    assert sum(score_distribution(db, syllabus.id)) == 0
+    with pytest.raises(HTTPException) as exc:
+        _submit(syllabus.id, session_id, db)
+    assert exc.value.status_code == 409
+
+
+def test_other_users_cannot_use_up_a_session(db, sessions, grader):
+    syllabus = Syllabus(title="Biology")
+    db.add(syllabus)
+    db.commit()
+    session_id = asyncio.run(sessions.create(syllabus.id, ANSWER_KEY, user_id=1))
+
+    with pytest.raises(HTTPException) as exc:
+        _submit(syllabus.id, session_id, db, {"user_id": 2})
+    assert exc.value.status_code == 403
+    assert asyncio.run(sessions.get(session_id)) is not None
+
+
+def test_failed_grading_gives_the_session_back(db, sessions, grader):
+    syllabus = Syllabus(title="Biology")
+    db.add(syllabus)
+    db.commit()
+    session_id = asyncio.run(sessions.create(syllabus.id, ANSWER_KEY))
+
+    def crash():
+        raise RuntimeError("model error")
+
+    grader.during = crash
+    with pytest.raises(HTTPException) as exc:
+        _submit(syllabus.id, session_id, db)
+    assert exc.value.status_code == 500
+
+    grader.during = None
+    assert _submit(syllabus.id, session_id, db)["status"] == "success"
@@ -0,0 +1,81 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.db import get_read_db
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.models.syllabus import Syllabus
+from app.models.user import User
+from app.routes import analytics_routes
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.utils.score_stats import (
+    initials, rebuild_score_stats, record_score, score_distribution, score_percentile, top_scores,
+)
+
+
+def _syllabus_with_users(db):
+    db.add_all([
+        User(id=1, email="ada@example.com", full_name="Ada Lovelace"),
+        User(id=2, email="alan@example.com", full_name="Alan Mathison Turing"),
+        User(id=3, email="anon@example.com"),
+    ])
+    syllabus = Syllabus(title="Computing", user_id=1)
+    db.add(syllabus)
+    db.commit()
+    return syllabus
+
+
+def test_record_score_counts_buckets_and_keeps_the_best(db):
+    syllabus = _syllabus_with_users(db)
+    for score, user_id in [(40.0, 1), (80.0, 1), (60.0, 1), (80.0, 2), (100.0, 3)]:
+        record_score(db, syllabus.id, score, user_id)
+    db.commit()
+
+    counts = score_distribution(db, syllabus.id)
+    assert (counts[40], counts[60], counts[80], counts[100], sum(counts)) == (1, 1, 2, 1, 5)
+    entry = db.query(LeaderboardEntry).filter_by(syllabus_id=syllabus.id, user_id=1).one()
+    assert (entry.best_score, entry.attempts) == (80.0, 3)
+    assert score_percentile(db, syllabus.id, 80.0)["better_than_percent"] == 40.0
+    assert score_percentile(db, syllabus.id + 1, 80.0)["better_than_percent"] is None
+
+
+def test_leaderboard_shows_initials_not_names(db):
+    syllabus = _syllabus_with_users(db)
+    for score, user_id in [(70.0, 1), (90.0, 2), (50.0, 3)]:
+        record_score(db, syllabus.id, score, user_id)
+    db.commit()
+
+    entries = top_scores(db, syllabus.id, 10, viewer_id=1)
+    assert [(e["rank"], e["name"], e["is_you"]) for e in entries] == [
+        (1, "A.M.T.", False), (2, "A.L.", True), (3, "Anonymous", False)
+    ]
+    assert all("user_id" not in e for e in entries)
+    assert initials("  ") == "Anonymous"
+
+    result = asyncio.run(analytics_routes.get_leaderboard(syllabus.id, 1, {"user_id": 2}, db))
+    assert [e["is_you"] for e in result["entries"]] == [True]
+
+
+def test_leaderboard_requires_sign_in(db):
+    syllabus = _syllabus_with_users(db)
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    app.dependency_overrides[get_read_db] = lambda: db
+    response = TestClient(app).get(f"/analytics/syllabi/{syllabus.id}/leaderboard")
+    assert response.status_code == 401
+
+
+def test_rebuild_counts_only_signed_in_attempts(db):
+    syllabus = _syllabus_with_users(db)
+    db.add_all([Quiz(syllabus_id=syllabus.id, score=100.0) for _ in range(5)])
+    db.add_all([
+        QuizAttempt(user_id=1, syllabus_id=syllabus.id, score=50.0),
+        QuizAttempt(user_id=1, syllabus_id=syllabus.id, score=70.0),
+    ])
+    db.commit()
+
+    assert rebuild_score_stats(db) == {"buckets": 2, "leaderboard_entries": 1}
+    counts = score_distribution(db, syllabus.id)
+    assert (counts[50], counts[70], counts[100]) == (1, 1, 0)
@@ -0,0 +1,23 @@
+from app.models.syllabus import Syllabus
+from app.utils.embeddings import index_version
+
+
+def test_index_version_changes_when_a_searched_syllabus_is_reindexed(db):
+    mine = Syllabus(title="Biology", user_id=1, content_hash="a", search_index_hash="a")
+    other = Syllabus(title="History", user_id=2, content_hash="b", search_index_hash="b")
+    db.add_all([mine, other])
+    db.commit()
+    user_version, syllabus_version = index_version(user_id=1), index_version(syllabus_id=mine.id, user_id=1)
+
+    other.search_index_hash = "c"
+    db.commit()
+    assert index_version(user_id=1) == user_version
+
+    mine.search_index_hash = "d"
+    db.commit()
+    assert index_version(user_id=1) != user_version
+    assert index_version(syllabus_id=mine.id, user_id=1) != syllabus_version
+
+    db.add(Syllabus(title="Physics", user_id=1))
+    db.commit()
+    assert index_version(user_id=1) != index_version(syllabus_id=mine.id, user_id=1)
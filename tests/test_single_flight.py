@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+from app.utils import single_flight
+from app.utils.single_flight import IdempotencyStore, SingleFlight
+
+
+class FakeRedis:
+    """Enough of a synchronous Redis client for the lock, renew and result calls"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+        self.renewals = 0
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    def get(self, key):
+        with self.lock:
+            return self._live(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self.lock:
+            if nx and self._live(key) is not None:
+                return None
+            ttl = px / 1000 if px else ex
+            self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+            return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        with self.lock:
+            if self._live(key) != token:
+                return 0
+            if "pexpire" in script:
+                self.renewals += 1
+                self.data[key] = (token, time.monotonic() + int(args[0]) / 1000)
+            else:
+                del self.data[key]
+            return 1
+
+
+def test_concurrent_callers_share_one_run(monkeypatch):
+    monkeypatch.setattr(single_flight, "get_redis", lambda: None)
+    flight = SingleFlight("test", lock_ttl=1, wait_timeout=5)
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"n": len(calls)}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(3)))
+
+    assert asyncio.run(run()) == [{"n": 1}] * 3
+    assert len(calls) == 1
+    assert flight.stats["local_followers"] == 2
+
+
+def test_leader_renews_a_short_lock_so_other_workers_wait(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight, "get_redis", lambda: redis)
+    # Two instances stand in for two workers sharing Redis
+    leader = SingleFlight("test", lock_ttl=0.15, wait_timeout=5, poll_interval=0.02)
+    follower = SingleFlight("test", lock_ttl=0.15, wait_timeout=5, poll_interval=0.02)
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.5)
+        return {"n": len(calls)}
+
+    async def run():
+        first = asyncio.create_task(leader.do("k", work))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(follower.do("k", work))
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run()) == [{"n": 1}, {"n": 1}]
+    assert len(calls) == 1
+    assert redis.renewals >= 2
+    assert follower.stats["remote_followers"] == 1
+    assert redis.get("test:lock:k") is None
+
+
+def test_expired_lock_of_a_dead_leader_is_taken_over(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight, "get_redis", lambda: redis)
+    redis.set("test:lock:k", "dead", px=100)
+    flight = SingleFlight("test", lock_ttl=1, wait_timeout=5, poll_interval=0.02)
+
+    assert asyncio.run(flight.do("k", lambda: "done")) == "done"
+    assert flight.stats["leaders"] == 1
+
+
+def test_idempotency_store_round_trip(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight, "get_redis", lambda: redis)
+    store = IdempotencyStore("test", ttl=60)
+
+    async def run():
+        assert await store.get("key") is None
+        await store.set("key", {"mcqs_generated": 3})
+        return await store.get("key")
+
+    assert asyncio.run(run()) == {"mcqs_generated": 3}
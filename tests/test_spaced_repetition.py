@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.db import SessionLocal
+from app.models.flashcard import Flashcard
+from app.models.flashcard_review import FlashcardReview
+from app.models.syllabus import Syllabus
+from app.routes.flashcard_routes import ReviewGrade, enroll_syllabus_flashcards, review_flashcard
+from app.utils.spaced_repetition import apply_review, due_cards, next_review
+
+NOW = datetime(2026, 10, 19, 9, 0, 0)
+
+
+def test_intervals_grow_one_six_then_by_ease():
+    state = {"repetitions": 0, "interval_days": 0, "ease_factor": 2.5}
+    intervals = []
+    for _ in range(4):
+        state = next_review(state["repetitions"], state["interval_days"], state["ease_factor"], 4)
+        intervals.append(state["interval_days"])
+    assert intervals == [1, 6, 15, 38]
+    assert state["ease_factor"] == 2.5
+
+
+def test_ease_factor_moves_with_quality_and_has_a_floor():
+    assert next_review(0, 0, 2.5, 5)["ease_factor"] == 2.6
+    assert next_review(0, 0, 2.5, 3)["ease_factor"] == 2.36
+    assert next_review(3, 15, 1.3, 0)["ease_factor"] == 1.3
+    with pytest.raises(ValueError):
+        next_review(0, 0, 2.5, 6)
+
+
+def test_lapse_restarts_the_card():
+    review = FlashcardReview(repetitions=3, interval_days=15, ease_factor=2.5, lapses=0)
+    apply_review(review, 2, now=NOW)
+    assert (review.repetitions, review.interval_days, review.lapses) == (0, 1, 1)
+    assert review.due_at == NOW + timedelta(days=1)
+    assert review.last_reviewed_at == NOW
+
+
+def _cards(db, owner_id=1, count=3):
+    syllabus = Syllabus(title="Biology", user_id=owner_id)
+    db.add(syllabus)
+    db.commit()
+    cards = [Flashcard(syllabus_id=syllabus.id, front=f"F{n}", back=f"B{n}", topic="Cells") for n in range(count)]
+    db.add_all(cards)
+    db.commit()
+    return syllabus, cards
+
+
+def test_due_cards_are_most_overdue_first(db):
+    _, cards = _cards(db)
+    for card, days in zip(cards, [-1, -3, 2]):
+        db.add(FlashcardReview(user_id=1, flashcard_id=card.id, due_at=NOW + timedelta(days=days)))
+    db.commit()
+    assert [row.flashcard_id for row in due_cards(db, 1, 10, now=NOW)] == [cards[1].id, cards[0].id]
+    assert due_cards(db, 2, 10, now=NOW) == []
+
+
+def test_enroll_requires_ownership_and_is_idempotent(db):
+    syllabus, cards = _cards(db, owner_id=1)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(enroll_syllabus_flashcards(syllabus.id, user_data={"user_id": 2}, db=db))
+    assert error.value.status_code == 404
+
+    first = asyncio.run(enroll_syllabus_flashcards(syllabus.id, user_data={"user_id": 1}, db=db))
+    again = asyncio.run(enroll_syllabus_flashcards(syllabus.id, user_data={"user_id": 1}, db=db))
+    assert (first["enrolled"], again["enrolled"]) == (len(cards), 0)
+
+
+def test_review_of_another_users_card_is_not_found(db):
+    _, cards = _cards(db, owner_id=1)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(review_flashcard(cards[0].id, ReviewGrade(quality=4), user_data={"user_id": 2}, db=db))
+    assert error.value.status_code == 404
+
+
+def test_concurrent_first_review_grades_the_existing_row(db):
+    _, cards = _cards(db, owner_id=1)
+    card_id = cards[0].id
+
+    raced = []
+
+    def competitor_inserts_first(session, flush_context, instances):
+        # Another request creates the review row between our lookup and our insert
+        if raced:
+            return
+        raced.append(True)
+        other = SessionLocal()
+        other.add(FlashcardReview(user_id=1, flashcard_id=card_id, repetitions=1, interval_days=1))
+        other.commit()
+        other.close()
+
+    event.listen(db, "before_flush", competitor_inserts_first)
+    result = asyncio.run(review_flashcard(card_id, ReviewGrade(quality=5), user_data={"user_id": 1}, db=db))
+    event.remove(db, "before_flush", competitor_inserts_first)
+    assert raced
+    assert result["repetitions"] == 2 and result["interval_days"] == 6
+    assert db.query(FlashcardReview).filter(FlashcardReview.flashcard_id == card_id).count() == 1
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from app.agents import structured_mcq
+from app.agents.structured_mcq import iter_structured_mcqs, repair_mcqs
+from app.monitoring.metrics import MCQ_ITEMS
+
+
+def _mcq(question: str, answer: str = "A", **fields) -> dict:
+    return {
+        "question": question, "option_a": "1", "option_b": "2", "option_c": "3", "option_d": "4",
+        "correct_answer": answer, "explanation": "", **fields,
+    }
+
+
+class Reply:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Returns the queued responses in order and records how each call was made"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def invoke(self, messages, **kwargs):
+        self.calls.append(("invoke", messages[0].content, kwargs))
+        return Reply(self.responses.pop(0))
+
+    def stream(self, messages):
+        self.calls.append(("stream", messages[0].content, {}))
+        text = self.responses.pop(0)
+        return [Reply(text[i:i + 5]) for i in range(0, len(text), 5)]
+
+
+def _items(agent: str, status: str) -> float:
+    return MCQ_ITEMS.labels(agent=agent, status=status)._value.get()
+
+
+@pytest.mark.parametrize("json_mode", [True, False])
+def test_completion_uses_json_mode_or_streams(monkeypatch, json_mode):
+    monkeypatch.setattr(structured_mcq, "MCQ_JSON_MODE", json_mode)
+    llm = FakeLLM(json.dumps({"mcqs": [_mcq("Q1"), _mcq("Q2", "Chlorophyll")]}))
+    invalid = []
+
+    pairs = list(iter_structured_mcqs(llm, "test-mode", "prompt", invalid))
+
+    assert [(key, mcq["question"]) for key, mcq in pairs] == [("mcqs", "Q1")]
+    assert [item["question"] for _, item in invalid] == ["Q2"]
+    method, _, kwargs = llm.calls[0]
+    if json_mode:
+        assert (method, kwargs) == ("invoke", {"response_format": {"type": "json_object"}})
+    else:
+        assert method == "stream"
+
+
+def test_usage_is_counted_when_the_caller_stops_early(monkeypatch):
+    monkeypatch.setattr(structured_mcq, "MCQ_JSON_MODE", True)
+    before = _items("test-early", "valid")
+    stream = iter_structured_mcqs(FakeLLM(json.dumps({"mcqs": [_mcq("Q1"), _mcq("Q2")]})), "test-early", "prompt")
+    next(stream)
+    stream.close()
+    assert _items("test-early", "valid") - before == 1
+
+
+def test_repair_sends_only_the_invalid_items_with_their_errors(monkeypatch):
+    monkeypatch.setattr(structured_mcq, "MCQ_JSON_MODE", True)
+    invalid = [("Cells", _mcq("Q1", "Chlorophyll")), ("Optics", _mcq("Q2", option_b=""))]
+    llm = FakeLLM(json.dumps({"mcqs": [_mcq("Q2 fixed", index=1), _mcq("Q1 fixed", "C", index=0)]}))
+    before = _items("test-repair", "repaired")
+
+    repaired = repair_mcqs(llm, "test-repair", invalid)
+
+    assert [(key, mcq["question"], mcq["correct_answer"]) for key, mcq in repaired] == [
+        ("Optics", "Q2 fixed", "A"), ("Cells", "Q1 fixed", "C"),
+    ]
+    assert all("index" not in mcq for _, mcq in repaired)
+    prompt = llm.calls[0][1]
+    assert "Chlorophyll" in prompt and "correct_answer" in prompt and "option_b" in prompt
+    assert _items("test-repair", "repaired") - before == 2
+
+
+def test_repair_drops_duplicate_or_out_of_range_indexes(monkeypatch):
+    monkeypatch.setattr(structured_mcq, "MCQ_JSON_MODE", True)
+    invalid = [("Cells", _mcq("Q1", "Chlorophyll")), ("Optics", _mcq("Q2", "Mirror"))]
+    llm = FakeLLM(json.dumps({"mcqs": [_mcq("A", index=0), _mcq("B", index=0), _mcq("C", index=5)]}))
+    assert [key for key, _ in repair_mcqs(llm, "test-repair", invalid)] == ["Cells"]
+
+
+def test_failed_repair_returns_nothing(monkeypatch):
+    monkeypatch.setattr(structured_mcq, "MCQ_JSON_MODE", True)
+
+    class Broken(FakeLLM):
+        def invoke(self, messages, **kwargs):
+            raise RuntimeError("rate limited")
+
+    assert repair_mcqs(Broken(), "test-repair", [("Cells", _mcq("Q1", "Chlorophyll"))]) == []
+    assert repair_mcqs(FakeLLM(), "test-repair", []) == []
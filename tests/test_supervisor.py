@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.supervisor_agent import SupervisorAgent
+from app.monitoring import health
+
+
+@pytest.fixture
+def supervisor(monkeypatch):
+    supervisor = SupervisorAgent()
+    for agent in supervisor.agents.values():
+        monkeypatch.setattr(agent, "health_check", lambda: pytest.fail("per-call health check"))
+    return supervisor
+
+
+def _health(math_status):
+    return {"agents_health": {"math": {"status": math_status}, "general": {"status": "healthy"}}}
+
+
+def test_batch_uses_the_shared_health_result(monkeypatch, supervisor):
+    monkeypatch.setattr(health.agent_health, "get", lambda: _health("healthy"))
+    monkeypatch.setattr(supervisor.math_agent, "generate_mcqs_batch",
+                        lambda topics, content, count: {t: [{"question": t}] for t in topics})
+
+    results = supervisor.generate_mcq_batch("math", ["Algebra"], "content")
+    assert results["Algebra"]["agent_used"] == "math"
+
+
+def test_unhealthy_agent_falls_back_to_general(monkeypatch, supervisor):
+    monkeypatch.setattr(health.agent_health, "get", lambda: _health("unhealthy"))
+    monkeypatch.setattr(supervisor, "classify_topic", lambda topic, content: "math")
+    monkeypatch.setattr(supervisor.general_agent, "generate_mcqs",
+                        lambda topic, content, count: [{"question": topic}])
+
+    result = supervisor.delegate_mcq_generation("Algebra", "content")
+    assert (result["agent_used"], result["count"]) == ("general", 1)
+
+
+def test_health_check_failure_keeps_the_requested_agent(monkeypatch, supervisor):
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(health.agent_health, "get", unavailable)
+    assert supervisor.select_agent("math") == ("math", supervisor.math_agent)
+
+
+class FakeLLM:
+    def __init__(self, reply):
+        self.reply, self.prompts = reply, []
+
+    def invoke(self, messages):
+        self.prompts.append(messages[0].content)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return SimpleNamespace(content=self.reply)
+
+
+def test_batch_planning_classifies_every_topic_in_one_call(monkeypatch, supervisor):
+    llm = FakeLLM('Sure: {"Photosynthesis": "general", "Probability": "math"}')
+    monkeypatch.setattr(supervisor, "llm", llm)
+
+    batches = supervisor.plan_mcq_batches(["Photosynthesis", "Probability", "Algebra", "Cell Division"], "content",
+                                          batch_size=1)
+    assert len(llm.prompts) == 1
+    # Algebra is math by name and is not sent to the model
+    assert "Algebra" not in llm.prompts[0]
+    assert all(topic in llm.prompts[0] for topic in ["Photosynthesis", "Probability", "Cell Division"])
+    assert batches == [
+        {"agent_type": "general", "topics": ["Photosynthesis"]},
+        {"agent_type": "general", "topics": ["Cell Division"]},
+        {"agent_type": "math", "topics": ["Probability"]},
+        {"agent_type": "math", "topics": ["Algebra"]},
+    ]
+
+
+def test_failed_batch_classification_falls_back_to_keywords(monkeypatch, supervisor):
+    monkeypatch.setattr(supervisor, "llm", FakeLLM(TimeoutError("model down")))
+    assert supervisor.classify_topics(["Statistics", "History"], "content") == {"Statistics": "math", "History": "general"}
+
+    llm = FakeLLM("{}")
+    monkeypatch.setattr(supervisor, "llm", llm)
+    assert supervisor.classify_topics(["Calculus", "Linear Algebra"], "content") == {"Calculus": "math",
+                                                                                   "Linear Algebra": "math"}
+    assert llm.prompts == []
@@ -0,0 +1,76 @@
+import json
+
+from app.utils.syllabus_diff import (
+    attribute_topics, build_revision, cap_topics, match_revision_topics, split_chunks,
+)
+
+SUBJECTS = [
+    "Photosynthesis", "Cell Division", "Genetics", "Evolution", "Ecology", "Enzymes", "Respiration",
+    "Osmosis", "Hormones", "Immunity", "Nervous System", "Digestion", "Circulation", "Excretion",
+]
+TEXT = "\n\n".join(f"{subject} covers the core ideas of {subject.lower()} in unit {n}." for n, subject in enumerate(SUBJECTS))
+
+
+def first_upload_topics(text):
+    return [subject for subject in SUBJECTS if subject.lower() in text.lower()][:10]
+
+
+def test_split_chunks_keeps_unedited_chunks():
+    before = split_chunks(TEXT)
+    after = split_chunks(TEXT.replace("unit 3.", "unit 3, with worked examples."))
+    assert len(before) > 1
+    assert len(set(before) - set(after)) == 1
+
+
+def test_attribute_topics_puts_unmatched_topics_on_one_chunk():
+    chunks = ["Photosynthesis and light", "Genetics and inheritance", "Evolution of species"]
+    assigned = attribute_topics(chunks, ["Photosynthesis", "Inheritance patterns", "Quantum physics"])
+    assert assigned == [["Photosynthesis", "Quantum physics"], ["Inheritance patterns"], []]
+
+
+def test_match_revision_topics_reuses_names_and_limits_new_ones():
+    existing = ["Photosynthesis", "Linear Equations"]
+    extracted = ["photosynthesis", "Intro to Linear Equation", "Optics", "Waves", "Sound", "Heat"]
+    assert match_revision_topics(extracted, existing, max_new=2) == [
+        "Photosynthesis", "Linear Equations", "Optics", "Waves",
+    ]
+
+
+def test_cap_topics_keeps_existing_first():
+    per_chunk = [["A", "New1"], ["B", "New2"], ["C"]]
+    assert cap_topics(per_chunk, ["A", "B", "C"], limit=4) == [["A", "New1"], ["B"], ["C"]]
+
+
+def test_reupload_with_small_edit_does_not_grow_topics():
+    first = build_revision(TEXT, [], first_upload_topics)
+    previous = [{"content_hash": c["content_hash"], "topics": json.loads(c["topics"])} for c in first["chunks"]]
+    assert len(first["topics"]) == 10
+
+    calls = []
+
+    def revise(section, existing):
+        calls.append(section)
+        # The model lists every topic it sees, loosely spelled, plus more new ones than allowed
+        return [subject.upper() for subject in SUBJECTS if subject.lower() in section.lower()] + [
+            "Lab Safety", "Microscopy", "Field Work", "Statistics",
+        ]
+
+    edited = TEXT.replace("unit 3.", "unit 3, with worked examples.")
+    second = build_revision(edited, previous, first_upload_topics, revise)
+    # The edit can move a content-defined boundary, touching at most its neighbour
+    assert 1 <= second["changed_chunks"] <= 2 and len(calls) == 1
+    assert "worked examples" in calls[0]
+    # Re-found topics keep their existing names; at most REVISION_NEW_TOPICS are added
+    assert set(first["topics"]) <= set(second["topics"])
+    assert not any(topic.isupper() for topic in second["topics"])
+    assert len(second["topics"]) - len(first["topics"]) <= 3
+
+    # Repeated edits replace the section's new topics instead of piling them up
+    for n in range(5):
+        previous = [{"content_hash": c["content_hash"], "topics": json.loads(c["topics"])} for c in second["chunks"]]
+        edited = edited.replace("examples", f"examples {n}")
+        second = build_revision(edited, previous, first_upload_topics, lambda section, existing: [
+            topic for topic in existing if topic.lower() in section.lower()
+        ] + [f"Extra Topic {n} {k}" for k in range(3)])
+        assert set(first["topics"]) <= set(second["topics"])
+        assert len(second["topics"]) <= len(first["topics"]) + 3
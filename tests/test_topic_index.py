@@ -0,0 +1,94 @@
+import json
+
+from app.models.mcq import MCQ
+from app.models.syllabus import Syllabus
+from app.models.topic import Topic
+from app.models.user import User
+from app.utils import topic_index as topic_index_module
+from app.utils.topic_index import QuestionBank, TopicIndex, normalize_topic
+
+
+def _bank_mcq(syllabus_id: int, topic_id: int, n: int) -> MCQ:
+    return MCQ(
+        syllabus_id=syllabus_id, question=f"Q{n}", option_a="1", option_b="2", option_c="3", option_d="4",
+        correct_answer="A", explanation="", topic="Photosynthesis", topic_id=topic_id,
+    )
+
+
+def _setup(db):
+    users = [User(email="a@example.com"), User(email="b@example.com")]
+    db.add_all(users)
+    db.commit()
+    syllabi = [Syllabus(title=f"S{n}", user_id=user.id) for n, user in enumerate([users[0], users[1], users[0]])]
+    db.add_all(syllabi)
+    db.commit()
+    return syllabi
+
+
+def test_normalize_topic():
+    assert normalize_topic("Introduction to Photosynthesis") == "photosynthesis"
+    assert normalize_topic("Linear  Equations") == normalize_topic("linear equation")
+    assert normalize_topic("The Basics") == "the basic"
+
+
+def test_resolve_topic_ids_does_not_need_lookup(db):
+    index = TopicIndex(use_embeddings=False)
+    _, other, own = _setup(db)
+    bank = QuestionBank(db, own.id, index=index)
+    ids = bank.resolve_topic_ids(["Photosynthesis", "Intro to photosynthesis", "Cells", None])
+    assert ids["Photosynthesis"] == ids["Intro to photosynthesis"] != ids["Cells"]
+    # A later bank (e.g. a resumed run that never looked anything up) gets the same ids
+    assert QuestionBank(db, own.id, index=index).resolve_topic_ids(["Cells"]) == {"Cells": ids["Cells"]}
+
+
+def test_lookup_serves_covered_topics_and_honours_scope(db):
+    index = TopicIndex(use_embeddings=False)
+    first, other, own = _setup(db)
+    topic_id = index.resolve(db, "Photosynthesis").id
+    db.add_all([_bank_mcq(other.id, topic_id, n) for n in range(3)])
+    db.commit()
+
+    banked = QuestionBank(db, own.id, index=index).lookup(["Photosynthesis", "Cells"], count=3)
+    assert list(banked) == ["Photosynthesis"]
+    assert [m["question"] for m in banked["Photosynthesis"]] == ["Q0", "Q1", "Q2"]
+    assert all(m["topic_id"] == topic_id for m in banked["Photosynthesis"])
+
+    # Limited to the owner's syllabi, the other user's questions are not reused
+    assert QuestionBank(db, own.id, index=index, shared=False).lookup(["Photosynthesis"], count=3) == {}
+    db.add_all([_bank_mcq(first.id, topic_id, n) for n in range(3, 6)])
+    db.commit()
+    owned = QuestionBank(db, own.id, index=index, shared=False).lookup(["Photosynthesis"], count=3)
+    assert [m["question"] for m in owned["Photosynthesis"]] == ["Q3", "Q4", "Q5"]
+
+
+def _topics(db, vectors):
+    topics = [Topic(name=f"T{n}", embedding=json.dumps(vector)) for n, vector in enumerate(vectors)]
+    db.add_all(topics)
+    db.commit()
+    return [topic.id for topic in topics]
+
+
+def test_snapshot_is_reused_only_for_the_database_it_came_from(db, tmp_path, monkeypatch):
+    path = str(tmp_path / "topics")
+    old_ids = _topics(db, [[1.0, 0.0], [0.0, 1.0]])
+    TopicIndex(use_embeddings=True).warm(db, path)
+
+    index = TopicIndex(use_embeddings=True)
+    index.warm(db, path)
+    assert index._snapshot_matches(db, path)
+    assert index._nearest([0.0, 1.0]) == old_ids[1]
+
+    # The topics table was reset: ids start again and mean different topics
+    db.query(Topic).delete()
+    db.commit()
+    new_ids = _topics(db, [[0.0, 1.0]])
+    assert new_ids[0] <= max(old_ids)
+    index = TopicIndex(use_embeddings=True)
+    index.warm(db, path)
+    assert index._nearest([1.0, 0.0]) is None
+    assert index._nearest([0.0, 1.0]) == new_ids[0]
+
+    monkeypatch.setattr(topic_index_module, "_database_identity", lambda db: "another-database")
+    index = TopicIndex(use_embeddings=True)
+    index.load_snapshot(path)
+    assert not index._snapshot_matches(db, path)
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from app.agents.syllabus_agent import SyllabusAgent
+from app.utils.prompt_builder import count_tokens
+from app.utils.topic_merge import cluster_candidates, group_windows
+
+
+def test_group_windows_packs_chunks_by_token_offset():
+    chunks = [f"Unit {n}: " + "word " * 40 for n in range(10)]
+    size = count_tokens(chunks[0])
+    windows = group_windows(chunks, window_tokens=size * 3)
+    assert len(windows) == 4
+    assert windows[0] == "\n\n".join(chunks[:3])
+    assert "\n\n".join(windows) == "\n\n".join(chunks)
+    assert group_windows([], 100) == []
+
+
+def test_clusters_are_ranked_by_window_count_and_named_by_frequency():
+    clusters = cluster_candidates([
+        ["Photosynthesis", "Cell Division"],
+        ["photosynthesis", "Cell Division"],
+        ["Photosynthesis", "Optics", "  ", None],
+    ])
+    assert [(c["name"], c["count"]) for c in clusters] == [("Photosynthesis", 3), ("Cell Division", 2), ("Optics", 1)]
+    assert clusters[0]["variants"] == ["Photosynthesis", "photosynthesis"]
+
+
+def test_one_word_names_do_not_absorb_longer_ones():
+    clusters = cluster_candidates([["Energy", "Kinetic Energy", "Potential Energy"], ["Motion", "Projectile Motion"]])
+    assert sorted(c["name"] for c in clusters) == [
+        "Energy", "Kinetic Energy", "Motion", "Potential Energy", "Projectile Motion",
+    ]
+
+
+def test_contained_names_merge_through_any_member():
+    clusters = cluster_candidates([["Newton's Laws"], ["Newton's Laws of Motion"], ["Laws of Motion"]])
+    assert len(clusters) == 1
+    assert clusters[0]["count"] == 3
+    assert clusters[0]["variants"] == ["Laws of Motion", "Newton's Laws", "Newton's Laws of Motion"]
+
+
+def _agent(reply=None, error=None):
+    agent = SyllabusAgent()
+
+    def invoke(messages):
+        if error:
+            raise error
+        return SimpleNamespace(content=reply)
+    agent.llm = SimpleNamespace(invoke=invoke)
+    return agent
+
+
+CLUSTERS = [{"name": f"Topic {n}", "count": 12 - n} for n in range(12)]
+
+
+def test_rank_topics_keeps_known_names_and_tops_up_by_frequency():
+    ranked = _agent('["topic 7", "Unknown", "Topic 3", "Topic 7"]')._rank_topics(CLUSTERS)
+    assert ranked == ["Topic 7", "Topic 3", "Topic 0", "Topic 1", "Topic 2"]
+
+
+def test_rank_topics_falls_back_to_frequency_order():
+    ranked = _agent(error=RuntimeError("rate limited"))._rank_topics(CLUSTERS)
+    assert ranked == [f"Topic {n}" for n in range(10)]